@@ -1,13 +1,18 @@
 #!/usr/bin/env python3
-import time, itertools, functools, re
-import numpy as np
+import time, itertools, functools, re, os, sys
 from io import StringIO
 from collections import Counter, defaultdict
-try:
-    from tqdm import tqdm
-except ImportError:
-    def tqdm(iterable=None, **kwargs):
-        return iterable
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from aoctools import harness
+from aoctools.lazy import lazy_callable, lazy_import
+
+# heavy modules are only imported on first use, to keep startup fast
+np = lazy_import('numpy')
+
+def _tqdm_fallback(iterable=None, **kwargs):
+    return iterable
+
+tqdm = lazy_callable('tqdm', 'tqdm', fallback=_tqdm_fallback)
 
 def part1(parsed):
     pass
@@ -30,13 +35,10 @@ test data
     # assert part2(parse_input(test_data)) == 0
 
 def print_result(part_label, part_fn, *args):
-    start = time.perf_counter()
-    result = part_fn(*args)
-    end = time.perf_counter()
-    print(f"Part {part_label}: {result}  ({int((end-start)*1000)} ms)")
+    harness.solve_part(__file__, part_label, part_fn, *args, show_regress=False)
 
 if __name__ == '__main__':
     run_tests()
-    # with open(__file__[:-3] + '-input.dat') as infile:
+    # with harness.open_input(__file__[:-3] + '-input.dat') as infile:
     #     print_result('1', part1, parse_input(infile))  # -
     #     print_result('2', part2, parse_input(infile))  # -
@@ -1,7 +1,13 @@
 #/usr/bin/env python3
 import itertools
+import math
+import os
+import sys
 import numpy as np
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.cycles import simulate_until_cycle
+
 def dump_state(step, pos, vel):
     for body in range(np.shape(pos)[0]):
         print('{:4} : pos={:16} vel={}'.format(str(step), pos[body], vel[body]))
@@ -46,8 +52,8 @@ pos = np.array((
     (2, -10, -7),
     (4, -8, 8),
     (3, 5, -1),
-), dtype=np.int)
-vel = np.zeros((4, 3), dtype=np.int)
+), dtype=int)
+vel = np.zeros((4, 3), dtype=int)
 for _ in range(10):
     step_time(pos, vel)
 assert np.array_equal(pos, ((2,1,-3),(1,-8,0),(3,-6,1),(2,0,4)))
@@ -58,8 +64,8 @@ pos = np.array((
     (5, 5, 10),
     (2, -7, 3),
     (9, -8, -3),
-), dtype=np.int)
-vel = np.zeros((4, 3), dtype=np.int)
+), dtype=int)
+vel = np.zeros((4, 3), dtype=int)
 for _ in range(100):
     step_time(pos, vel)
 assert np.array_equal(pos, ((8,-12,-9),(13,16,-3),(-29,-11,-1),(16,-13,23)))
@@ -71,8 +77,8 @@ pos = np.array((
     (12, 10, 8),
     (1, 7, -10),
     (16, -5, 3),
-), dtype=np.int)
-vel = np.zeros((4, 3), dtype=np.int)
+), dtype=int)
+vel = np.zeros((4, 3), dtype=int)
 for _ in range(1000):
     step_time(pos, vel)
 energy = calc_energy(pos, vel)
@@ -80,55 +86,37 @@ print('part 1: {}'.format(energy))
 assert energy == 6423
 
 # --- part 2 ---
-def idx_of_value(seq, val):
-    for i, v in enumerate(seq):
-        if v == val:
-            yield i
-
-def calc_seq_len(seq):
-    for idx in idx_of_value(seq[1:], seq[0]):
-        period = idx+1
-        if seq[:period] == seq[period:period*2]:
-            print('found {}'.format(period))
-            return period
-    print('crap')
-    return None
-
-def find_common_period(pos, iterations=1000, start_pos=0):
-    import multiprocessing as mp
-
-    vel = np.zeros((4, 3), dtype=np.int)
-    signals = [[] for _ in range(24)]
-    print('sampling...')
-    for _ in range(start_pos):
-        step_time(pos, vel)
-    for _ in range(iterations):
-        for axis1 in range(np.shape(pos)[0]):
-            for axis2 in range(np.shape(pos)[1]):
-                idx = axis1 * np.shape(pos)[1] + axis2
-                signals[idx].append(pos[axis1][axis2])
-                idx += len(signals) // 2
-                signals[idx].append(vel[axis1][axis2])
-        step_time(pos, vel)
-    print('calculating periods...')
-    p = mp.Pool(mp.cpu_count())
-    periods = set(p.map(calc_seq_len, signals))
-    p.close()
-    p.join()
-
-    def lcm(seq):
-        from fractions import gcd
-        from functools import reduce
-        return reduce(lambda a, b: a * b // gcd(a, b), seq)
-
-    return lcm(periods)
+def step_axis(state):
+    # one axis of every body: positions, then velocities
+    n = len(state) // 2
+    pos, vel = state[:n], list(state[n:])
+    for a, b in itertools.combinations(range(n), 2):
+        if pos[a] < pos[b]:
+            vel[a] += 1
+            vel[b] -= 1
+        elif pos[a] > pos[b]:
+            vel[a] -= 1
+            vel[b] += 1
+    return tuple(p + v for p, v in zip(pos, vel)) + tuple(vel)
+
+def find_common_period(pos):
+    # the axes move independently, and each one's steps can be run backwards,
+    # so each axis returns to its starting state; the system's period is the
+    # lcm of theirs
+    periods = []
+    for axis in range(np.shape(pos)[1]):
+        initial = tuple(pos[:, axis].tolist()) + (0,) * np.shape(pos)[0]
+        cycle = simulate_until_cycle(step_axis, lambda state: state, None, initial)
+        assert cycle.start == 0
+        periods.append(cycle.period)
+    return math.lcm(*periods)
 
 pos = np.array((
     (-1, 0, 2),
     (2, -10, -7),
     (4, -8, 8),
     (3, 5, -1),
-), dtype=np.int)
+), dtype=int)
 assert find_common_period(pos) == 2772
 
 pos = np.array((
@@ -136,17 +124,15 @@ pos = np.array((
     (5, 5, 10),
     (2, -7, 3),
     (9, -8, -3),
-), dtype=np.int)
-assert find_common_period(pos, iterations=100000) == 4686774924
+), dtype=int)
+assert find_common_period(pos) == 4686774924
 
 pos = np.array((
     (14, 4, 5),
     (12, 10, 8),
     (1, 7, -10),
     (16, -5, 3),
-), dtype=np.int)
-# skip the first 10000 samples to let the intial conditions settle
-period = find_common_period(pos, iterations=500000, start_pos=10000)
+), dtype=int)
+period = find_common_period(pos)
 print('part 2: {}'.format(period))
 assert period == 327636285682704
-
@@ -1,4 +1,19 @@
 #!/usr/bin/env python3
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.automaton import Automaton, moore
+
+SEAT_STATES = '.L#'  # floor, empty, occupied
+
+# next state for [state, occupied neighbors]: empty seats fill up if
+# nobody's adjacent, and occupied ones empty once 4 or more neighbors are
+SEAT_RULE = np.array([[0] * 9,
+                      [2] + [1] * 8,
+                      [2] * 4 + [1] * 5])
 
 def print_grid(grid, grid_width):
     num_rows = len(grid) // grid_width
@@ -14,26 +29,12 @@ def get_seat(grid, grid_width, x, y):
         return None
     return grid[y*width+x]
 
-def iterate_grid(grid, grid_width):
-    from collections import defaultdict
-    new_grid = ['.'] * len(grid)
-    for idx, seat in enumerate(grid):
-        if seat == '.':
-            continue
-        y = idx // grid_width
-        x = idx % grid_width
-        adjacent = defaultdict(int)
-        for pos in ((x-1, y-1), (x, y-1), (x+1, y-1),
-                    (x-1, y),             (x+1, y),
-                    (x-1, y+1), (x, y+1), (x+1, y+1)):
-            adjacent[get_seat(grid, grid_width, *pos)] += 1
-        if seat == 'L' and adjacent['#'] == 0:
-            new_grid[idx] = '#'
-        elif seat == '#' and adjacent['#'] >= 4:
-            new_grid[idx] = 'L'
-        else:
-            new_grid[idx] = seat
-    return new_grid
+def settle_adjacent(grid, grid_width):
+    """Seat the whole grid at once each round until nothing changes."""
+    states = np.array([SEAT_STATES.index(seat) for seat in grid]).reshape(-1, grid_width)
+    seats = Automaton(states, moore(2), SEAT_RULE, values=[0, 0, 1], grow=False)
+    seats.run_until_stable()
+    return [SEAT_STATES[state] for state in seats.cells.flat]
 
 def iterate_grid_extended(grid, grid_width):
     from collections import defaultdict
@@ -65,11 +66,10 @@ def iterate_grid_extended(grid, grid_width):
     return new_grid
 
 def iterate_until_stable(grid, grid_width, extended=False):
+    if not extended:
+        return settle_adjacent(grid, grid_width)
     while True:
-        if extended:
-            new_grid = iterate_grid_extended(grid, grid_width)
-        else:
-            new_grid = iterate_grid(grid, grid_width)
+        new_grid = iterate_grid_extended(grid, grid_width)
         # print_grid(grid, grid_width)
         if new_grid == grid:
             return new_grid
@@ -1,40 +1,21 @@
 #!/usr/bin/env python3
+import os
+import sys
 
-def active_neighbors(space, coord):
-    from itertools import product
-    extents = (range(coord[axis]-1, coord[axis]+2) for axis in range(len(coord)))
-    active = sum(space.get(neigh, 0) for neigh in product(*extents))
-    return active - space.get(coord, 0)  # only count neighbors
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.automaton import Automaton, life_rule, moore
 
-def iterate_space(space, dimensions):
-    from itertools import product
-    # check 1 beyond existing bounds
-    extents = (range(min(space, key=lambda coord: coord[axis])[axis]-1,
-                     max(space, key=lambda coord: coord[axis])[axis]+2)
-               for axis in range(dimensions))
-    new_space = {}
-    for coord in product(*extents):
-        active = active_neighbors(space, coord)
-        if coord in space:
-            if active in (2, 3):
-                new_space[coord] = True
-        elif active == 3:
-            new_space[coord] = True
-    return new_space
 
 def solve(space, dimensions):
-    for _ in range(6):
-        space = iterate_space(space, dimensions)
-    return len(space)
+    rule = life_rule(born={3}, survive={2, 3}, neighbours=3**dimensions - 1)
+    return Automaton(space, moore(dimensions), rule).run(6).count()
 
 def parse_input(grid, dimensions):
-    space = {}
-    zeros = (0,) * (dimensions-2)
-    for y, row in enumerate(grid.split('\n')):
-        for x, state in enumerate(row):
-            if state == '#':
-                space[(x, y, *zeros)] = True
-    return space
+    # the starting slice, indexed [y, x], one cell thick in the extra dimensions
+    space = np.array([[state == '#' for state in row] for row in grid.split('\n')], dtype=np.uint8)
+    return space.reshape(space.shape + (1,) * (dimensions-2))
 
 def run_tests():
     test_input = """
@@ -1,13 +1,14 @@
 #!/usr/bin/env python3
+import os
+import sys
 from collections import defaultdict
 
-NEIGHBORS = ((1, 0), (1, -1), (0, 1), (-1, 0), (0, -1), (-1, 1))
-WHITE = False
-BLACK = True
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.automaton import Automaton, hexagonal, life_rule
 
-def adjacent_black(space, coord):
-    """ return number of adjacent black tiles """
-    return sum(space[(coord[0]+n[0], coord[1]+n[1])] for n in NEIGHBORS)
+BLACK = True
 
 def init_space(paths):
     space = defaultdict(bool)
@@ -23,30 +24,21 @@ def part1(paths):
     space = init_space(paths)
     return sum(space.values())
 
-def iterate_space(space):
-    from itertools import product
-    # check 1 beyond existing bounds
-    extents = (range(min(space, key=lambda coord: coord[axis])[axis]-1,
-                     max(space, key=lambda coord: coord[axis])[axis]+2)
-               for axis in range(2))
-    new_space = defaultdict(bool)
-    for coord in product(*extents):
-        b = adjacent_black(space, coord)
-        if space[coord] == BLACK:
-            if b == 0 or b > 2:
-                new_space[coord] = WHITE
-            else:
-                new_space[coord] = BLACK
-        else:
-            if b == 2:
-                new_space[coord] = BLACK
-    return new_space
-
 def part2(paths):
     space = init_space(paths)
-    for _ in range(100):
-        space = iterate_space(space)
-    return sum(space.values())
+    black = [coord for coord, tile in space.items() if tile == BLACK]
+    if not black:
+        return 0  # white tiles need black neighbours to flip
+    # tiles in axial coordinates, indexed [x, y] from the corner of the black ones
+    min_x, min_y = min(x for x, _ in black), min(y for _, y in black)
+    tiles = np.zeros((max(x for x, _ in black) - min_x + 1,
+                      max(y for _, y in black) - min_y + 1), dtype=np.uint8)
+    for x, y in black:
+        tiles[x-min_x, y-min_y] = 1
+
+    # black tiles stay black with 1 or 2 black neighbors; white ones flip with exactly 2
+    floor = Automaton(tiles, hexagonal(), life_rule(born={2}, survive={1, 2}, neighbours=6))
+    return floor.run(100).count()
 
 def parse_input(lines):
     import re
@@ -84,6 +76,7 @@ wseweeenwnesenwwwswnew
     paths = parse_input(test_input)
     assert part1(paths) == 10
     assert part2(paths) == 2208
+    assert part2(parse_input(['e', 'e'])) == 0  # flipped back to white
 
 if __name__ == '__main__':
     run_tests()
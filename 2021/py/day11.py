@@ -1,39 +1,42 @@
 #!/usr/bin/env python3
 import itertools
+import os
+import sys
 from io import StringIO
 
 import numpy as np
 
-try:
-    from tqdm import tqdm
-except ImportError:
-    def tqdm(iterable=None, **kwargs):
-        return iterable
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.automaton import moore, neighbour_sums
 
-def power_up(grid, row, col):
-    if 0 <= row < grid.shape[0] and 0 <= col < grid.shape[1]:
-        grid[row, col] += 1
-        if grid[row, col] == 10:
-            return (power_up(grid, row-1, col-1) + power_up(grid, row-1, col) +
-                    power_up(grid, row-1, col+1) + power_up(grid, row, col-1) +
-                    power_up(grid, row, col+1) + power_up(grid, row+1, col-1) +
-                    power_up(grid, row+1, col) + power_up(grid, row+1, col+1) + 1)
-    return 0
+ADJACENT = moore(2)
+
+def step(grid):
+    """Power every octopus up once and let the flashes spread; returns (new grid, flashes)."""
+    grid = grid + 1
+    flashed = np.zeros(grid.shape, dtype=bool)
+    flashing = np.zeros((grid.shape[0]+2, grid.shape[1]+2), dtype=bool)  # with a border of none
+    while True:
+        flashing[1:-1, 1:-1] = (grid > 9) & ~flashed
+        if not flashing.any():
+            break
+        flashed |= flashing[1:-1, 1:-1]
+        grid += neighbour_sums(flashing, ADJACENT)
+    grid[flashed] = 0
+    return grid, int(flashed.sum())
 
 def part1(grid):
     flashes = 0
     for _ in range(100):
-        flashes += sum(power_up(grid, *idx) for idx in np.ndindex(grid.shape))
-        grid = np.where(grid>9, 0, grid)
+        grid, flashed = step(grid)
+        flashes += flashed
     return flashes
 
 def part2(grid):
-    for step in itertools.count(start=1):
-        for idx in np.ndindex(grid.shape):
-            power_up(grid, *idx)
-        if np.all(grid > 9):
-            return step
-        grid = np.where(grid>9, 0, grid)
+    for n in itertools.count(start=1):
+        grid, flashed = step(grid)
+        if flashed == grid.size:
+            return n
 
 def parse_input(data_src):
     lines = data_src.readlines()
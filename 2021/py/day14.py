@@ -1,27 +1,30 @@
 #!/usr/bin/env python3
-import functools
+import os
+import sys
 import time
 from collections import Counter
 from io import StringIO
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.memo import memoize
+
 try:
     from tqdm import tqdm
 except ImportError:
     def tqdm(iterable=None, **kwargs):
         return iterable
 
-def polymerize(template, rules, steps):
-    @functools.lru_cache(maxsize=None)
-    def expand(pair, step):
-        if step == 0:
-            return Counter(pair[0])
-        return (expand(pair[0]+rules[pair], step-1) +
-                expand(rules[pair]+pair[1], step-1))
+@memoize(context=1)
+def expand(rules, pair, step):
+    if step == 0:
+        return Counter(pair[0])
+    return (expand(rules, pair[0]+rules[pair], step-1) +
+            expand(rules, rules[pair]+pair[1], step-1))
 
-    expand.cache_clear()  # in case example rules conflict with actual input
+def polymerize(template, rules, steps):
     counts = Counter()
     for idx in range(len(template)-1):
-        counts.update(expand(template[idx:idx+2], steps))
+        counts.update(expand(rules, template[idx:idx+2], steps))
     counts.update(template[-1])  # add last char in template manually
 
     freq = counts.most_common()
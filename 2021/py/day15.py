@@ -1,34 +1,32 @@
 #!/usr/bin/env python3
 import functools
-import heapq
+import os
+import sys
 import time
-from collections import defaultdict
 from io import StringIO
 
 import numpy as np
 
-try:
-    from tqdm import tqdm
-except ImportError:
-    def tqdm(iterable=None, **kwargs):
-        return iterable
-
-def grid_to_graph(grid):
-    graph = defaultdict(set)
-    for c in np.ndindex(grid.shape):
-        if c[0] > 0:
-            n = (c[0]-1, c[1])
-            graph[c].add((n, grid[n]))
-        if c[0] < grid.shape[0]-1:
-            n = (c[0]+1, c[1])
-            graph[c].add((n, grid[n]))
-        if c[1] > 0:
-            n = (c[0], c[1]-1)
-            graph[c].add((n, grid[n]))
-        if c[1] < grid.shape[1]-1:
-            n = (c[0], c[1]+1)
-            graph[c].add((n, grid[n]))
-    return graph  # {coord: {(neighbor_coord, distance)}
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.pathfinding import astar, dial
+
+def risk_moves(grid):
+    # states are flat indices, row * cols + col; entering a cell costs its risk
+    rows, cols = grid.shape
+    risks = grid.ravel().tolist()
+
+    def moves(state):
+        row, col = divmod(state, cols)
+        if row > 0:
+            yield state - cols, risks[state - cols]
+        if row < rows-1:
+            yield state + cols, risks[state + cols]
+        if col > 0:
+            yield state - 1, risks[state - 1]
+        if col < cols-1:
+            yield state + 1, risks[state + 1]
+
+    return moves
 
 def bigify_grid(grid):
     def increment_grid(g):
@@ -45,73 +43,24 @@ def bigify_grid(grid):
             g = increment_grid(g)
     return big
 
-def dijkstra(graph, target):
-    class Node:
-        __slots__ = 'coord', 'dist'
-        def __init__(self, coord, dist):
-            self.coord = coord
-            self.dist = dist
-        def __lt__(self, other):
-            return self.dist < other.dist
-
-    heap = []
-    coord_map = {}
-
-    coord_map[(0, 0)] = Node((0, 0), 0)
-    heapq.heappush(heap, coord_map[(0, 0)])
-    while heap:
-        current = heapq.heappop(heap)
-        if current.coord == target:
-            break
-        for neighbor, dist in graph[current.coord]:
-            if neighbor in coord_map:
-                if current.dist+dist < coord_map[neighbor].dist:
-                    coord_map[neighbor] = Node(neighbor, current.dist+dist)
-            else:
-                coord_map[neighbor] = Node(neighbor, current.dist+dist)
-                heapq.heappush(heap, coord_map[neighbor])
-
-    return coord_map[target].dist
-
-def a_star(graph, target):
-    class Node:
-        __slots__ = 'coord', 'dist', 'fscore'
-        def __init__(self, coord, dist):
-            self.coord = coord
-            self.dist = dist
-            self.fscore = dist + target[0]-coord[0] + target[1]-coord[1]
-        def __lt__(self, other):
-            return self.fscore < other.fscore
-
-    heap = []
-    coord_map = {}
-
-    coord_map[(0, 0)] = Node((0, 0), 0)
-    heapq.heappush(heap, coord_map[(0, 0)])
-    while heap:
-        current = heapq.heappop(heap)
-        if current.coord == target:
-            break
-        for neighbor, dist in graph[current.coord]:
-            if neighbor in coord_map:
-                if current.dist+dist < coord_map[neighbor].dist:
-                    coord_map[neighbor] = Node(neighbor, current.dist+dist)
-            else:
-                coord_map[neighbor] = Node(neighbor, current.dist+dist)
-                heapq.heappush(heap, coord_map[neighbor])
-
-    return coord_map[target].dist
+def dijkstra(grid):
+    # risks are 1-9, so a bucket queue beats a heap
+    return dial(grid.size, 0, risk_moves(grid), max_cost=9, goal=grid.size-1).distance
+
+def a_star(grid):
+    rows, cols = grid.shape
+
+    def heuristic(state):
+        row, col = divmod(state, cols)
+        return rows-1-row + cols-1-col
+
+    return astar(grid.size, 0, risk_moves(grid), heuristic, goal=grid.size-1).distance
 
 def part1(algo, grid):
-    graph = grid_to_graph(grid)
-    target = (grid.shape[0]-1, grid.shape[1]-1)
-    return algo(graph, target)
+    return algo(grid)
 
 def part2(algo, grid):
-    grid = bigify_grid(grid)
-    graph = grid_to_graph(grid)
-    target = (grid.shape[0]-1, grid.shape[1]-1)
-    return algo(graph, target)
+    return algo(bigify_grid(grid))
 
 def parse_input(data_src):
     data_src.seek(0)
@@ -1,14 +1,13 @@
 #!/usr/bin/env python3
+import os
+import sys
 import time
 from io import StringIO
 
 import numpy as np
 
-try:
-    from tqdm import tqdm
-except ImportError:
-    def tqdm(iterable=None, **kwargs):
-        return iterable
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.automaton import Automaton, binary_window
 
 def dump_image(image):
     for row in image:
@@ -18,17 +17,10 @@ def enhance(algo, image, passes):
     assert passes % 2 == 0
     assert algo[0] == 0 or algo[-1] == 0
 
-    for p in tqdm(range(passes), ncols=80, leave=False):
-        infinite_pts = 1 if algo[0] and p%2==1 else 0
-        image = np.pad(image, 2, constant_values=infinite_pts)
-        enhanced = np.empty((image.shape[0]-2, image.shape[1]-2), dtype=int)
-        for row in range(image.shape[0]-2):
-            for col in range(image.shape[1]-2):
-                bits = image[row:row+3, col:col+3].reshape(9)
-                idx = int(''.join(str(bit) for bit in bits), 2)
-                enhanced[row, col] = algo[idx]
-        image = enhanced
-    return image.sum()
+    # each pixel's 3x3 window, read as a binary number, indexes the algorithm;
+    # if algo[0] is lit the infinite background flips every pass
+    enhanced = Automaton(image, binary_window((3, 3)), algo)
+    return enhanced.run(passes).count()
 
 def part1(algo, image):
     return enhance(algo, image, 2)
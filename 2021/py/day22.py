@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
-import itertools
+import os
+import sys
 import time
 from io import StringIO
 from typing import NamedTuple
 
 import numpy as np
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.intervals import Box, BoxSet
+
 try:
     from tqdm import tqdm
 except ImportError:
@@ -25,52 +29,14 @@ def part1(cmds):
              prism.z[0]+50:prism.z[1]+50] = cmd == 'on'
     return grid.sum()
 
-def contains(a, b) -> bool:
-    """check if a contains b (total overlap)"""
-    return (b.x[0] >= a.x[0] and b.x[1] <= a.x[1] and
-            b.y[0] >= a.y[0] and b.y[1] <= a.y[1] and
-            b.z[0] >= a.z[0] and b.z[1] <= a.z[1])
-
-def overlaps(a, b) -> bool:
-    """check if a overlaps b (any overlap)"""
-    return not (a.x[1] <= b.x[0] or b.x[1] <= a.x[0] or
-                a.y[1] <= b.y[0] or b.y[1] <= a.y[0] or
-                a.z[1] <= b.z[0] or b.z[1] <= a.z[0])
-
-def fracture(A, B):
-    """fracture B into sub-prisms, returning non-overlapping fragments with A"""
-    xs = sorted({i for group in (A, B) for prism in group for i in prism.x})
-    ys = sorted({i for group in (A, B) for prism in group for i in prism.y})
-    zs = sorted({i for group in (A, B) for prism in group for i in prism.z})
-    fragments = [Prism(*coord)
-                 for coord in itertools.product(zip(xs, xs[1:]),
-                                                zip(ys, ys[1:]),
-                                                zip(zs, zs[1:]))]
-    return set(filter(lambda f: any(contains(b, f) for b in B) and
-                                not any(contains(a, f) for a in A),
-                      fragments))
-
-def volume(prism):
-    return ((prism.x[1] - prism.x[0]) *
-            (prism.y[1] - prism.y[0]) *
-            (prism.z[1] - prism.z[0]))
-
 def part2(cmds):
-    assert cmds[0][0] == 'on'
-
-    lit = {cmds[0][1]}
-    for cmd, newblock in tqdm(cmds[1:], ncols=80, leave=False):
-        intersecting = {p for p in lit if overlaps(p, newblock)}
-
+    lit = BoxSet()
+    for cmd, prism in tqdm(cmds, ncols=80, leave=False):
         if cmd == 'on':
-            fragments = fracture(intersecting, [newblock])
-            lit |= fragments
-        else:  # cmd == 'off'
-            fragments = fracture([newblock], intersecting)
-            lit -= intersecting
-            lit |= fragments
-
-    return sum(volume(prism) for prism in lit)
+            lit.add(Box(prism))
+        else:
+            lit.discard(Box(prism))
+    return lit.volume()
 
 def parse_input(data_src):
     """remap coords from [start,end] to [start,end)"""
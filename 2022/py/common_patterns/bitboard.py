@@ -0,0 +1,181 @@
+"""
+Grids of on/off cells packed into integers, one Python int per row.
+
+Bit c of `rows[r]` is the cell at (r, c), so moving every cell of a board
+one step is a shift of each row (or a shuffle of the row list), and set
+operations on whole boards are one bitwise op per row. Simulations that
+move many cells at once (elves, blizzards, wavefronts of reachable cells)
+do a handful of these per step instead of a lookup per cell.
+
+    elves = BitBoard.from_lines(lines)
+    has_north = elves.shift(1, 0)  # cells whose northern neighbour is set
+    crowded = elves & elves.neighbours()
+    blizzards.roll(0, 1)  # wraps round instead of dropping off the edge
+    len(elves), elves.bounds()
+
+Rows are arbitrary-precision ints rather than 64-bit words, so boards can
+be any width. `shift` drops cells pushed past an edge and `roll` wraps them
+round; `pad` adds empty margin for patterns that grow.
+"""
+from __future__ import annotations
+
+import typing
+
+Cell = tuple[int, int]
+
+
+class BitBoard:
+    __slots__ = ('width', 'height', 'rows')
+
+    def __init__(self, width: int, height: int, rows: typing.Iterable[int]|None=None):
+        self.width = width
+        self.height = height
+        self.rows = [0] * height if rows is None else list(rows)
+        if len(self.rows) != height:
+            raise ValueError(f"expected {height} rows, got {len(self.rows)}")
+
+    @classmethod
+    def from_lines(cls, lines: typing.Sequence[str], on: str='#') -> BitBoard:
+        """A board with the cells set where `lines` have any character in `on`."""
+        width = max((len(line) for line in lines), default=0)
+        return cls(width, len(lines),
+                   (sum(1 << col for col, ch in enumerate(line) if ch in on) for line in lines))
+
+    @classmethod
+    def from_cells(cls, width: int, height: int, cells: typing.Iterable[Cell]) -> BitBoard:
+        board = cls(width, height)
+        for row, col in cells:
+            board.add(row, col)
+        return board
+
+    def _like(self, rows: list[int]) -> BitBoard:
+        board = BitBoard.__new__(BitBoard)
+        board.width, board.height, board.rows = self.width, self.height, rows
+        return board
+
+    def copy(self) -> BitBoard:
+        return self._like(self.rows[:])
+
+    @property
+    def full_row(self) -> int:
+        return (1 << self.width) - 1
+
+    def key(self) -> tuple[int, ...]:
+        """The rows as a hashable tuple, e.g. for cycle detection."""
+        return tuple(self.rows)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BitBoard):
+            return NotImplemented
+        return self.width == other.width and self.rows == other.rows
+
+    def __len__(self) -> int:
+        """How many cells are set."""
+        return sum(row.bit_count() for row in self.rows)
+
+    def __bool__(self) -> bool:
+        return any(self.rows)
+
+    def __contains__(self, cell: Cell) -> bool:
+        row, col = cell
+        return 0 <= row < self.height and 0 <= col < self.width and self.rows[row] >> col & 1 == 1
+
+    def add(self, row: int, col: int):
+        if not (0 <= row < self.height and 0 <= col < self.width):
+            raise IndexError(f"({row}, {col}) is off the board")
+        self.rows[row] |= 1 << col
+
+    def discard(self, row: int, col: int):
+        if 0 <= row < self.height:
+            self.rows[row] &= ~(1 << col)
+
+    def cells(self) -> typing.Iterator[Cell]:
+        """Every set cell, in row-major order."""
+        for row, bits in enumerate(self.rows):
+            while bits:
+                low = bits & -bits
+                yield row, low.bit_length() - 1
+                bits ^= low
+
+    def __and__(self, other: BitBoard) -> BitBoard:
+        return self._like([a & b for a, b in zip(self.rows, other.rows)])
+
+    def __or__(self, other: BitBoard) -> BitBoard:
+        return self._like([a | b for a, b in zip(self.rows, other.rows)])
+
+    def __xor__(self, other: BitBoard) -> BitBoard:
+        return self._like([a ^ b for a, b in zip(self.rows, other.rows)])
+
+    def __sub__(self, other: BitBoard) -> BitBoard:
+        return self._like([a & ~b for a, b in zip(self.rows, other.rows)])
+
+    def __invert__(self) -> BitBoard:
+        full = self.full_row
+        return self._like([row ^ full for row in self.rows])
+
+    def shift(self, drow: int, dcol: int) -> BitBoard:
+        """Every cell moved by (drow, dcol); cells pushed off the board are lost."""
+        rows = self.rows
+        if dcol > 0:
+            full = self.full_row
+            rows = [(row << dcol) & full for row in rows]
+        elif dcol < 0:
+            rows = [row >> -dcol for row in rows]
+        if drow > 0:
+            rows = [0] * min(drow, self.height) + rows[:max(0, self.height-drow)]
+        elif drow < 0:
+            rows = rows[-drow:] + [0] * min(-drow, self.height)
+        return self._like(rows if rows is not self.rows else rows[:])
+
+    def roll(self, drow: int, dcol: int) -> BitBoard:
+        """Every cell moved by (drow, dcol), wrapping round the edges."""
+        rows = self.rows
+        dcol %= self.width or 1
+        if dcol:
+            full, back = self.full_row, self.width - dcol
+            rows = [((row << dcol) & full) | (row >> back) for row in rows]
+        drow %= self.height or 1
+        if drow:
+            rows = rows[-drow:] + rows[:-drow]
+        return self._like(rows if rows is not self.rows else rows[:])
+
+    def neighbours(self, diagonal: bool=True) -> BitBoard:
+        """The cells with at least one set neighbour (of 8, or 4 without diagonals)."""
+        full = self.full_row
+        across = [((row << 1) | (row >> 1)) & full for row in self.rows]
+        if diagonal:
+            reach = [((row << 1) | row | (row >> 1)) & full for row in self.rows]
+        else:
+            reach = self.rows
+        above, below = [0, *reach[:-1]], [*reach[1:], 0]
+        return self._like([a | b | c for a, b, c in zip(across, above, below)])
+
+    def transpose(self) -> BitBoard:
+        """The board flipped about its diagonal: cell (r, c) becomes (c, r)."""
+        columns = [0] * self.width
+        for row, col in self.cells():
+            columns[col] |= 1 << row
+        return BitBoard(self.height, self.width, columns)
+
+    def pad(self, margin: int) -> BitBoard:
+        """A bigger board with `margin` empty cells on every side."""
+        return BitBoard(self.width + 2 * margin, self.height + 2 * margin,
+                        [0] * margin + [row << margin for row in self.rows] + [0] * margin)
+
+    def bounds(self) -> tuple[int, int, int, int]|None:
+        """(first row, first col, row stop, col stop) around the set cells; None if none."""
+        occupied = [row for row, bits in enumerate(self.rows) if bits]
+        if not occupied:
+            return None
+        union = 0
+        for row in occupied:
+            union |= self.rows[row]
+        return (occupied[0], (union & -union).bit_length() - 1,
+                occupied[-1] + 1, union.bit_length())
+
+    def __str__(self) -> str:
+        return '\n'.join(''.join('#' if row >> col & 1 else '.' for col in range(self.width))
+                         for row in self.rows)
+
+    def __repr__(self) -> str:
+        return f"BitBoard({self.width}, {self.height}, {self.rows})"
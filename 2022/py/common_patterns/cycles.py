@@ -0,0 +1,139 @@
+"""
+Run a simulation to an enormous step count by finding where it repeats.
+
+    cycle = simulate_until_cycle(spin, lambda platform: platform.tobytes(),
+                                 1_000_000_000, platform, value_fn=calc_load)
+    cycle.value  # the load after a billion spins
+
+`step_fn(state)` advances the state one step and `state_key_fn(state)` gives
+what must match for two states to behave the same from then on (e.g. the
+top rows of a rock pile, and where the jet pattern is up to). Once step
+`start + period` has the same key as step `start`, everything from there
+repeats every `period` steps, so the run jumps ahead by whole periods and
+only steps through the remainder.
+
+`value_fn(state)` reads a number off the state: either something the key
+already fixes (the load on a platform) or a running total the key leaves
+out (the height of a rock pile). Either way it changes by the same amount
+every period, so its value at `target_steps` is extrapolated from one
+period's gain.
+
+Memory stays bounded however big the states are:
+
+- method='hashed' (the default) remembers only hash(key) and the value
+  for each step, never the states, so `step_fn` may update a state in
+  place and return it
+- method='brent' (Brent's algorithm) keeps just two states and compares
+  keys, so it has no hash collisions to worry about, but `step_fn` must
+  return a new state without changing the one it's given, and the steps
+  before the cycle are run twice
+"""
+from __future__ import annotations
+
+import typing
+from dataclasses import dataclass
+
+State = typing.TypeVar('State')
+
+
+@dataclass
+class Cycle(typing.Generic[State]):
+    start: int  # first step of the repeating part (0 if the initial state recurs)
+    period: int  # 0 if target_steps came before any repeat
+    steps: int  # the step `state` and `value` are for: target_steps, or start + period
+    state: State
+    value: typing.Any = None  # value_fn extrapolated to `steps`
+
+
+def simulate_until_cycle(step_fn: typing.Callable[[State], State],
+                         state_key_fn: typing.Callable[[State], typing.Hashable],
+                         target_steps: int|None, initial: State,
+                         value_fn: typing.Callable[[State], typing.Any]|None=None,
+                         method: str='hashed') -> Cycle[State]:
+    """
+    The state (and value) after `target_steps` steps from `initial`. With
+    target_steps=None, just find the cycle: `state` is then the state at
+    step `start + period`.
+    """
+    if method == 'hashed':
+        return _hashed(step_fn, state_key_fn, target_steps, initial, value_fn)
+    if method == 'brent':
+        return _brent(step_fn, state_key_fn, target_steps, initial, value_fn)
+    raise ValueError(f"unknown method {method!r}")
+
+def _value(value_fn, state):
+    return value_fn(state) if value_fn else None
+
+def _skip_ahead(step_fn, target_steps, state, step, period, gain, value_fn) -> tuple:
+    """Step `state` from `step` to where target_steps falls in the cycle; returns (state, value)."""
+    whole, remainder = divmod(target_steps - step, period)
+    for _ in range(remainder):
+        state = step_fn(state)
+    value = _value(value_fn, state)
+    if value_fn:
+        value += whole * gain
+    return state, value
+
+def _hashed(step_fn, state_key_fn, target_steps, state, value_fn) -> Cycle:
+    seen = {}  # hash(key) -> (step, value)
+    step = 0
+    while True:
+        value = _value(value_fn, state)
+        if step == target_steps:
+            return Cycle(step, 0, step, state, value)
+        key = hash(state_key_fn(state))
+        if key in seen:
+            start, start_value = seen[key]
+            period = step - start
+            gain = value - start_value if value_fn else None
+            if target_steps is None:
+                return Cycle(start, period, step, state, value)
+            state, value = _skip_ahead(step_fn, target_steps, state, step, period, gain,
+                                       value_fn)
+            return Cycle(start, period, target_steps, state, value)
+        seen[key] = step, value
+        state = step_fn(state)
+        step += 1
+
+def _brent(step_fn, state_key_fn, target_steps, initial, value_fn) -> Cycle:
+    # find the period: the hare runs ahead and the tortoise jumps to it at
+    # every power of two, until the hare comes round to the tortoise again
+    tortoise, tortoise_key = initial, state_key_fn(initial)
+    if target_steps == 0:
+        return Cycle(0, 0, 0, initial, _value(value_fn, initial))
+    hare, hare_step = step_fn(initial), 1
+    power = period = 1
+    while state_key_fn(hare) != tortoise_key:
+        if hare_step == target_steps:
+            return Cycle(hare_step, 0, hare_step, hare, _value(value_fn, hare))
+        if power == period:
+            tortoise, tortoise_key = hare, state_key_fn(hare)
+            power *= 2
+            period = 0
+        hare = step_fn(hare)
+        hare_step += 1
+        period += 1
+
+    # find the start: walk two states `period` apart from the beginning
+    # until they match
+    tortoise = hare = initial
+    for _ in range(period):
+        hare = step_fn(hare)
+    start = 0
+    while state_key_fn(tortoise) != state_key_fn(hare):
+        if start == target_steps:
+            return Cycle(start, 0, start, tortoise, _value(value_fn, tortoise))
+        tortoise, hare = step_fn(tortoise), step_fn(hare)
+        start += 1
+
+    step = start + period
+    value = _value(value_fn, hare)
+    if target_steps is None:
+        return Cycle(start, period, step, hare, value)
+    if target_steps < step:
+        for _ in range(target_steps - start):
+            tortoise = step_fn(tortoise)
+        return Cycle(start, period, target_steps, tortoise, _value(value_fn, tortoise))
+    gain = value - value_fn(tortoise) if value_fn else None
+    hare, value = _skip_ahead(step_fn, target_steps, hare, step, period, gain, value_fn)
+    return Cycle(start, period, target_steps, hare, value)
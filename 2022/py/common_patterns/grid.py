@@ -0,0 +1,163 @@
+"""
+Character grids stored as one contiguous uint8 array.
+
+Cells are addressed by flat index into `data`, so a neighbour is just an
+offset away (`grid.offsets(diagonal=False)`), and whole-grid questions are
+NumPy operations on `grid.array` or on the shifted views from
+`grid.shifted`/`grid.neighbours`.
+
+Rows are `stride` bytes apart. Built straight from input bytes with pad=0,
+the grid keeps each line's newline as a one-column sentinel between rows and
+makes no copy at all (the array is then read-only). With pad=N the grid is
+copied once into a buffer with an N-cell border of `fill` on every side, so
+walks and neighbour views never need a bounds check:
+
+    grid = Grid.from_input(data_src, pad=1, fill='#')
+    start = grid.find('S')
+    for step in grid.offsets(diagonal=False):
+        if grid.data[start + step] != grid.code('#'): ...
+    crowded = grid.count_neighbours('@', diagonal=True) >= 4
+"""
+from __future__ import annotations
+
+import typing
+
+import numpy as np
+
+CharLike = typing.Union[str, bytes, int]
+
+OFFSETS4 = ((-1, 0), (0, 1), (1, 0), (0, -1))  # N, E, S, W
+OFFSETS8 = ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1))
+
+
+class Grid:
+    __slots__ = ('data', 'rows', 'cols', 'stride', 'pad', 'fill')
+
+    def __init__(self, data: np.ndarray, rows: int, cols: int, stride: int,
+                 pad: int=0, fill: int=ord('\n')):
+        self.data = data  # flat uint8, (rows + 2*pad) * stride long
+        self.rows, self.cols = rows, cols
+        self.stride = stride  # bytes from one row to the next
+        self.pad = pad
+        self.fill = fill
+
+    @classmethod
+    def from_bytes(cls, text: bytes|bytearray|memoryview, pad: int=0,
+                   fill: CharLike='\n') -> Grid:
+        """A grid of the lines in `text`; no copy if pad=0 and every line ends in a newline."""
+        raw = np.frombuffer(text, dtype=np.uint8)
+        while len(raw) > 1 and raw[-1] == raw[-2] == 10:
+            raw = raw[:-1]  # blank lines at the end
+        cols = int(np.argmax(raw == 10))
+        if not len(raw) or raw[cols] != 10:
+            cols = len(raw)
+        stride = cols + 1
+        if len(raw) % stride:
+            raw = np.append(raw, np.uint8(10))  # no newline at the end
+        rows = len(raw) // stride
+        if len(raw) != rows * stride or (raw[cols::stride] != 10).any():
+            raise ValueError("grid lines must all be the same length")
+        fill = cls.code(fill)
+        if not pad:
+            return cls(raw, rows, cols, stride, 0, 10)
+
+        stride = cols + 2*pad
+        padded = np.full((rows + 2*pad, stride), fill, dtype=np.uint8)
+        padded[pad:pad+rows, pad:pad+cols] = raw.reshape(rows, cols + 1)[:, :cols]
+        return cls(padded.reshape(-1), rows, cols, stride, pad, fill)
+
+    @classmethod
+    def from_input(cls, data_src: typing.TextIO, pad: int=0, fill: CharLike='\n') -> Grid:
+        """A grid of a puzzle input, mapped without a copy when it's an aoctools MappedInput."""
+        data_src.seek(0)
+        view = getattr(data_src, 'view', None)
+        text = view if view is not None else data_src.read().encode()
+        return cls.from_bytes(text, pad, fill)
+
+    @staticmethod
+    def code(char: CharLike) -> int:
+        """The byte value of a one-character str/bytes (ints pass through)."""
+        return char if isinstance(char, int) else ord(char)
+
+    def copy(self) -> Grid:
+        """A writable copy (grids straight from input bytes are read-only)."""
+        return Grid(self.data.copy(), self.rows, self.cols, self.stride, self.pad, self.fill)
+
+    @property
+    def padded(self) -> np.ndarray:
+        """2-D view of the whole buffer, border included."""
+        return self.data.reshape(-1, self.stride)
+
+    @property
+    def array(self) -> np.ndarray:
+        """2-D view of just the grid's own cells."""
+        pad = self.pad
+        return self.padded[pad:pad+self.rows, pad:pad+self.cols]
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.rows, self.cols
+
+    def index(self, row: int, col: int) -> int:
+        return (row + self.pad) * self.stride + col + self.pad
+
+    def position(self, index: int) -> tuple[int, int]:
+        row, col = divmod(index, self.stride)
+        return row - self.pad, col - self.pad
+
+    def inside(self, index: int) -> bool:
+        """Whether a flat index is one of the grid's own cells rather than border."""
+        row, col = self.position(index)
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def offsets(self, *, diagonal: bool) -> tuple[int, ...]:
+        """Flat-index steps to the 4 (N, E, S, W) or 8 (clockwise from N) neighbours."""
+        return tuple(dr*self.stride + dc for dr, dc in (OFFSETS8 if diagonal else OFFSETS4))
+
+    def __getitem__(self, key: int|tuple[int, int]) -> int:
+        return int(self.data[self.index(*key) if isinstance(key, tuple) else key])
+
+    def __setitem__(self, key: int|tuple[int, int], char: CharLike):
+        self.data[self.index(*key) if isinstance(key, tuple) else key] = self.code(char)
+
+    def find(self, char: CharLike) -> int:
+        """Flat index of the first `char`, or -1."""
+        hits = np.flatnonzero(self.data == self.code(char))
+        return int(hits[0]) if len(hits) else -1
+
+    def where(self, char: CharLike) -> np.ndarray:
+        """Flat indices of every `char` (border cells included if `char` is the fill)."""
+        return np.flatnonzero(self.data == self.code(char))
+
+    def positions(self, char: CharLike) -> list[tuple[int, int]]:
+        """(row, col) of every `char` in the grid itself, in reading order."""
+        rows, cols = np.nonzero(self.array == self.code(char))
+        return list(zip(rows.tolist(), cols.tolist()))
+
+    def shifted(self, dr: int, dc: int) -> np.ndarray:
+        """
+        View shaped like `array` whose [r, c] is the cell at [r+dr, c+dc], reading
+        into the border at the edges. Needs pad >= the size of the shift.
+        """
+        if max(abs(dr), abs(dc)) > self.pad:
+            raise ValueError(f"shift ({dr}, {dc}) reaches past a border of {self.pad}")
+        row, col = self.pad + dr, self.pad + dc
+        return self.padded[row:row+self.rows, col:col+self.cols]
+
+    def neighbours(self, *, diagonal: bool) -> list[np.ndarray]:
+        """The shifted views for the 4 or 8 neighbours, in `offsets` order."""
+        return [self.shifted(dr, dc) for dr, dc in (OFFSETS8 if diagonal else OFFSETS4)]
+
+    def count_neighbours(self, char: CharLike, *, diagonal: bool) -> np.ndarray:
+        """For every cell, how many of its neighbours are `char`."""
+        code = self.code(char)
+        counts = np.zeros(self.shape, dtype=np.uint8)
+        for view in self.neighbours(diagonal=diagonal):
+            counts += view == code
+        return counts
+
+    def __str__(self) -> str:
+        return '\n'.join(row.tobytes().decode() for row in self.array)
+
+    def __repr__(self) -> str:
+        return f"Grid({self.rows}x{self.cols}, pad={self.pad})"
@@ -0,0 +1,342 @@
+"""
+Sets of integer intervals, maps that shift whole intervals, and boxes.
+
+Intervals are half-open, [start, stop) like range(), so an interval holds
+stop - start integers and touching intervals ([1, 3) and [3, 5)) merge.
+Puzzles that give inclusive ends go in through the `from_inclusive`
+constructors.
+
+- IntervalSet: disjoint, sorted intervals kept as parallel lists of starts
+  and stops, so membership is one bisect and set operations are sweeps
+  along the sorted lists
+- RangeMap: a piecewise shift of the integers (AoC's "dest src length"
+  tables) that pushes whole intervals through, splitting them where the
+  pieces meet, instead of mapping values one at a time
+- Box and BoxSet: the same for N dimensions, one interval per axis
+
+    fresh = IntervalSet.from_inclusive([(3, 5), (10, 14), (12, 18)])
+    17 in fresh, fresh.size  # True, 12
+    locations = RangeMap.from_table(rows).map_set(seeds)
+    cube = Box([(0, 10), (0, 10), (0, 10)])
+"""
+from __future__ import annotations
+
+import math
+import typing
+from bisect import bisect_left, bisect_right
+
+Interval = tuple[int, int]
+
+
+class IntervalSet:
+    """
+    A set of integers held as disjoint, non-touching [start, stop) intervals
+    in order. len() is the number of intervals; `size` is how many integers
+    they cover.
+    """
+    __slots__ = ('starts', 'stops')
+
+    def __init__(self, intervals: typing.Iterable[Interval]=()):
+        starts, stops = [], []
+        for start, stop in sorted(intervals):
+            if start >= stop:
+                continue
+            if stops and start <= stops[-1]:
+                if stop > stops[-1]:
+                    stops[-1] = stop
+            else:
+                starts.append(start)
+                stops.append(stop)
+        self.starts, self.stops = starts, stops
+
+    @classmethod
+    def from_inclusive(cls, intervals: typing.Iterable[Interval]) -> IntervalSet:
+        """A set of [first, last] intervals, both ends included."""
+        return cls((first, last + 1) for first, last in intervals)
+
+    @classmethod
+    def _from_sorted(cls, starts: list[int], stops: list[int]) -> IntervalSet:
+        intervals = cls.__new__(cls)
+        intervals.starts, intervals.stops = starts, stops
+        return intervals
+
+    def copy(self) -> IntervalSet:
+        return IntervalSet._from_sorted(self.starts[:], self.stops[:])
+
+    def __iter__(self) -> typing.Iterator[Interval]:
+        return zip(self.starts, self.stops)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return self.starts == other.starts and self.stops == other.stops
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({list(self)})"
+
+    @property
+    def size(self) -> int:
+        """How many integers the set holds."""
+        return sum(self.stops) - sum(self.starts)
+
+    @property
+    def bounds(self) -> Interval:
+        """[start, stop) of the whole set; ValueError if it's empty."""
+        if not self.starts:
+            raise ValueError("empty IntervalSet has no bounds")
+        return self.starts[0], self.stops[-1]
+
+    def find(self, value: int) -> Interval|None:
+        """The interval holding `value`, or None."""
+        i = bisect_right(self.starts, value) - 1
+        if i >= 0 and value < self.stops[i]:
+            return self.starts[i], self.stops[i]
+        return None
+
+    def __contains__(self, value: int) -> bool:
+        i = bisect_right(self.starts, value) - 1
+        return i >= 0 and value < self.stops[i]
+
+    def add(self, start: int, stop: int):
+        """Add [start, stop), merging it with anything it overlaps or touches."""
+        if start >= stop:
+            return
+        lo = bisect_left(self.stops, start)
+        hi = bisect_right(self.starts, stop)
+        if lo < hi:
+            start = min(start, self.starts[lo])
+            stop = max(stop, self.stops[hi-1])
+        self.starts[lo:hi] = [start]
+        self.stops[lo:hi] = [stop]
+
+    def discard(self, start: int, stop: int):
+        """Remove [start, stop), splitting an interval that straddles either end."""
+        if start >= stop:
+            return
+        lo = bisect_right(self.stops, start)
+        hi = bisect_left(self.starts, stop)
+        if lo >= hi:
+            return
+        starts, stops = [], []
+        if self.starts[lo] < start:
+            starts.append(self.starts[lo])
+            stops.append(start)
+        if self.stops[hi-1] > stop:
+            starts.append(stop)
+            stops.append(self.stops[hi-1])
+        self.starts[lo:hi] = starts
+        self.stops[lo:hi] = stops
+
+    def union(self, other: typing.Iterable[Interval]) -> IntervalSet:
+        return IntervalSet([*self, *other])
+
+    def intersection(self, other: IntervalSet) -> IntervalSet:
+        starts, stops = [], []
+        i = j = 0
+        while i < len(self.starts) and j < len(other.starts):
+            start = max(self.starts[i], other.starts[j])
+            stop = min(self.stops[i], other.stops[j])
+            if start < stop:
+                starts.append(start)
+                stops.append(stop)
+            if self.stops[i] < other.stops[j]:
+                i += 1
+            else:
+                j += 1
+        return IntervalSet._from_sorted(starts, stops)
+
+    def gaps(self, start: int|None=None, stop: int|None=None) -> IntervalSet:
+        """What the set leaves uncovered in [start, stop) (default: its own bounds)."""
+        if not self.starts:
+            return IntervalSet([] if start is None or stop is None else [(start, stop)])
+        start = self.starts[0] if start is None else start
+        stop = self.stops[-1] if stop is None else stop
+        edges = [start, *(edge for interval in self for edge in interval), stop]
+        return IntervalSet(
+            (max(gap_start, start), min(gap_stop, stop))
+            for gap_start, gap_stop in zip(edges[::2], edges[1::2]))
+
+    def difference(self, other: IntervalSet) -> IntervalSet:
+        if not self.starts:
+            return IntervalSet()
+        return self.intersection(other.gaps(*self.bounds))
+
+    def clip(self, start: int, stop: int) -> IntervalSet:
+        """The part of the set inside [start, stop)."""
+        return self.intersection(IntervalSet([(start, stop)]))
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+
+class RangeMap:
+    """
+    x -> x + offset on each of a set of disjoint [start, stop) pieces, and
+    x -> x everywhere else.
+    """
+    __slots__ = ('starts', 'stops', 'offsets')
+
+    def __init__(self, pieces: typing.Iterable[tuple[int, int, int]]=()):
+        self.starts, self.stops, self.offsets = [], [], []
+        for start, stop, offset in sorted(pieces):
+            if start >= stop:
+                continue
+            if self.stops and start < self.stops[-1]:
+                raise ValueError(f"pieces overlap at [{start}, {self.stops[-1]})")
+            self.starts.append(start)
+            self.stops.append(stop)
+            self.offsets.append(offset)
+
+    @classmethod
+    def from_table(cls, rows: typing.Iterable[tuple[int, int, int]]) -> RangeMap:
+        """A map from (destination start, source start, length) rows."""
+        return cls((source, source + length, dest - source) for dest, source, length in rows)
+
+    def __repr__(self) -> str:
+        return f"RangeMap({list(zip(self.starts, self.stops, self.offsets))})"
+
+    def __call__(self, value: int) -> int:
+        i = bisect_right(self.starts, value) - 1
+        if i >= 0 and value < self.stops[i]:
+            return value + self.offsets[i]
+        return value
+
+    def __contains__(self, value: int) -> bool:
+        """Whether a piece moves `value` (rather than it mapping to itself)."""
+        i = bisect_right(self.starts, value) - 1
+        return i >= 0 and value < self.stops[i]
+
+    def map_interval(self, start: int, stop: int) -> typing.Iterator[Interval]:
+        """The images of [start, stop), one per piece (or gap between pieces) it crosses."""
+        starts, stops, offsets = self.starts, self.stops, self.offsets
+        i = max(bisect_right(starts, start) - 1, 0)
+        while start < stop:
+            if i < len(starts) and stops[i] <= start:
+                i += 1
+                continue
+            if i == len(starts) or starts[i] >= stop:
+                yield start, stop
+                return
+            if start < starts[i]:
+                yield start, starts[i]
+                start = starts[i]
+            end = min(stop, stops[i])
+            yield start + offsets[i], end + offsets[i]
+            start = end
+            i += 1
+
+    def map_set(self, intervals: IntervalSet) -> IntervalSet:
+        """The image of every value in `intervals`."""
+        return IntervalSet(image for interval in intervals
+                           for image in self.map_interval(*interval))
+
+
+class Box(tuple):
+    """An N-dimensional box: one [start, stop) interval per axis."""
+    __slots__ = ()
+
+    def __new__(cls, bounds: typing.Iterable[Interval]):
+        return tuple.__new__(cls, (tuple(axis) for axis in bounds))
+
+    @classmethod
+    def from_inclusive(cls, bounds: typing.Iterable[Interval]) -> Box:
+        return cls((first, last + 1) for first, last in bounds)
+
+    @property
+    def dims(self) -> int:
+        return len(self)
+
+    def empty(self) -> bool:
+        return any(start >= stop for start, stop in self)
+
+    def volume(self) -> int:
+        return math.prod(max(0, stop - start) for start, stop in self)
+
+    def contains_point(self, point: typing.Sequence[int]) -> bool:
+        return all(start <= value < stop for (start, stop), value in zip(self, point))
+
+    def contains(self, other: Box) -> bool:
+        """Whether `other` lies wholly inside this box."""
+        return all(start <= other_start and other_stop <= stop
+                   for (start, stop), (other_start, other_stop) in zip(self, other))
+
+    def overlaps(self, other: Box) -> bool:
+        return all(start < other_stop and other_start < stop
+                   for (start, stop), (other_start, other_stop) in zip(self, other))
+
+    def intersection(self, other: Box) -> Box|None:
+        """The overlap of two boxes, or None."""
+        bounds = [(max(start, other_start), min(stop, other_stop))
+                  for (start, stop), (other_start, other_stop) in zip(self, other)]
+        if any(start >= stop for start, stop in bounds):
+            return None
+        return Box(bounds)
+
+    def split(self, axis: int, at: int) -> tuple[Box|None, Box|None]:
+        """The parts of the box below `at` and from `at` up on one axis (None if empty)."""
+        start, stop = self[axis]
+        if at <= start:
+            return None, self
+        if at >= stop:
+            return self, None
+        return self.with_axis(axis, (start, at)), self.with_axis(axis, (at, stop))
+
+    def with_axis(self, axis: int, interval: Interval) -> Box:
+        return tuple.__new__(Box, (*self[:axis], tuple(interval), *self[axis+1:]))
+
+    def difference(self, other: Box) -> list[Box]:
+        """This box less `other`, as at most 2*dims disjoint boxes."""
+        overlap = self.intersection(other)
+        if overlap is None:
+            return [self]
+        pieces = []
+        rest = self
+        for axis, (lo, hi) in enumerate(overlap):
+            start, stop = rest[axis]
+            if start < lo:
+                pieces.append(rest.with_axis(axis, (start, lo)))
+            if hi < stop:
+                pieces.append(rest.with_axis(axis, (hi, stop)))
+            rest = rest.with_axis(axis, (lo, hi))
+        return pieces
+
+
+class BoxSet:
+    """A region held as disjoint boxes, for turning boxes of cells on and off."""
+    __slots__ = ('boxes',)
+
+    def __init__(self, boxes: typing.Iterable[Box]=()):
+        self.boxes: list[Box] = []
+        for box in boxes:
+            self.add(box)
+
+    def __iter__(self) -> typing.Iterator[Box]:
+        return iter(self.boxes)
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def __repr__(self) -> str:
+        return f"BoxSet({self.boxes})"
+
+    def add(self, box: Box):
+        self.discard(box)
+        if not box.empty():
+            self.boxes.append(box)
+
+    def discard(self, box: Box):
+        """Cut `box` out of the region; boxes it only partly covers are split."""
+        kept = []
+        for held in self.boxes:
+            if held.overlaps(box):
+                kept.extend(held.difference(box))
+            else:
+                kept.append(held)
+        self.boxes = kept
+
+    def volume(self) -> int:
+        return sum(box.volume() for box in self.boxes)
@@ -0,0 +1,136 @@
+"""
+Memoization for functions whose first arguments are unhashable context.
+
+functools.cache hashes every argument on every call, so puzzle code either
+hides the grid in a global, builds a closure per input, or pays to hash a
+big tuple each time. `memoize(context=n)` instead takes the first n
+arguments as context and keys them by identity: each distinct context
+object gets its own table of results, keyed on the remaining arguments.
+
+    @memoize(context=1)
+    def reachable_peaks(grid, row, col, height): ...
+
+    @memoize(context=2, maxsize=100_000)
+    def get_bit(wires, gates, label): ...
+
+Context objects are held by the cache while it has results for them (so
+their ids can't be reused), and only the `max_contexts` most recently used
+contexts keep their tables: a test run followed by the real input doesn't
+leave the test's results behind for the rest of the process. `maxsize`
+bounds each table, evicting the least recently used result.
+
+`fn.cache_info()` gives hits, misses and sizes; `fn.cache_clear()` empties
+everything and `fn.cache_clear(*context)` just that context's table. Only
+positional arguments are supported.
+
+Each table is a functools.lru_cache over `fn` with its context bound, so a
+hit is one identity check in Python and the rest in C: about 0.2 us more
+than functools.cache, whose whole hit is in C. That is cheaper than hashing
+a grid or building a closure per input, but for functions whose arguments
+are all small and hashable anyway, plain functools.cache is quicker.
+"""
+from __future__ import annotations
+
+import functools
+import typing
+from collections import OrderedDict, namedtuple
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize', 'contexts'])
+
+_NO_CONTEXT = object()
+
+
+def memoize(fn: typing.Callable|None=None, *, context: int=0, maxsize: int|None=None,
+            max_contexts: int=4) -> typing.Callable:
+    """
+    Decorator caching `fn`'s results. Usable bare (`@memoize`, no context) or
+    with options (`@memoize(context=1, maxsize=10_000)`).
+    """
+    if fn is None:
+        return functools.partial(memoize, context=context, maxsize=maxsize,
+                                 max_contexts=max_contexts)
+    if maxsize is not None and maxsize < 1:
+        raise ValueError("maxsize must be at least 1 (or None for unbounded)")
+    if max_contexts < 1:
+        raise ValueError("max_contexts must be at least 1")
+
+    # each context's table is a functools.lru_cache over fn with the context
+    # bound, so lookups, hit counts and LRU eviction all happen in C
+    tables = OrderedDict()  # ids of the context -> (the context objects, cached fn)
+    current_id = current = None  # the last context used, to skip the lookup
+    current_first = _NO_CONTEXT
+    dropped_hits = dropped_misses = 0  # counts from tables that have been evicted
+
+    def new_table(context_args: tuple) -> typing.Callable:
+        return functools.lru_cache(maxsize)(functools.partial(fn, *context_args))
+
+    def drop(entry):
+        nonlocal dropped_hits, dropped_misses
+        info = entry[1].cache_info()
+        dropped_hits += info.hits
+        dropped_misses += info.misses
+
+    def table_for(args) -> typing.Callable:
+        nonlocal current_id, current_first, current
+        ident = id(args[0]) if context == 1 else tuple(map(id, args[:context]))
+        if ident == current_id:
+            return current
+        entry = tables.get(ident)
+        if entry is None:
+            entry = tables[ident] = (args[:context], new_table(args[:context]))
+            while len(tables) > max_contexts:
+                drop(tables.popitem(last=False)[1])
+        else:
+            tables.move_to_end(ident)
+        current_id, current_first, current = ident, args[0], entry[1]
+        return current
+
+    if not context:
+        tables[()] = ((), new_table(()))
+        current_id, current = (), tables[()][1]
+
+    if context == 1:
+        # the common case: one identity check, then straight into the C cache
+        def wrapper(first, *key):
+            if first is current_first:
+                return current(*key)
+            return table_for((first,))(*key)
+    elif context:
+        def wrapper(*args):
+            return table_for(args)(*args[context:])
+    else:
+        def wrapper(*args):
+            return current(*args)
+
+    def cache_info() -> CacheInfo:
+        infos = [results.cache_info() for _, results in tables.values()]
+        return CacheInfo(dropped_hits + sum(info.hits for info in infos),
+                         dropped_misses + sum(info.misses for info in infos), maxsize,
+                         sum(info.currsize for info in infos), len(tables) if context else 0)
+
+    def cache_clear(*context_args):
+        """Forget everything, or with context arguments, just that context's results."""
+        nonlocal dropped_hits, dropped_misses, current_id, current_first, current
+        if context_args:
+            if len(context_args) != context:
+                raise TypeError(f"cache_clear takes {context} context argument(s)")
+            ident = id(context_args[0]) if context == 1 else tuple(map(id, context_args))
+            entry = tables.pop(ident, None)
+            if entry is not None:
+                drop(entry)
+            if ident == current_id:
+                current_id = current = None
+                current_first = _NO_CONTEXT
+            return
+        dropped_hits = dropped_misses = 0
+        tables.clear()
+        if context:
+            current_id = current = None
+            current_first = _NO_CONTEXT
+        else:
+            tables[()] = ((), new_table(()))
+            current_id, current = (), tables[()][1]
+
+    wrapper.cache_info = cache_info
+    wrapper.cache_clear = cache_clear
+    return functools.update_wrapper(wrapper, fn)
@@ -0,0 +1,218 @@
+"""
+Shortest paths over implicit graphs of integer-encoded states.
+
+A state is an int in range(n_states) (e.g. a flat grid index, or
+`index * 4 + direction`), and the graph is a function giving each state's
+(next_state, cost) pairs. Distances and predecessors live in flat arrays
+indexed by state, and stale heap entries are skipped by comparing against the
+stored distance, so no node objects or 'obsolete' flags are needed.
+
+    def moves(state):
+        index, facing = divmod(state, 4)
+        yield (index + steps[facing]) * 4 + facing, 1
+        yield index * 4 + (facing + 1) % 4, 1000
+        yield index * 4 + (facing - 1) % 4, 1000
+
+    paths = dijkstra(len(grid.data) * 4, start, moves, goal=is_end, all_paths=True)
+    paths.distance, paths.path(), paths.on_best_paths()
+
+- `dijkstra`: any non-negative costs
+- `dial`: small integer costs (at most `max_cost`), using a bucket queue
+- `astar`: `dijkstra` guided by an admissible `heuristic(state)`
+- `bfs`: unit costs
+
+With all_paths=True every predecessor on an equally short path is kept,
+making the "all best paths" DAG that `on_best_paths` walks back through.
+"""
+from __future__ import annotations
+
+import heapq
+import typing
+from array import array
+from collections import deque
+
+INF = (1 << 62) - 1  # larger than any real distance; fits the arrays' int64
+
+Neighbours = typing.Callable[[int], typing.Iterable[tuple[int, int]]]
+Goal = typing.Union[int, typing.Collection[int], typing.Callable[[int], bool], None]
+
+
+class Paths:
+    """The outcome of a search: distances, predecessors and the goal reached."""
+
+    def __init__(self, n_states: int, all_paths: bool=False):
+        self.dist = array('q', [INF]) * n_states
+        self.prev = array('q', [-1]) * n_states
+        # with all_paths, every predecessor on an equally short path: {state: [prev, ...]}
+        self.preds: dict[int, list[int]]|None = {} if all_paths else None
+        self.goals: list[int] = []  # goal states reached at the best distance
+
+    @property
+    def goal(self) -> int:
+        """The first goal state reached, or -1."""
+        return self.goals[0] if self.goals else -1
+
+    @property
+    def distance(self) -> int|None:
+        """Distance to the goal, or None if it can't be reached."""
+        return self.dist[self.goals[0]] if self.goals else None
+
+    def reached(self, state: int) -> bool:
+        return self.dist[state] != INF
+
+    def path(self, state: int|None=None) -> list[int]:
+        """One shortest path from a source to `state` (default: the goal)."""
+        state = self.goal if state is None else state
+        if state < 0 or self.dist[state] == INF:
+            return []
+        path = [state]
+        while (state := self.prev[state]) >= 0:
+            path.append(state)
+        return path[::-1]
+
+    def on_best_paths(self, states: typing.Iterable[int]|None=None) -> set[int]:
+        """Every state on any shortest path to `states` (default: the goals reached)."""
+        if self.preds is None:
+            raise ValueError("search without all_paths=True only keeps one path")
+        pending = list(self.goals if states is None else states)
+        seen = set(pending)
+        while pending:
+            for prev in self.preds.get(pending.pop(), ()):
+                if prev not in seen:
+                    seen.add(prev)
+                    pending.append(prev)
+        return seen
+
+
+def _goal_test(goal: Goal) -> typing.Callable[[int], bool]:
+    if goal is None:
+        return lambda state: False
+    if isinstance(goal, int):
+        return goal.__eq__
+    if callable(goal):
+        return goal
+    return set(goal).__contains__
+
+def _sources(sources: int|typing.Iterable[int]) -> list[int]:
+    return [sources] if isinstance(sources, int) else list(sources)
+
+def _relax(paths: Paths, state: int, next_state: int, next_dist: int) -> bool:
+    """Record a path to next_state through state; True if it's strictly shorter."""
+    dist = paths.dist
+    if next_dist < dist[next_state]:
+        dist[next_state] = next_dist
+        paths.prev[next_state] = state
+        if paths.preds is not None:
+            paths.preds[next_state] = [state]
+        return True
+    if paths.preds is not None and next_dist == dist[next_state]:
+        paths.preds.setdefault(next_state, []).append(state)
+    return False
+
+def dijkstra(n_states: int, sources: int|typing.Iterable[int], neighbours: Neighbours,
+             goal: Goal=None, all_paths: bool=False) -> Paths:
+    """
+    Shortest distances from `sources`, stopping once the goal is settled (or,
+    with all_paths, once everything as close as the goal is). Without a goal,
+    every reachable state is settled.
+    """
+    return astar(n_states, sources, neighbours, None, goal, all_paths)
+
+def astar(n_states: int, sources: int|typing.Iterable[int], neighbours: Neighbours,
+          heuristic: typing.Callable[[int], int]|None, goal: Goal,
+          all_paths: bool=False) -> Paths:
+    """Dijkstra ordered by distance + heuristic(state); the heuristic must never overestimate."""
+    is_goal = _goal_test(goal)
+    paths = Paths(n_states, all_paths)
+    dist = paths.dist
+    heap = []
+    for source in _sources(sources):
+        dist[source] = 0
+        heap.append((heuristic(source) if heuristic else 0, 0, source))
+    heapq.heapify(heap)
+
+    best = INF
+    while heap:
+        estimate, state_dist, state = heapq.heappop(heap)
+        if state_dist > dist[state]:
+            continue  # superseded by a shorter path
+        if estimate > best:
+            break
+        if is_goal(state):
+            best = state_dist
+            paths.goals.append(state)
+            if not all_paths:
+                break
+            continue
+        for next_state, cost in neighbours(state):
+            next_dist = state_dist + cost
+            if _relax(paths, state, next_state, next_dist):
+                estimate = next_dist + heuristic(next_state) if heuristic else next_dist
+                heapq.heappush(heap, (estimate, next_dist, next_state))
+    return paths
+
+def dial(n_states: int, sources: int|typing.Iterable[int], neighbours: Neighbours,
+         max_cost: int, goal: Goal=None, all_paths: bool=False) -> Paths:
+    """
+    Dijkstra for integer costs in 0..max_cost, with a ring of max_cost+1
+    buckets in place of the heap, so each push and pop is O(1).
+    """
+    is_goal = _goal_test(goal)
+    paths = Paths(n_states, all_paths)
+    dist = paths.dist
+    ring = max_cost + 1
+    buckets = [[] for _ in range(ring)]
+    for source in _sources(sources):
+        dist[source] = 0
+        buckets[0].append(source)
+    pending = sum(map(len, buckets))
+
+    current = 0
+    best = INF
+    while pending and current <= best:
+        bucket = buckets[current % ring]
+        while bucket:
+            state = bucket.pop()
+            pending -= 1
+            if dist[state] != current:
+                continue  # superseded by a shorter path
+            if is_goal(state):
+                best = current
+                paths.goals.append(state)
+                continue
+            for next_state, cost in neighbours(state):
+                if _relax(paths, state, next_state, current + cost):
+                    buckets[(current + cost) % ring].append(next_state)
+                    pending += 1
+        if paths.goals and not all_paths:
+            break
+        current += 1
+    return paths
+
+def bfs(n_states: int, sources: int|typing.Iterable[int],
+        neighbours: typing.Callable[[int], typing.Iterable[int]], goal: Goal=None,
+        all_paths: bool=False) -> Paths:
+    """Shortest paths when every step costs 1; `neighbours` yields bare states."""
+    is_goal = _goal_test(goal)
+    paths = Paths(n_states, all_paths)
+    dist = paths.dist
+    queue = deque(_sources(sources))
+    for source in queue:
+        dist[source] = 0
+
+    best = INF
+    while queue:
+        state = queue.popleft()
+        state_dist = dist[state]
+        if state_dist > best:
+            break
+        if is_goal(state):
+            best = state_dist
+            paths.goals.append(state)
+            if not all_paths:
+                break
+            continue
+        for next_state in neighbours(state):
+            if _relax(paths, state, next_state, state_dist + 1):
+                queue.append(next_state)
+    return paths
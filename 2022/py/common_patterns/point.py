@@ -1,52 +1,238 @@
+"""
+Points as immutable tuples, and PointArray for doing the same sums on many
+points at once with NumPy.
+
+Point2D and Point3D are tuple subclasses, so they hash and compare like
+plain tuples (a Point2D can go straight into a set or be looked up with a
+tuple key) and indexing, unpacking and equality run at C speed. Arithmetic
+returns new points; `p += q` rebinds `p`. NumPy is only imported once a
+PointArray is made.
+"""
 from __future__ import annotations
 
-from collections.abc import Iterable, Sequence
+from collections.abc import Iterable
 from numbers import Number
+from operator import itemgetter
 
+np = None  # NumPy, once the first PointArray is made
 
-class Point2D(Sequence):
-    __slots__ = ('x', 'y')
 
-    def __init__(self, xy: Iterable[Number]=(0, 0)):
-        self.x: Number
-        self.y: Number
-        self.x, self.y = xy
+class Point2D(tuple):
+    __slots__ = ()
+
+    def __new__(cls, xy: Iterable[Number]=(0, 0)):
+        return tuple.__new__(cls, xy)
+
+    x = property(itemgetter(0))
+    y = property(itemgetter(1))
 
     def __str__(self):
-        return f"({self.x}, {self.y})"
+        return f"({self[0]}, {self[1]})"
 
     def __repr__(self):
-        return (self.x, self.y)
+        return f"Point2D({self[0]}, {self[1]})"
+
+    def __add__(self, other) -> Point2D:
+        return tuple.__new__(Point2D, (self[0] + other[0], self[1] + other[1]))
+
+    __radd__ = __add__
+
+    def __sub__(self, other) -> Point2D:
+        return tuple.__new__(Point2D, (self[0] - other[0], self[1] - other[1]))
+
+    def __rsub__(self, other) -> Point2D:
+        return tuple.__new__(Point2D, (other[0] - self[0], other[1] - self[1]))
+
+    def __neg__(self) -> Point2D:
+        return tuple.__new__(Point2D, (-self[0], -self[1]))
+
+    def __mul__(self, factor: Number) -> Point2D:
+        return tuple.__new__(Point2D, (self[0] * factor, self[1] * factor))
+
+    __rmul__ = __mul__
+
+    def manhattan(self, other=(0, 0)) -> Number:
+        return abs(self[0] - other[0]) + abs(self[1] - other[1])
+
+    def chebyshev(self, other=(0, 0)) -> Number:
+        return max(abs(self[0] - other[0]), abs(self[1] - other[1]))
+
+    def sign(self) -> Point2D:
+        """Each coordinate as -1, 0 or 1."""
+        x, y = self
+        return tuple.__new__(Point2D, ((x > 0) - (x < 0), (y > 0) - (y < 0)))
+
+
+class Point3D(tuple):
+    __slots__ = ()
+
+    def __new__(cls, xyz: Iterable[Number]=(0, 0, 0)):
+        return tuple.__new__(cls, xyz)
+
+    x = property(itemgetter(0))
+    y = property(itemgetter(1))
+    z = property(itemgetter(2))
+
+    def __str__(self):
+        return f"({self[0]}, {self[1]}, {self[2]})"
+
+    def __repr__(self):
+        return f"Point3D({self[0]}, {self[1]}, {self[2]})"
+
+    def __add__(self, other) -> Point3D:
+        return tuple.__new__(Point3D, (self[0] + other[0], self[1] + other[1], self[2] + other[2]))
+
+    __radd__ = __add__
+
+    def __sub__(self, other) -> Point3D:
+        return tuple.__new__(Point3D, (self[0] - other[0], self[1] - other[1], self[2] - other[2]))
+
+    def __rsub__(self, other) -> Point3D:
+        return tuple.__new__(Point3D, (other[0] - self[0], other[1] - self[1], other[2] - self[2]))
+
+    def __neg__(self) -> Point3D:
+        return tuple.__new__(Point3D, (-self[0], -self[1], -self[2]))
+
+    def __mul__(self, factor: Number) -> Point3D:
+        return tuple.__new__(Point3D, (self[0] * factor, self[1] * factor, self[2] * factor))
+
+    __rmul__ = __mul__
+
+    def manhattan(self, other=(0, 0, 0)) -> Number:
+        return abs(self[0] - other[0]) + abs(self[1] - other[1]) + abs(self[2] - other[2])
+
+    def chebyshev(self, other=(0, 0, 0)) -> Number:
+        return max(abs(self[0] - other[0]), abs(self[1] - other[1]), abs(self[2] - other[2]))
+
+    def sign(self) -> Point3D:
+        """Each coordinate as -1, 0 or 1."""
+        return tuple.__new__(Point3D, ((c > 0) - (c < 0) for c in self))
+
+
+POINT_TYPES = {2: Point2D, 3: Point3D}
+
+def _load_numpy():
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+
+
+class PointArray:
+    """
+    Many points as a struct of arrays: `coords[axis]` holds every point's
+    coordinate on that axis, so `xs`, `ys` (and `zs`) are contiguous. Whole-set
+    operations are single NumPy expressions; indexing gives back Point2D/3D.
+    """
+    __slots__ = ('coords',)
+
+    def __init__(self, points: Iterable[Iterable[Number]], dims: int|None=None,
+                 dtype='int64'):
+        _load_numpy()
+        if isinstance(points, PointArray):
+            points = points.coords.T
+        array = np.array(points if isinstance(points, np.ndarray) else list(points), dtype=dtype)
+        if array.size == 0:
+            array = array.reshape(0, dims or 2)
+        self.coords = np.ascontiguousarray(array.T)  # shape (dims, n)
+
+    @classmethod
+    def from_coords(cls, coords: np.ndarray) -> PointArray:
+        """Wrap a (dims, n) array of coordinates without copying it."""
+        _load_numpy()
+        points = cls.__new__(cls)
+        points.coords = coords
+        return points
+
+    @property
+    def dims(self) -> int:
+        return self.coords.shape[0]
+
+    @property
+    def xs(self) -> np.ndarray:
+        return self.coords[0]
+
+    @property
+    def ys(self) -> np.ndarray:
+        return self.coords[1]
+
+    @property
+    def zs(self) -> np.ndarray:
+        return self.coords[2]
+
+    def __len__(self) -> int:
+        return self.coords.shape[1]
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return POINT_TYPES.get(self.dims, tuple)(self.coords[:, index].tolist())
+        return PointArray.from_coords(self.coords[:, index])
+
+    def __setitem__(self, index, point):
+        self.coords[:, index] = np.asarray(point).T
 
     def __iter__(self):
-        yield self.x
-        yield self.y
+        point_type = POINT_TYPES.get(self.dims, tuple)
+        return map(point_type, self.coords.T.tolist())
 
-    def __len__(self):
-        return 2
+    def __repr__(self) -> str:
+        return f"PointArray({self.coords.T.tolist()})"
 
-    def __getitem__(self, index: int) -> Number:
-        return (self.x, self.y)[index]
+    def _offset(self, other) -> np.ndarray:
+        """`other` as (dims, 1) or (dims, n): one point, or one per point as (n, dims)."""
+        if isinstance(other, PointArray):
+            return other.coords
+        other = np.asarray(other)
+        return other[:, None] if other.ndim == 1 else other.T
 
-    def __eq__(self, other) -> bool:
-        return (self.x, self.y) == tuple(other)
+    def _diff(self, other) -> np.ndarray:
+        return self.coords if other is None else self.coords - self._offset(other)
 
-    def __add__(self, other) -> Point2D:
-        return Point2D((self.x + other[0], self.y + other[1]))
+    def translate(self, offset) -> PointArray:
+        """Every point moved by `offset` (a point, or one offset per point)."""
+        return PointArray.from_coords(self.coords + self._offset(offset))
 
-    def __iadd__(self, other) -> Point2D:
-        self.x += other[0]
-        self.y += other[1]
-        return self
+    __add__ = translate
 
-    def __sub__(self, other) -> Point2D:
-        return Point2D((self.x - other[0], self.y - other[1]))
+    def __sub__(self, other) -> PointArray:
+        return PointArray.from_coords(self.coords - self._offset(other))
+
+    def __iadd__(self, offset) -> PointArray:
+        self.coords += self._offset(offset)
+        return self
 
-    def __isub__(self, other) -> Point2D:
-        self.x -= other.x
-        self.y -= other.y
+    def __isub__(self, offset) -> PointArray:
+        self.coords -= self._offset(offset)
         return self
 
+    def copy(self) -> PointArray:
+        return PointArray.from_coords(self.coords.copy())
+
+    def manhattan(self, other=None) -> np.ndarray:
+        """Each point's Manhattan distance to `other` (the origin, a point, or one per point)."""
+        return np.abs(self._diff(other)).sum(axis=0)
+
+    def chebyshev(self, other=None) -> np.ndarray:
+        return np.abs(self._diff(other)).max(axis=0)
+
+    def euclidean(self, other=None) -> np.ndarray:
+        return np.sqrt((self._diff(other).astype(np.float64) ** 2).sum(axis=0))
+
+    def sign(self) -> PointArray:
+        return PointArray.from_coords(np.sign(self.coords))
+
+    def bbox(self) -> tuple[tuple, tuple]:
+        """(min corner, max corner) of all the points."""
+        point_type = POINT_TYPES.get(self.dims, tuple)
+        return (point_type(self.coords.min(axis=1).tolist()),
+                point_type(self.coords.max(axis=1).tolist()))
+
+    def unique(self) -> PointArray:
+        """The distinct points, in sorted order."""
+        return PointArray.from_coords(np.unique(self.coords, axis=1))
+
+    def count_unique(self) -> int:
+        return self.unique().coords.shape[1]
 
-class Point3D:
-    __slots__ = ('x', 'y', 'z')
+    def to_set(self) -> set[tuple]:
+        return set(self)
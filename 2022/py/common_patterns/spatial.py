@@ -0,0 +1,182 @@
+"""
+Nearest-neighbour queries over a fixed set of points.
+
+SpatialIndex answers k-nearest-neighbour and radius queries with either a
+scipy cKDTree (if scipy is installed) or plain NumPy, which works through
+the distance matrix a block of rows at a time so memory stays bounded.
+Points are rows of an (n, d) array; distances are Euclidean.
+
+`closest_pairs` streams every pair of points nearest first without
+ranking all n^2/2 of them: each point's k nearest neighbours are sorted
+into a list, the lists are merged with a heap, and a point whose list runs
+out gets a longer one. Taking the first few thousand pairs of a thousand
+points costs about as much as the k-NN query.
+
+    index = SpatialIndex(boxes)
+    for dist, a, b in index.closest_pairs(): ...
+    index.within(point, 5.0), index.pairs_within(5.0)
+
+`spread` and `mean_squared_pair_distance` measure how clustered a set of
+points is in O(n), and score a whole batch of point sets in one call.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+import typing
+
+import numpy as np
+
+CHUNK_CELLS = 1 << 21  # distance-matrix entries the NumPy backend works on at once
+
+
+class SpatialIndex:
+    __slots__ = ('points', 'backend', 'tree')
+
+    def __init__(self, points: typing.Iterable[typing.Sequence[float]], backend: str='auto'):
+        self.points = np.asarray(points, dtype=np.float64)
+        if self.points.ndim != 2:
+            raise ValueError("points must be an (n, d) array")
+        if backend not in ('auto', 'numpy', 'scipy'):
+            raise ValueError(f"unknown backend {backend!r}")
+        self.tree = None
+        if backend != 'numpy':
+            try:
+                from scipy.spatial import cKDTree
+            except ImportError:
+                if backend == 'scipy':
+                    raise
+            else:
+                self.tree = cKDTree(self.points)
+        self.backend = 'numpy' if self.tree is None else 'scipy'
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def _blocks(self, queries: np.ndarray) -> typing.Iterator[tuple[int, np.ndarray]]:
+        """(first row, squared distances to every point) for blocks of query rows."""
+        step = max(1, CHUNK_CELLS // max(1, len(self.points)))
+        for start in range(0, len(queries), step):
+            block = queries[start:start+step]
+            yield start, ((block[:, None, :] - self.points[None, :, :]) ** 2).sum(axis=2)
+
+    def knn(self, k: int, rows: typing.Sequence[int]|None=None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (distances, indices), each (len(rows), k): the k nearest other points
+        to each of `rows` (default: every point), nearest first, ties by index.
+        """
+        n = len(self.points)
+        rows = np.arange(n) if rows is None else np.asarray(rows, dtype=np.intp)
+        k = min(k, n - 1)
+        if k < 1:
+            return np.empty((len(rows), 0)), np.empty((len(rows), 0), dtype=np.intp)
+
+        if self.tree is not None:
+            dists, indices = self.tree.query(self.points[rows], k=k+1)
+            # drop each row's own point (usually first, but not if it has duplicates)
+            others = indices != rows[:, None]
+            keep = others & (np.cumsum(others, axis=1) <= k)
+            dists, indices = dists[keep].reshape(-1, k), indices[keep].reshape(-1, k)
+        else:
+            dists = np.empty((len(rows), k))
+            indices = np.empty((len(rows), k), dtype=np.intp)
+            for start, sq_dists in self._blocks(self.points[rows]):
+                block_rows = rows[start:start+len(sq_dists)]
+                sq_dists[np.arange(len(block_rows)), block_rows] = np.inf
+                nearest = np.argpartition(sq_dists, k-1, axis=1)[:, :k]
+                dists[start:start+len(block_rows)] = np.sqrt(
+                    np.take_along_axis(sq_dists, nearest, axis=1))
+                indices[start:start+len(block_rows)] = nearest
+
+        order = np.lexsort((indices, dists), axis=1)
+        return np.take_along_axis(dists, order, axis=1), np.take_along_axis(indices, order, axis=1)
+
+    def nearest(self, point: typing.Sequence[float], k: int=1) -> tuple[np.ndarray, np.ndarray]:
+        """(distances, indices) of the k points nearest to any `point`, nearest first."""
+        k = min(k, len(self.points))
+        if self.tree is not None:
+            dists, indices = self.tree.query(np.asarray(point, dtype=np.float64), k=k)
+            return np.atleast_1d(dists), np.atleast_1d(indices)
+        _, sq_dists = next(self._blocks(np.asarray(point, dtype=np.float64)[None, :]))
+        order = np.lexsort((np.arange(len(self.points)), sq_dists[0]))[:k]
+        return np.sqrt(sq_dists[0][order]), order
+
+    def within(self, point: typing.Sequence[float], radius: float) -> np.ndarray:
+        """Indices of every point no further than `radius` from `point`, in index order."""
+        if self.tree is not None:
+            return np.array(sorted(self.tree.query_ball_point(point, radius)), dtype=np.intp)
+        _, sq_dists = next(self._blocks(np.asarray(point, dtype=np.float64)[None, :]))
+        return np.flatnonzero(sq_dists[0] <= radius * radius)
+
+    def pairs_within(self, radius: float) -> np.ndarray:
+        """(m, 2) array of every index pair i < j no further apart than `radius`."""
+        if self.tree is not None:
+            pairs = self.tree.query_pairs(radius, output_type='ndarray')
+            return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+        found = []
+        for start, sq_dists in self._blocks(self.points):
+            first, second = np.nonzero(sq_dists <= radius * radius)
+            first += start
+            found.append(np.stack((first, second), axis=1)[first < second])
+        return np.concatenate(found) if found else np.empty((0, 2), dtype=np.intp)
+
+    def closest_pairs(self, k: int=8) -> typing.Iterator[tuple[float, int, int]]:
+        """
+        Every pair (distance, i, j) with i < j, nearest first and equal
+        distances in (i, j) order, starting from each point's k nearest.
+        """
+        n = len(self.points)
+        if n < 2:
+            return
+        dists, indices = self.knn(k)
+        neighbours = [list(zip(row_dists, row_indices))
+                      for row_dists, row_indices in zip(dists.tolist(), indices.tolist())]
+
+        # one entry per point for its next neighbour: (distance, point, neighbour, rank)
+        heap = [(near[0][0], i, near[0][1], 0) for i, near in enumerate(neighbours)]
+        heapq.heapify(heap)
+        while heap:
+            dist, i, j, rank = heap[0]
+            near = neighbours[i]
+            if dist >= near[-1][0] and len(near) < n - 1:
+                # the last distance in a partial list may have more points at
+                # it that didn't make the cut, so get a longer list first; the
+                # entries before `rank` are the same in both
+                near = neighbours[i] = self._longer(i, len(near), dist)
+                heapq.heapreplace(heap, (near[rank][0], i, near[rank][1], rank))
+                continue
+            if rank + 1 < len(near):
+                heapq.heapreplace(heap, (near[rank+1][0], i, near[rank+1][1], rank+1))
+            else:
+                heapq.heappop(heap)
+            if i < j:
+                yield dist, i, j
+
+    def _longer(self, row: int, k: int, beyond: float) -> list[tuple[float, int]]:
+        """Row's nearest neighbours, reaching past distance `beyond` (or everything)."""
+        n = len(self.points)
+        while True:
+            k = min(2 * k, n - 1)
+            dists, indices = self.knn(k, [row])
+            if k == n - 1 or dists[0, -1] > beyond:
+                return list(zip(dists[0].tolist(), indices[0].tolist()))
+
+
+def spread(points: np.ndarray) -> np.ndarray|float:
+    """
+    Mean squared distance of points from their centroid. Works over the last
+    two axes of (..., n, d), so a stack of point sets is scored in one call.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    centred = points - points.mean(axis=-2, keepdims=True)
+    return (centred ** 2).sum(axis=-1).mean(axis=-1)
+
+def mean_squared_pair_distance(points: np.ndarray) -> np.ndarray|float:
+    """Mean squared distance over all pairs of points, without forming the pairs."""
+    n = np.shape(points)[-2]
+    return spread(points) * 2 * n / (n - 1)
+
+def mean_nearest_distance(index: SpatialIndex) -> float:
+    """Average distance from each point to its nearest neighbour."""
+    dists, _ = index.knn(1)
+    return float(dists.mean()) if dists.size else math.nan
@@ -0,0 +1,158 @@
+"""
+Disjoint sets (union-find) over the integers range(n).
+
+Parents and sizes live in flat integer arrays, as in pathfinding, so items
+are ints: list indices, flat grid indices or any other dense numbering.
+`find` halves paths as it goes and `union` hangs the smaller tree under the
+larger, so both are effectively O(1).
+
+    circuits = UnionFind(len(boxes))
+    for a, b in closest_pairs:
+        if circuits.union(a, b) and circuits.components == 1: ...
+    circuits.sizes()
+
+RollbackUnionFind can undo unions back to a snapshot, for trying a merge and
+backing out. `first_disconnecting` answers "when does removing these nodes,
+in order, cut a off from b?" offline: it puts the nodes back in reverse,
+which is unions only, instead of searching the graph after every removal.
+"""
+from __future__ import annotations
+
+import typing
+from array import array
+
+
+class UnionFind:
+    __slots__ = ('parent', 'size', 'components')
+
+    def __init__(self, n: int):
+        self.parent = array('q', range(n))
+        self.size = array('q', [1]) * n
+        self.components = n
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def find(self, item: int) -> int:
+        """The root of `item`'s set."""
+        parent = self.parent
+        while (up := parent[item]) != item:
+            parent[item] = item = parent[up]
+        return item
+
+    def union(self, a: int, b: int) -> bool:
+        """Merge the sets holding `a` and `b`; False if they were already one."""
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        self.components -= 1
+        return True
+
+    def connected(self, a: int, b: int) -> bool:
+        return self.find(a) == self.find(b)
+
+    def component_size(self, item: int) -> int:
+        return self.size[self.find(item)]
+
+    def roots(self) -> list[int]:
+        return [item for item, up in enumerate(self.parent) if item == up]
+
+    def sizes(self) -> list[int]:
+        """The size of every set, largest first."""
+        return sorted((self.size[root] for root in self.roots()), reverse=True)
+
+    def groups(self) -> dict[int, list[int]]:
+        """Every set's members, keyed by root."""
+        groups = {}
+        for item in range(len(self.parent)):
+            groups.setdefault(self.find(item), []).append(item)
+        return groups
+
+
+class RollbackUnionFind(UnionFind):
+    """
+    Union-find whose unions can be undone, newest first. Paths aren't
+    compressed (that would rewrite links that undo doesn't know about), so
+    `find` is O(log n) from union by size alone.
+    """
+    __slots__ = ('history',)
+
+    def __init__(self, n: int):
+        super().__init__(n)
+        self.history: list[int] = []  # the root each union hung under another
+
+    def find(self, item: int) -> int:
+        parent = self.parent
+        while (up := parent[item]) != item:
+            item = up
+        return item
+
+    def union(self, a: int, b: int) -> bool:
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        self.components -= 1
+        self.history.append(b)
+        return True
+
+    def snapshot(self) -> int:
+        return len(self.history)
+
+    def rollback(self, snapshot: int=0):
+        """Undo every union made since `snapshot`."""
+        while len(self.history) > snapshot:
+            child = self.history.pop()
+            root = self.parent[child]
+            self.size[root] -= self.size[child]
+            self.parent[child] = child
+            self.components += 1
+
+
+def first_disconnecting(n: int, removals: typing.Sequence[int],
+                        neighbours: typing.Callable[[int], typing.Iterable[int]],
+                        a: int, b: int) -> int|None:
+    """
+    Index into `removals` of the node whose removal first separates `a` from
+    `b`, when nodes of the graph on range(n) are removed in that order. None
+    if they're still connected once everything is removed, or never were.
+
+    Works backwards from the graph with every removal made: nodes go back in
+    reverse order, each joined to whichever neighbours are present, until
+    `a` and `b` meet.
+    """
+    first_removed = {}
+    for index, node in enumerate(removals):
+        first_removed.setdefault(node, index)
+    present = bytearray([1]) * n
+    for node in first_removed:
+        present[node] = 0
+
+    sets = UnionFind(n)
+
+    def restore(node):
+        present[node] = 1
+        for neighbour in neighbours(node):
+            if present[neighbour]:
+                sets.union(node, neighbour)
+
+    for node in range(n):
+        if present[node]:
+            restore(node)
+    if present[a] and present[b] and sets.connected(a, b):
+        return None
+    for index in range(len(removals) - 1, -1, -1):
+        node = removals[index]
+        if first_removed[node] != index:
+            continue  # removed earlier already
+        restore(node)
+        if present[a] and present[b] and sets.connected(a, b):
+            return index
+    return None
@@ -5,51 +5,45 @@ import time
 from io import StringIO
 
 sys.path.append(os.path.dirname(__file__))
-from common_patterns import Point2D, pairwise
+from common_patterns.point import Point2D
 
+ORIGIN = Point2D()
 HEAD_OFFSET = { 'R': Point2D((1, 0)),
                 'L': Point2D((-1, 0)),
                 'U': Point2D((0, 1)),
                 'D': Point2D((0, -1)) }
 
-def tail_offset(head, tail):
-    def sign(x):
-        if x > 0: return 1
-        if x < 0: return -1
-        return 0
+def follow(head, tail):
+    dx, dy = head.x - tail.x, head.y - tail.y
+    if -1 <= dx <= 1 and -1 <= dy <= 1:
+        return tail
+    return tail + ((dx > 0) - (dx < 0), (dy > 0) - (dy < 0))
 
-    if abs(head.x-tail.x) > 1 or abs(head.y-tail.y) > 1:
-        return Point2D((sign(head.x-tail.x), sign(head.y-tail.y)))
-    return Point2D()
-
-def part1(instr):
-    head = Point2D()
-    tail = Point2D()
-    visited = {tuple(tail)}
+def tail_visits(instr, length):
+    knots = [ORIGIN] * length
+    visited = {ORIGIN}
 
     for direction, count in instr:
         for _ in range(count):
-            head += HEAD_OFFSET[direction]
-            tail += tail_offset(head, tail)
-            visited.add(tuple(tail))
+            knots[0] += HEAD_OFFSET[direction]
+            for i in range(1, length):
+                moved = follow(knots[i-1], knots[i])
+                if moved is knots[i]:
+                    break  # the rest of the rope stays put
+                knots[i] = moved
+            visited.add(knots[-1])
     return len(visited)
 
-def part2(instr):
-    knots = [Point2D() for _ in range(10)]
-    visited = {tuple(knots[-1])}
+def part1(instr):
+    return tail_visits(instr, 2)
 
-    for direction, count in instr:
-        for _ in range(count):
-            knots[0] += HEAD_OFFSET[direction]
-            for head, tail in pairwise(knots):
-                tail += tail_offset(head, tail)
-            visited.add(tuple(knots[-1]))
-    return len(visited)
+def part2(instr):
+    return tail_visits(instr, 10)
 
 def parse_input(data_src):
     data_src.seek(0)
-    return map(lambda x: (x[0], int(x[1])),
-               (line.split() for line in data_src.read().splitlines()))
+    return [(direction, int(count))
+            for direction, count in (line.split() for line in data_src.read().splitlines())]
 
 def main():
     test_data, test_answers = get_test_data()
@@ -1,86 +1,54 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-import heapq
+import os
 import string
+import sys
 import time
-from collections import defaultdict
 from io import StringIO
 
 import numpy as np
 
-
-def grid_to_graph(grid):
-    def valid_move(start, pt):
-        if (pt[0] < 0 or pt[0] >= grid.shape[0] or pt[1] < 0 or pt[1] >= grid.shape[1]):
-            return False
-        if grid[pt[0], pt[1]] == -1:
-            return grid[start[0], start[1]] == string.ascii_lowercase.index('z')
-        return grid[pt[0], pt[1]] - grid[start[0], start[1]] <= 1
-
-    graph = defaultdict(set)
-    for c in np.ndindex(grid.shape):
-        n = (c[0]-1, c[1])
-        if valid_move(c, n):
-            graph[c].add((n, 1))
-        n = (c[0]+1, c[1])
-        if valid_move(c, n):
-            graph[c].add((n, 1))
-        n = (c[0], c[1]-1)
-        if valid_move(c, n):
-            graph[c].add((n, 1))
-        n = (c[0], c[1]+1)
-        if valid_move(c, n):
-            graph[c].add((n, 1))
-    return graph  # {coord: {(neighbor_coord, distance)}
-
-def dijkstra(grid, graph, start):
-    class Node:
-        __slots__ = 'coord', 'dist', 'removed'
-        def __init__(self, coord, dist):
-            self.coord = coord
-            self.dist = dist
-            self.removed = False
-        def __lt__(self, other):
-            return self.dist < other.dist
-
-    heap = []
-    coord_map = {}
-
-    def add_node(coord, dist):
-        node = Node(coord, dist)
-        coord_map[coord] = node
-        heapq.heappush(heap, node)
-
-    add_node((start[0], start[1]), 0)
-    while heap:
-        current = heapq.heappop(heap)
-        if current.removed:
-            continue
-        if grid[current.coord] == -1:
-            break
-        for neighbor, dist in graph[current.coord]:
-            if neighbor in coord_map:
-                if current.dist+dist < coord_map[neighbor].dist:
-                    coord_map[neighbor].removed = True
-                    add_node(neighbor, current.dist+dist)
-            else:
-                add_node(neighbor, current.dist+dist)
-
-    if grid[current.coord] != -1:
+sys.path.append(os.path.dirname(__file__))
+from common_patterns.pathfinding import bfs
+
+TOP = string.ascii_lowercase.index('z')
+
+def climbs(grid):
+    # states are flat indices, x * height + y; E (-1) can only be reached from z
+    width, height = grid.shape
+    elevations = grid.ravel().tolist()
+
+    def moves(state):
+        x, y = divmod(state, height)
+        elevation = elevations[state]
+        for next_x, next_y in ((x-1, y), (x+1, y), (x, y-1), (x, y+1)):
+            if 0 <= next_x < width and 0 <= next_y < height:
+                next_state = next_x * height + next_y
+                next_elevation = elevations[next_state]
+                if next_elevation == -1:
+                    if elevation == TOP:
+                        yield next_state
+                elif next_elevation - elevation <= 1:
+                    yield next_state
+
+    return moves
+
+def shortest_climb(grid, starts):
+    height = grid.shape[1]
+    end = int(np.flatnonzero(grid.ravel() == -1)[0])
+    paths = bfs(grid.size, [x * height + y for x, y in starts], climbs(grid), goal=end)
+    if paths.distance is None:
         return grid.shape[0] * grid.shape[1]  # not found, use max value
-    return coord_map[current.coord].dist
+    return paths.distance
 
 def part1(grid, start):
-    graph = grid_to_graph(grid)
-    return dijkstra(grid, graph, start)
+    return shortest_climb(grid, [start])
 
 def part2(grid, start):
+    # one search from every lowest point at once
     xs, ys = np.where(grid == string.ascii_lowercase.index('a'))
-    starts = [pt for pt in zip(xs, ys)] + [start]
-
-    graph = grid_to_graph(grid)
-    return min(dijkstra(grid, graph, s) for s in starts)
+    return shortest_climb(grid, [*zip(xs.tolist(), ys.tolist()), start])
 
 def parse_input(data_src):
     data_src.seek(0)
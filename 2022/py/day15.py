@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
+import os
 import re
+import sys
 import time
 from io import StringIO
 
+sys.path.append(os.path.dirname(__file__))
+from common_patterns.intervals import IntervalSet
+
 try:
     from tqdm import tqdm
 except ImportError:
@@ -12,63 +17,61 @@ except ImportError:
 def manhattan(p1, p2):
     return abs(p1[0]-p2[0]) + abs(p1[1]-p2[1])
 
+def row_ranges(coords, y, tips=False):
+    """
+    (sensor, beacon, start, end) for each sensor reaching past its tip on
+    row y, or with `tips` also each sensor whose range just touches the row
+    """
+    min_half_width = 0 if tips else 1
+    for sensor, beacon in coords:
+        half_width = manhattan(sensor, beacon) - abs(y-sensor[1])
+        if half_width >= min_half_width:
+            yield sensor, beacon, sensor[0] - half_width, sensor[0] + half_width
+
 def part1(coords, y=2000000):
     nulls = []
+    for _, beacon, start, end in row_ranges(coords, y):
+        if beacon == (start, y):
+            start += 1
+        if beacon == (end, y):
+            end -= 1
+        nulls.append((start, end+1))
+    return IntervalSet(nulls).size
+
+def is_covered(coords, point):
+    return any(manhattan(sensor, point) <= manhattan(sensor, beacon) for sensor, beacon in coords)
+
+def candidates(coords, max_coord):
+    """
+    Points just outside the sensors' ranges where the diagonal edges of two
+    ranges cross, or where an edge meets the side of the search area
+    """
+    rising, falling = set(), set()  # y - x and y + x along each range's edges
     for sensor, beacon in coords:
-        dist = manhattan(sensor, beacon)
-        row_offset = abs(y-sensor[1])
-        if row_offset < dist:
-            half_width = dist - row_offset
-            start = sensor[0] - half_width
-            end = sensor[0] + half_width
-            if beacon == (start, y):
-                start += 1
-            if beacon == (end, y):
-                end -= 1
-            nulls.append((start, end))
-
-    # merge any overlapping ranges together
-    nulls.sort(key=lambda pt: pt[0])
-    combined = [nulls[0]]
-    for null in nulls[1:]:
-        if null[0] > combined[-1][1]+1:
-            combined.append(null)
-        else:
-            combined[-1] = (combined[-1][0], max(combined[-1][1], null[1]))
-
-    return sum(end-start+1 for start, end in combined)
+        reach = manhattan(sensor, beacon) + 1
+        rising.update((sensor[1] - sensor[0] - reach, sensor[1] - sensor[0] + reach))
+        falling.update((sensor[1] + sensor[0] - reach, sensor[1] + sensor[0] + reach))
+    for a in rising:
+        for b in falling:
+            if (b - a) % 2 == 0:
+                yield (b - a) // 2, (a + b) // 2
+    for a in rising:
+        yield from ((0, a), (max_coord, max_coord + a), (-a, 0), (max_coord - a, max_coord))
+    for b in falling:
+        yield from ((0, b), (max_coord, b - max_coord), (b, 0), (b - max_coord, max_coord))
+    yield from ((0, 0), (0, max_coord), (max_coord, 0), (max_coord, max_coord))
 
 def part2(coords, max_coord=4000000):
-    for y in tqdm(range(max_coord+1)):
-        nulls = []
-        for sensor, beacon in coords:
-            dist = manhattan(sensor, beacon)
-            row_offset = abs(y-sensor[1])
-            if row_offset < dist:
-                half_width = dist - row_offset
-                start = max(0, sensor[0] - half_width)
-                end = min(max_coord, sensor[0] + half_width)
-                nulls.append((start, end))
-
-        nulls.sort(key=lambda pt: pt[0])
-
-        # super unlikely edge case
-        if nulls[0][0] == 1:
-            return y
-        if nulls[0][1] == max_coord-1:
-            return (max_coord-1) * 4000000 + y
+    for x, y in candidates(coords, max_coord):
+        if 0 <= x <= max_coord and 0 <= y <= max_coord and not is_covered(coords, (x, y)):
+            return x * 4000000 + y
 
-        # merge any overlapping ranges together
-        combined = [nulls[0]]
-        for null in nulls[1:]:
-            if null[0] > combined[-1][1]+1:
-                combined.append(null)
-            else:
-                combined[-1] = (combined[-1][0], max(combined[-1][1], null[1]))
-
-        if len(combined) > 1:
-            assert len(combined) == 2
-            return (combined[0][1]+1) * 4000000 + y
+    # not where any edges cross, so fall back to looking along every row
+    for y in tqdm(range(max_coord+1)):
+        row = IntervalSet((start, end+1) for _, _, start, end in row_ranges(coords, y, tips=True))
+        gaps = row.gaps(0, max_coord+1)
+        if gaps:
+            return gaps.starts[0] * 4000000 + y
 
 def parse_input(data_src):
     data_src.seek(0)
@@ -19,9 +19,8 @@ except ImportError:
     def tqdm(iterable=None, **kwargs):
         return iterable
 
-# sys.path.append(os.path.dirname(__file__))
-# from common_patterns.point import Point2D
-# from common_patterns.itertools import pairwise
+sys.path.append(os.path.dirname(__file__))
+from common_patterns.cycles import simulate_until_cycle
 
 BLOCKS = [
     [list('..@@@@.')],
@@ -165,61 +164,33 @@ def encode_rocks(cave_rows):
         encoded.append(int(bits, 2))
     return encoded
 
-def find_period(cave, max_period):
-    # linear search for a repeating pattern of length max_period
-    encoded = encode_rocks(cave)
-
-    # need to back up from end to find the last stable point as a reference
-    # TODO
-    substr = encoded[-max_period:]
-    idx = len(encoded)
-    while idx > max_period:
-        idx -= 1
-        if encoded[idx-max_period:idx] == substr:
-            period = len(encoded) - idx  # actual period
-            print('!!! found !!!')
-            break
-    assert idx > max_period
-    assert encoded[-period:] == encoded[-period*2:-period]
-    assert cave[-period:] == cave[-period*2:-period]
-    return period
-
-def part2(directions):
-    direction_iter = iter(itertools.cycle(directions))
-    block_iter = iter(itertools.cycle(BLOCKS))
+class Cycler:
+    """itertools.cycle that knows where it's up to"""
+    def __init__(self, items):
+        self.items = items
+        self.index = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        item = self.items[self.index]
+        self.index = (self.index + 1) % len(self.items)
+        return item
+
+def part2(directions, num_blocks=1000000000000, surface_rows=32):
+    # the pile repeats once the same rock and jet come round over the same
+    # surface; the cave is updated in place, and its height is the running total
+    direction_iter = Cycler(directions)
+    block_iter = Cycler(BLOCKS)
+
+    def drop(cave):
+        return drop_blocks(cave, 1, direction_iter, block_iter)
+
+    def state_key(cave):
+        return (direction_iter.index, block_iter.index, tuple(encode_rocks(cave[-surface_rows:])))
 
-    # run for 3x the max possible period length to generate at least 2 cycles
-    max_period = len(BLOCKS) * len(directions)
-    print('initial drop...', end='', flush=True)
-    cave = drop_blocks([], max_period*4, direction_iter, block_iter)
-    print('done')
-
-    # find the period of the repeating pattern of the rocks
-    print('calculating period...', end='', flush=True)
-    period = find_period(cave, max_period)
-    print(period)
-
-    # determine how many blocks and how much height in a repeating cycle
-    print('calculating blocks per cycle...', end='', flush=True)
-    pattern = encode_rocks(cave[-period:])
-    height_before = len(cave)
-    for blocks_per_cycle in itertools.count(1):
-        cave = drop_blocks(cave, 1, direction_iter, block_iter)
-        if pattern == encode_rocks(cave[-period:]):
-            break
-    height_per_cycle = len(cave) - height_before
-    print(blocks_per_cycle)
-
-    blocks_to_drop = 1000000000000 - max_period*4 - blocks_per_cycle
-    cycles_skipped = blocks_to_drop // blocks_per_cycle
-    blocks_to_drop -= cycles_skipped * blocks_per_cycle
-
-    # drop the remaining modulus blocks
-    print('dropping remaining ', blocks_to_drop, 'rocks...', end='', flush=True)
-    cave = drop_blocks(cave, blocks_to_drop, direction_iter, block_iter)
-    print('done')
-
-    return len(cave) + cycles_skipped * height_per_cycle
+    return simulate_until_cycle(drop, state_key, num_blocks, [], value_fn=len).value
 
 def parse_input(data_src):
     data_src.seek(0)
@@ -232,7 +203,6 @@ def main():
         print_result('1', part1, *parse_input(infile))  # 3159
 
         assert part2(*parse_input(test_data)) == test_answers[1]
-        print('!!! TEST PASSED !!!')
         print_result('2', part2, *parse_input(infile))  # -
 
 def print_result(part_label, part_fn, *args):
@@ -1,70 +1,64 @@
 #!/usr/bin/env python3
 import itertools
+import os
+import sys
 import time
-from collections import defaultdict
 from io import StringIO
 
+sys.path.append(os.path.dirname(__file__))
+from common_patterns.bitboard import BitBoard
+
+STEPS = {'N': (-1, 0), 'S': (1, 0), 'W': (0, -1), 'E': (0, 1)}
+
 
 def bounding_box(elves):
-    elf_iter = iter(elves)
-    x, y = next(elf_iter)
-    min_x, min_y = x, y
-    max_x, max_y = x, y
-    for x, y in elf_iter:
-        min_x, min_y = min(min_x, x), min(min_y, y)
-        max_x, max_y = max(max_x, x), max(max_y, y)
-    width = max_x - min_x + 1
-    height = max_y - min_y + 1
-
-    return width, height, min_x, min_y
+    top, left, bottom, right = elves.bounds()
+    return right - left, bottom - top, left, top
 
 def dump(elves):
     width, height, x_offset, y_offset = bounding_box(elves)
-    grid = [list('.'*width) for _ in range(height)]
-    for x, y in elves:
-        grid[y-y_offset][x-x_offset] = '#'
-    for row in reversed(grid):
-        print(''.join(row))
+    for line in str(elves).splitlines()[y_offset:y_offset+height]:
+        print(line[x_offset:x_offset+width])
 
 def move_elves(elves, directions):
-    proposed = defaultdict(list)  # { dest_coord: [source_coords] }
-    for x, y in elves:
-        NE = (x+1, y+1) in elves
-        N  = (x  , y+1) in elves
-        NW = (x-1, y+1) in elves
-        E  = (x+1, y  ) in elves
-        W  = (x-1, y  ) in elves
-        SE = (x+1, y-1) in elves
-        S  = (x  , y-1) in elves
-        SW = (x-1, y-1) in elves
-        if not (NE or N or NW or W or E or SE or S or SW):
-            continue
-
-        for direction in directions:
-            if direction == 'N' and not (NE or N or NW):
-                proposed[(x, y+1)].append((x, y))
-                break
-            elif direction == 'S' and not (SE or S or SW):
-                proposed[(x, y-1)].append((x, y))
-                break
-            elif direction == 'W' and not (NW or W or SW):
-                proposed[(x-1, y)].append((x, y))
-                break
-            elif direction == 'E' and not (NE or E or SE):
-                proposed[(x+1, y)].append((x, y))
-                break
-
-    for dest, src in proposed.items():
-        if len(src) == 1:
-            elves.remove(src[0])
-            elves.add(dest)
-
-    return len(proposed) > 0
+    """One round on a board of elves; returns the new board and whether any elf proposed."""
+    width, height, left, top = bounding_box(elves)
+    if not (left and top and left + width < elves.width and top + height < elves.height):
+        elves = elves.pad(16)  # keep empty cells round the elves for them to move into
+
+    # for each direction, the cells with an elf on that side of them
+    above, below = elves.shift(1, 0), elves.shift(-1, 0)
+    column = above | elves | below
+    crowded = {
+        'N': above | above.shift(0, 1) | above.shift(0, -1),
+        'S': below | below.shift(0, 1) | below.shift(0, -1),
+        'W': column.shift(0, 1),
+        'E': column.shift(0, -1),
+    }
+
+    undecided = elves & elves.neighbours()
+    targets = {}
+    for direction in directions:
+        proposing = undecided - crowded[direction]
+        undecided -= proposing
+        targets[direction] = proposing.shift(*STEPS[direction])
+
+    # only elves either side of a cell can propose the same one
+    clashes = {'N': targets['N'] & targets['S'], 'W': targets['W'] & targets['E']}
+    clashes['S'], clashes['E'] = clashes['N'], clashes['W']
+    proposed = False
+    for direction, target in targets.items():
+        proposed = proposed or bool(target)
+        moving = target - clashes[direction]
+        drow, dcol = STEPS[direction]
+        elves = (elves - moving.shift(-drow, -dcol)) | moving
+
+    return elves, proposed
 
 def part1(elves):
     dir_prio = itertools.cycle('NSWE')
     for _ in range(10):
-        move_elves(elves, list(itertools.islice(dir_prio, 4)))
+        elves, _ = move_elves(elves, list(itertools.islice(dir_prio, 4)))
         next(dir_prio)
 
     width, height, *_ = bounding_box(elves)
@@ -73,17 +67,14 @@ def part1(elves):
 def part2(elves):
     dir_prio = itertools.cycle('NSWE')
     for rnd in itertools.count(1):
-        if not move_elves(elves, list(itertools.islice(dir_prio, 4))):
+        elves, proposed = move_elves(elves, list(itertools.islice(dir_prio, 4)))
+        if not proposed:
             return rnd
         next(dir_prio)
 
 def parse_input(data_src):
     data_src.seek(0)
-    elves = set()
-    for y, line in enumerate(reversed(data_src.read().splitlines())):
-        for x, ch in enumerate(line):
-            if ch == '#':
-                elves.add((x, y))
+    elves = BitBoard.from_lines(data_src.read().splitlines())
     return [elves]  # note: return single item as [item] for *parse_input
 
 def main():
@@ -5,114 +5,78 @@ import time
 from io import StringIO
 
 sys.path.append(os.path.dirname(__file__))
-from common_patterns.math import popcount
-
-DIR_MAP = {
-    '.': 0,
-    '<': 1,
-    '>': 2,
-    '^': 4,
-    'v': 8
+from common_patterns.bitboard import BitBoard
+
+# how each kind of blizzard moves across the valley each minute
+BLIZZARDS = {
+    '<': (0, -1),
+    '>': (0, 1),
+    '^': (-1, 0),
+    'v': (1, 0)
 }
 
-def dump(valley, locations=set()):
-    for row, line in enumerate(valley):
-        for col, ch in enumerate(line):
-            if isinstance(ch, str):
-                print(ch, end='')
+def dump(blizzards, locations=None):
+    for row in range(blizzards['<'].height):
+        line = ''
+        for col in range(blizzards['<'].width):
+            here = [ch for ch, board in blizzards.items() if (row, col) in board]
+            if locations is not None and (row, col) in locations:
+                line += 'E'
+            elif len(here) == 1:
+                line += here[0]
             else:
-                if ch == 0:
-                    if (row, col) in locations:
-                        print('E', end='')
-                    else:
-                        print('.', end='')
-                elif ch == 1:
-                    print('<', end='')
-                elif ch == 2:
-                    print('>', end='')
-                elif ch == 4:
-                    print('^', end='')
-                elif ch == 8:
-                    print('v', end='')
-                else:
-                    print(popcount(ch), end='')
-        print()
-
-def advance_blizzards(valley):
-    height = len(valley) - 2
-    width = len(valley[0]) - 2
-    new = []
-    new.append(list(valley[0]))
-    for _ in range(height):
-        new.append(['#'] + [0 for _ in range(width)] + ['#'])
-    new.append(list(valley[-1]))
-
-    for row in range(1, height+1):
-        for col in range(1, width+1):
-            if valley[row][col] & 1:
-                new[row][(col-2)%width+1] |= 1
-            if valley[row][col] & 2:
-                new[row][col%width+1] |= 2
-            if valley[row][col] & 4:
-                new[(row-2)%height+1][col] |= 4
-            if valley[row][col] & 8:
-                new[row%height+1][col] |= 8
-    return new
-
-def walk(t, valley, start, goal):
-    locations = set()
-    locations.add(start)
+                line += str(len(here)) if here else '.'
+        print(line)
+
+def advance_blizzards(blizzards):
+    return {ch: board.roll(*BLIZZARDS[ch]) for ch, board in blizzards.items()}
+
+def walk(t, blizzards, start, goal):
+    """
+    Time at which the expedition can reach `goal` from `start`, the openings
+    just outside the valley's top or bottom edge, and the blizzards then.
+    """
+    width, height = blizzards['<'].width, blizzards['<'].height
+    way_in = (0 if start[0] < 0 else height-1, start[1])  # the valley cells next to them
+    way_out = (0 if goal[0] < 0 else height-1, goal[1])
+
+    locations = BitBoard(width, height)  # where the expedition could be in the valley
     while True:
-        if goal in locations:
-            return t, valley
-
         t += 1
-        valley = advance_blizzards(valley)
-        next_loc = set()
-        for row, col in locations:
-            # check up
-            if row-1 >= 0 and valley[row-1][col] == 0:
-                next_loc.add((row-1, col))
-            # check down
-            if row+1 < len(valley) and valley[row+1][col] == 0:
-                next_loc.add((row+1, col))
-            # check left
-            if valley[row][col-1] == 0:
-                next_loc.add((row, col-1))
-            # check right
-            if valley[row][col+1] == 0:
-                next_loc.add((row, col+1))
-            # check wait
-            if valley[row][col] == 0:
-                next_loc.add((row, col))
-        locations = next_loc
-
-def part1(valley):
-    start = (0, 1)
-    goal = (len(valley)-1, len(valley[0])-2)
-
-    t, _ = walk(0, valley, start, goal)
+        blizzards = advance_blizzards(blizzards)
+        if way_out in locations:
+            return t, blizzards
+
+        locations = (locations | locations.shift(-1, 0) | locations.shift(1, 0) |
+                     locations.shift(0, -1) | locations.shift(0, 1))
+        locations.add(*way_in)  # it can always wait at the start and step in later
+        for board in blizzards.values():
+            locations -= board
+
+def part1(blizzards):
+    width, height = blizzards['<'].width, blizzards['<'].height
+    start = (-1, 0)
+    goal = (height, width-1)
+
+    t, _ = walk(0, blizzards, start, goal)
     return t
 
-def part2(valley):
-    start = (0, 1)
-    goal = (len(valley)-1, len(valley[0])-2)
+def part2(blizzards):
+    width, height = blizzards['<'].width, blizzards['<'].height
+    start = (-1, 0)
+    goal = (height, width-1)
 
-    t, valley = walk(0, valley, start, goal)
-    t, valley = walk(t, valley, goal, start)
-    t, valley = walk(t, valley, start, goal)
+    t, blizzards = walk(0, blizzards, start, goal)
+    t, blizzards = walk(t, blizzards, goal, start)
+    t, blizzards = walk(t, blizzards, start, goal)
     return t
 
 def parse_input(data_src):
     data_src.seek(0)
-    valley = []
-    for line in data_src.read().splitlines():
-        line = list(line)
-        for idx, ch in enumerate(line):
-            if ch in DIR_MAP:
-                line[idx] = DIR_MAP[ch]
-        valley.append(line)
-    return [valley]  # note: return single item as [item] for *parse_input
+    # just the valley inside the walls; the openings are in the top left and bottom right
+    valley = [line[1:-1] for line in data_src.read().splitlines()[1:-1]]
+    blizzards = {ch: BitBoard.from_lines(valley, on=ch) for ch in BLIZZARDS}
+    return [blizzards]  # note: return single item as [item] for *parse_input
 
 def main():
     test_data, test_answers = get_test_data()
@@ -8,16 +8,20 @@ import re
 import sys
 import time
 from collections import Counter, defaultdict, namedtuple
-from dataclasses import dataclass
 from io import StringIO
 
-import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from aoctools import harness
+from aoctools.lazy import lazy_callable, lazy_import
 
-try:
-    from tqdm import tqdm
-except ImportError:
-    def tqdm(iterable=None, **kwargs):
-        return iterable
+# heavy modules are only imported on first use, to keep startup fast
+np = lazy_import('numpy')
+dataclass = lazy_callable('dataclasses', 'dataclass')
+
+def _tqdm_fallback(iterable=None, **kwargs):
+    return iterable
+
+tqdm = lazy_callable('tqdm', 'tqdm', fallback=_tqdm_fallback)
 
 # sys.path.append(os.path.dirname(__file__))
 # from common_patterns.point import Point2D
@@ -38,7 +42,7 @@ def parse_input(data_src):
 
 def main():
     test_data, test_answers = get_test_data()
-    with open(__file__[:-3] + '-input.dat') as infile:
+    with harness.open_input(__file__[:-3] + '-input.dat') as infile:
         assert part1(*parse_input(test_data)) == test_answers[0]
         print_result('1', part1, *parse_input(infile))  # -
 
@@ -46,10 +50,7 @@ def main():
         print_result('2', part2, *parse_input(infile))  # -
 
 def print_result(part_label, part_fn, *args):
-    start = time.perf_counter()
-    result = part_fn(*args)
-    end = time.perf_counter()
-    print(f"Part {part_label}: {result}  ({int((end-start)*1000)} ms)")
+    harness.solve_part(__file__, part_label, part_fn, *args, show_regress=False)
 
 def get_test_data():
     """Keep test data out of the way at the bottom of this file."""
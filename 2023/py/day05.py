@@ -1,58 +1,44 @@
 #!/usr/bin/env python3
-import itertools
+import os
+import sys
 import time
 from collections import defaultdict
 from io import StringIO
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.intervals import IntervalSet, RangeMap
 
-def part1(seeds, mapping, mapped_vals, _):
+
+def stages(mapping, mapped_vals):
+    """each stage's RangeMap in order, from seed through to location"""
+    current_src = 'seed'
+    while current_src in mapping:
+        yield RangeMap.from_table(mapped_vals[current_src])
+        current_src = mapping[current_src]
+
+def part1(seeds, mapping, mapped_vals):
+    maps = list(stages(mapping, mapped_vals))
     location = float('inf')
     for seed in seeds:
-        current_src = 'seed'
-        while True:
-            for dest, src, count in mapped_vals[current_src]:
-                if seed >= src and seed < src+count:
-                    seed = dest+(seed-src)
-                    break
-            if current_src == 'location':
-                break
-            current_src = mapping[current_src]
+        for stage in maps:
+            seed = stage(seed)
         location = min(seed, location)
     return location
 
-# this works...but took 3.5 minutes to run. i think an optimal solution might be some
-# kind of tree structure to subdivide the ranges and narrow down the search space
-def part2(seeds, _, mapped_vals, rev_mapping):
-    # start from location zero and work backwards until we find a valid solution
-    seed_starts = seeds[::2]
-    seed_counts = seeds[1::2]
-    seeds = sorted(list(zip(seed_starts, seed_counts)))
-
-    for location in itertools.count():
-        current_dest = 'location'
-        seed = location
-        while True:
-            for dest, src, count in mapped_vals[current_dest]:
-                if seed >= dest and seed < dest+count:
-                    seed = src+(seed-dest)
-                    break
-            if current_dest == 'seed':
-                break
-            current_dest = rev_mapping[current_dest]
-
-        # check if seed value fall within a valid starting range
-        for start, count in seeds:
-            if seed >= start and seed < start+count:
-                return location
+# push whole seed ranges through each map, splitting them where the map's
+# pieces meet, instead of searching location by location (which took 3.5 minutes)
+def part2(seeds, mapping, mapped_vals):
+    ranges = IntervalSet((start, start+count) for start, count in zip(seeds[::2], seeds[1::2]))
+    for stage in stages(mapping, mapped_vals):
+        ranges = stage.map_set(ranges)
+    return ranges.starts[0]
 
 def parse_input(data_src):
     data_src.seek(0)
     seeds = list(map(int, data_src.readline().split(':')[1].split()))
 
     mapping = {}
-    rev_mapping = {}
     mapped_vals = defaultdict(list)
-    current_dest = None
     for line in data_src.read().splitlines():
         if not line:
             continue
@@ -60,12 +46,10 @@ def parse_input(data_src):
         if not line[0].isnumeric():
             src, dest = line.split()[0].split('-to-')
             mapping[src] = dest
-            rev_mapping[dest] = src
-            current_dest = dest
         else:
             mapped_vals[src].append(tuple(map(int, line.split())))
 
-    return [seeds, mapping, mapped_vals, rev_mapping]  # note: return single item as [item] for *parse_input
+    return [seeds, mapping, mapped_vals]  # note: return single item as [item] for *parse_input
 
 def main():
     test_data, test_answers = get_test_data()
@@ -74,7 +58,7 @@ def main():
         print_result('1', part1, *parse_input(infile))  # 157211394
 
         assert part2(*parse_input(test_data)) == test_answers[1]
-        # print_result('2', part2, *parse_input(infile))  # 50855035
+        print_result('2', part2, *parse_input(infile))  # 50855035
 
 def print_result(part_label, part_fn, *args):
     start = time.perf_counter()
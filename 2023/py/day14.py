@@ -1,10 +1,15 @@
 #!/usr/bin/env python3
 import multiprocessing
+import os
+import sys
 import time
 from io import StringIO
 
 import numpy as np
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.cycles import simulate_until_cycle
+
 
 def calc_load(platform):
     return sum(platform.shape[0]-row
@@ -53,25 +58,16 @@ def part1(platform):
     platform = tilt_north(platform)
     return calc_load(platform)
 
+def spin(platform):
+    platform = tilt_north(platform)
+    platform = tilt_west(platform)
+    platform = tilt_south(platform)
+    return tilt_east(platform)
+
 def part2(platform):
-    seen = {}
-    plats = [platform]
-    for cycle in range(1, 1_000_000_000):
-        platform = tilt_north(platform)
-        platform = tilt_west(platform)
-        platform = tilt_south(platform)
-        platform = tilt_east(platform)
-
-        plat_hash = platform.tobytes()
-        if plat_hash in seen:
-            offset = seen[plat_hash] - 1
-            period = cycle - seen[plat_hash]
-            break
-        seen[plat_hash] = cycle
-        plats.append(platform)
-
-    equivalent = plats[(1_000_000_000-offset) % period + offset]
-    return calc_load(equivalent)
+    cycle = simulate_until_cycle(spin, lambda platform: platform.tobytes(), 1_000_000_000,
+                                 platform, value_fn=calc_load)
+    return cycle.value
 
 def parse_input(data_src):
     data_src.seek(0)
@@ -1,45 +1,55 @@
 #!/usr/bin/env python3
-import heapq
+import os
+import sys
 import time
 from io import StringIO
 
 import numpy as np
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.pathfinding import dial
 
-def find_min_dist(grid, max_run, min_run=1):
-    target = (grid.shape[0]-1, grid.shape[1]-1)
-    visited = set()
-    heap = []
-
-    heapq.heappush(heap, (grid[0,1], (0, 1), (0, 1), 1))
-    heapq.heappush(heap, (grid[1,0], (1, 0), (1, 0), 1))
+DIRECTIONS = ((-1, 0), (0, 1), (1, 0), (0, -1))  # clockwise, so +1 turns right
 
-    while heap:
-        dist, pos, direction, run = heapq.heappop(heap)
-        if pos == target and run >= min_run:
-            return dist
-        if (pos, direction, run) in visited:
-            continue
-        visited.add((pos, direction, run))
 
+def find_min_dist(grid, max_run, min_run=1):
+    # states are ((row * cols + col) * 4 + direction) * (max_run+1) + run, plus
+    # one extra state before the first move, which can go either east or south
+    rows, cols = grid.shape
+    runs = max_run + 1
+    losses = grid.ravel().tolist()
+    start = rows * cols * 4 * runs
+    target = rows * cols - 1
+
+    def step(row, col, direction, run):
+        next_row, next_col = row + DIRECTIONS[direction][0], col + DIRECTIONS[direction][1]
+        if 0 <= next_row < rows and 0 <= next_col < cols:
+            index = next_row * cols + next_col
+            return (index * 4 + direction) * runs + run, losses[index]
+        return None
+
+    def moves(state):
+        if state == start:
+            return [move for move in (step(0, 0, 1, 1), step(0, 0, 2, 1)) if move]
+        rest, run = divmod(state, runs)
+        index, direction = divmod(rest, 4)
+        row, col = divmod(index, cols)
+        next_moves = []
         if run < max_run:
             # go straight
-            new_pos = (pos[0]+direction[0], pos[1]+direction[1])
-            if 0 <= new_pos[0] < grid.shape[0] and 0 <= new_pos[1] < grid.shape[1]:
-                heapq.heappush(heap, (dist+grid[new_pos], new_pos, direction, run+1))
-
+            next_moves.append(step(row, col, direction, run+1))
         if run >= min_run:
-            # turn right
-            new_dir = (direction[1], -direction[0])
-            new_pos = (pos[0]+new_dir[0], pos[1]+new_dir[1])
-            if 0 <= new_pos[0] < grid.shape[0] and 0 <= new_pos[1] < grid.shape[1]:
-                heapq.heappush(heap, (dist+grid[new_pos], new_pos, new_dir, 1))
-
-            # turn left
-            new_dir = (-direction[1], direction[0])
-            new_pos = (pos[0]+new_dir[0], pos[1]+new_dir[1])
-            if 0 <= new_pos[0] < grid.shape[0] and 0 <= new_pos[1] < grid.shape[1]:
-                heapq.heappush(heap, (dist+grid[new_pos], new_pos, new_dir, 1))
+            # turn right or left
+            next_moves.append(step(row, col, (direction+1) % 4, 1))
+            next_moves.append(step(row, col, (direction-1) % 4, 1))
+        return [move for move in next_moves if move]
+
+    def is_goal(state):
+        rest, run = divmod(state, runs)
+        return rest >> 2 == target and run >= min_run
+
+    # heat losses are 1-9, so a bucket queue beats a heap
+    return dial(start + 1, start, moves, max_cost=9, goal=is_goal).distance
 
 def part1(grid):
     return find_min_dist(grid, 3)
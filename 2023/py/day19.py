@@ -1,14 +1,18 @@
 #!/usr/bin/env python3
-import math
+import os
 import re
+import sys
 import time
 from collections import namedtuple
 from io import StringIO
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.intervals import Box
+
 Rule = namedtuple('Rule', ['category', 'comparison', 'value', 'workflow'])
 
-EMPTY_RANGE = {ch:(0,-1) for ch in 'xmas'}
-WHOLE_RANGE = {ch:(1,4000) for ch in 'xmas'}
+CATEGORIES = 'xmas'  # axis order of the Box of ratings
+WHOLE_RANGE = Box.from_inclusive([(1, 4000)] * 4)
 
 def part1(workflows, parts):
     total = 0
@@ -27,44 +31,28 @@ def part1(workflows, parts):
             wf = rule.workflow
     return total
 
-def apply_rule(rule, ranges) -> tuple[map, map]:
-    passed = ranges.copy()
-    rejected = ranges.copy()
-
+def apply_rule(rule, ranges) -> tuple[Box|None, Box|None]:
     if not rule.category:
-        if rule.workflow != 'R':
-            rejected = EMPTY_RANGE
-        else:
-            passed = EMPTY_RANGE
-    else:
-        lower, upper = ranges[rule.category]
-        if (rule.comparison == '<' and upper < rule.value or
-            rule.comparison == '>' and lower > rule.value):
-            rejected = EMPTY_RANGE
-        elif (rule.comparison == '<' and lower >= rule.value or
-              rule.comparison == '>' and upper <= rule.value):
-            passed = EMPTY_RANGE
-        else:
-            if rule.comparison == '<':
-                passed[rule.category] = (lower, rule.value-1)
-                rejected[rule.category] = (rule.value, upper)
-            else:
-                passed[rule.category] = (rule.value+1, upper)
-                rejected[rule.category] = (lower, rule.value)
+        return (ranges, None) if rule.workflow != 'R' else (None, ranges)
 
+    axis = CATEGORIES.index(rule.category)
+    if rule.comparison == '<':
+        return ranges.split(axis, rule.value)
+    rejected, passed = ranges.split(axis, rule.value+1)
     return passed, rejected
 
 def count_accepted(workflows, workflow, ranges):
-    if workflow == 'A':
-        return math.prod(upper-lower+1 for lower, upper in ranges.values())
-    elif workflow == 'R':
+    if ranges is None or workflow == 'R':
         return 0
+    elif workflow == 'A':
+        return ranges.volume()
 
     count = 0
     for rule in workflows[workflow]:
-        passed, rejected = apply_rule(rule, ranges)
+        passed, ranges = apply_rule(rule, ranges)
         count += count_accepted(workflows, rule.workflow, passed)
-        ranges = rejected
+        if ranges is None:
+            break
     return count
 
 def part2(workflows, _):
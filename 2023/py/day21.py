@@ -1,76 +1,40 @@
 #!/usr/bin/env python3
-import heapq
+import os
+import sys
 import time
-from collections import defaultdict
 from io import StringIO
 
 import numpy as np
-import tqdm
-
-
-def grid_to_graph(grid):
-    def valid_move(start, pt):
-        if (pt[0] < 0 or pt[0] >= grid.shape[0] or pt[1] < 0 or pt[1] >= grid.shape[1]):
-            return False
-        return grid[pt] == '.'
-
-    graph = defaultdict(set)
-    for c in np.ndindex(grid.shape):
-        n = (c[0]-1, c[1])
-        if valid_move(c, n):
-            graph[c].add((n, 1))
-        n = (c[0]+1, c[1])
-        if valid_move(c, n):
-            graph[c].add((n, 1))
-        n = (c[0], c[1]-1)
-        if valid_move(c, n):
-            graph[c].add((n, 1))
-        n = (c[0], c[1]+1)
-        if valid_move(c, n):
-            graph[c].add((n, 1))
-    return graph  # {coord: {(neighbor_coord, distance)}
-
-class Node:
-    __slots__ = 'coord', 'dist'
-    def __init__(self, coord, dist):
-        self.coord = coord
-        self.dist = dist
-    def __lt__(self, other):
-        return self.dist < other.dist
-    def __repr__(self):
-        return f"{self.coord=} {self.dist=}"
-
-def dijkstra(graph, start, show_progress=False):
-    heap = []
-    coord_map = {}
-
-    s = set(x[0] for m in graph.values() for x in m)
-    with tqdm.tqdm(total=len(s)-1, disable=not show_progress) as pbar:
-        coord_map[start] = Node(start, 0)
-        heapq.heappush(heap, coord_map[start])
-        while heap:
-            current = heapq.heappop(heap)
-            for neighbor, dist in graph[current.coord]:
-                if neighbor in coord_map:
-                    if current.dist+dist < coord_map[neighbor].dist:
-                        coord_map[neighbor] = Node(neighbor, current.dist+dist)
-                else:
-                    coord_map[neighbor] = Node(neighbor, current.dist+dist)
-                    heapq.heappush(heap, coord_map[neighbor])
-                    pbar.update()
-
-    return coord_map
 
-def part1(garden, start, steps=64):
-    graph = grid_to_graph(garden)
-    coord_map = dijkstra(graph, start)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.pathfinding import bfs
+
+
+def step_counts(garden, start) -> np.ndarray:
+    """steps from start to each plot (flat, row * cols + col); huge where unreachable"""
+    rows, cols = garden.shape
+    plots = (garden.ravel() == '.').tolist()
+
+    def moves(state):
+        row, col = divmod(state, cols)
+        if row > 0 and plots[state - cols]:
+            yield state - cols
+        if row < rows-1 and plots[state + cols]:
+            yield state + cols
+        if col > 0 and plots[state - 1]:
+            yield state - 1
+        if col < cols-1 and plots[state + 1]:
+            yield state + 1
 
-    PARITY = steps % 2
-    count = 0
-    for node in coord_map.values():
-        if node.dist <= steps and node.dist%2 == PARITY:
-            count += 1
-    return count
+    paths = bfs(garden.size, start[0] * cols + start[1], moves)
+    return np.frombuffer(paths.dist, dtype=np.int64)
+
+def count_reachable(dists, steps) -> int:
+    # plots reached in exactly `steps` are those no further away with the same parity
+    return int(((dists <= steps) & (dists % 2 == steps % 2)).sum())
+
+def part1(garden, start, steps=64):
+    return count_reachable(step_counts(garden, start), steps)
 
 def part2(garden, start):
     """this only works because there are no rocks through the center of the __real__ data
@@ -99,16 +63,11 @@ def part2(garden, start):
     garden = np.tile(garden, (spread*2+1, spread*2+1))
 
     # part 1 on the tiled garden
-    graph = grid_to_graph(garden)
-    coord_map = dijkstra(graph, start, show_progress=True)
+    dists = step_counts(garden, start)
 
     # find number of plots reachable in step counts that reach the end of a tiling period
     targets = np.array([tile_size//2+tile_size*x for x in range(spread+1)])
-    plots = np.zeros(len(targets))
-    for node in tqdm.tqdm(coord_map.values()):
-        for idx, target in enumerate(targets):
-            if node.dist <= target and node.dist%2 == target%2:
-                plots[idx] += 1
+    plots = np.array([count_reachable(dists, target) for target in targets])
 
     # works but result is too big by 0.6 due to precision
     # coeffs = np.polynomial.polynomial.polyfit(targets, plots, deg=2)
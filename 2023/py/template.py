@@ -8,19 +8,23 @@ import re
 import sys
 import time
 from collections import Counter, defaultdict, namedtuple
-from dataclasses import dataclass
 from enum import Enum, IntEnum
 from functools import lru_cache
 from io import StringIO
-from pprint import pprint
 
-import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from aoctools import harness
+from aoctools.lazy import lazy_callable, lazy_import
 
-try:
-    from tqdm import tqdm
-except ImportError:
-    def tqdm(iterable=None, **kwargs):
-        return iterable
+# heavy modules are only imported on first use, to keep startup fast
+np = lazy_import('numpy')
+dataclass = lazy_callable('dataclasses', 'dataclass')
+pprint = lazy_callable('pprint', 'pprint')
+
+def _tqdm_fallback(iterable=None, **kwargs):
+    return iterable
+
+tqdm = lazy_callable('tqdm', 'tqdm', fallback=_tqdm_fallback)
 
 
 def part1(parsed):
@@ -38,18 +42,17 @@ def parse_input(data_src):
 
 def main():
     test_data, test_answers = get_test_data()
-    with open(__file__[:-3] + '-input.dat') as infile:
-        assert part1(*parse_input(test_data)) == test_answers[0]
-        print_result('1', part1, *parse_input(infile))  # -
-
-        assert part2(*parse_input(test_data)) == test_answers[1]
-        print_result('2', part2, *parse_input(infile))  # -
+    with harness.open_input(__file__[:-3] + '-input.dat') as infile:
+        # in order, or side by side in worker processes with AOC_CONCURRENT=1
+        harness.run_steps(
+            lambda: harness.check(part1(*parse_input(test_data)), test_answers[0]),
+            lambda: print_result('1', part1, *parse_input(infile)),  # -
+            lambda: harness.check(part2(*parse_input(test_data)), test_answers[1]),
+            lambda: print_result('2', part2, *parse_input(infile)),  # -
+        )
 
 def print_result(part_label, part_fn, *args):
-    start = time.perf_counter()
-    result = part_fn(*args)
-    end = time.perf_counter()
-    print(f"Part {part_label}: {result}  ({int((end-start)*1000)} ms)")
+    harness.solve_part(__file__, part_label, part_fn, *args, show_regress=False)
 
 def get_test_data():
     """Keep test data out of the way at the bottom of this file."""
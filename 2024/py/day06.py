@@ -1,8 +1,16 @@
 #!/usr/bin/env python3
+import os
+import sys
 import time
 import typing
 from io import StringIO
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.bitboard import BitBoard
+
+# up, right, down, left: turning right is moving one along
+HEADINGS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
 
 def find_starting_location(grid):
     vec = None
@@ -25,40 +33,72 @@ def find_starting_location(grid):
 
     return pos, vec
 
-def walk_patrol(grid, pos, vec, obstacle=None):
-    ROWS = len(grid)
-    COLS = len(grid[0])
-
-    visited = {(pos, vec)}
+def next_turn(rows, columns, pos, heading):
+    """
+    Where the guard walking from `pos` reaches an obstacle and turns, or None
+    if the guard walks off the map: one bit scan along the row or column.
+    """
+    r, c = pos
+    if heading == 0:
+        ahead = columns[c] & ((1 << r) - 1)
+        return (ahead.bit_length(), c) if ahead else None
+    if heading == 1:
+        ahead = rows[r] >> (c + 1)
+        return (r, c + (ahead & -ahead).bit_length() - 1) if ahead else None
+    if heading == 2:
+        ahead = columns[c] >> (r + 1)
+        return (r + (ahead & -ahead).bit_length() - 1, c) if ahead else None
+    ahead = rows[r] & ((1 << c) - 1)
+    return (r, ahead.bit_length()) if ahead else None
+
+def walk_patrol(obstacles, pos, heading):
+    """Every cell the guard visits before leaving the map, as a BitBoard."""
+    rows, columns = obstacles.rows, obstacles.transpose().rows
+    visited = BitBoard(obstacles.width, obstacles.height)
     while True:
-        next = pos[0]+vec[0], pos[1]+vec[1]
-        if 0 <= next[0] < ROWS and 0 <= next[1] < COLS:
-            if grid[next[0]][next[1]] == '#' or next == obstacle:
-                vec = vec[1], -vec[0]  # turn right
-            else:
-                pos = next
-                if (pos, vec) in visited:
-                    return None  # patrol is a loop
-                visited.add((pos, vec))
-        else:
-            break
-
-    return {v[0] for v in visited}
+        turn = next_turn(rows, columns, pos, heading)
+        (r, c), (dr, dc) = pos, HEADINGS[heading]
+        stop = turn or (  # else the edge of the map
+            r if dr == 0 else (obstacles.height - 1 if dr > 0 else 0),
+            c if dc == 0 else (obstacles.width - 1 if dc > 0 else 0))
+        first_r, last_r = sorted((r, stop[0]))
+        first_c, last_c = sorted((c, stop[1]))
+        for row in range(first_r, last_r + 1):
+            visited.rows[row] |= (1 << (last_c + 1)) - (1 << first_c)
+        if turn is None:
+            return visited
+        pos, heading = turn, (heading + 1) % 4
+
+def is_loop(obstacles, columns, pos, heading, obstacle):
+    """Whether adding `obstacle` traps the guard in a loop."""
+    rows, columns = obstacles.rows[:], columns[:]
+    rows[obstacle[0]] |= 1 << obstacle[1]
+    columns[obstacle[1]] |= 1 << obstacle[0]
+
+    # the patrol loops once the guard turns somewhere, facing the same way, twice
+    turned = [BitBoard(obstacles.width, obstacles.height) for _ in HEADINGS]
+    while (pos := next_turn(rows, columns, pos, heading)) is not None:
+        if pos in turned[heading]:
+            return True
+        turned[heading].add(*pos)
+        heading = (heading + 1) % 4
+    return False
 
 def part1(grid):
     pos, vec = find_starting_location(grid)
-    visited = walk_patrol(grid, pos, vec)
+    visited = walk_patrol(BitBoard.from_lines(grid), pos, HEADINGS.index(vec))
     return len(visited)
 
 def part2(grid):
     pos, vec = find_starting_location(grid)
-    obstacles = walk_patrol(grid, pos, vec)
-    obstacles.remove(pos)
+    obstacles = BitBoard.from_lines(grid)
+    columns = obstacles.transpose().rows
+    candidates = walk_patrol(obstacles, pos, HEADINGS.index(vec))
+    candidates.discard(*pos)
 
     loops = 0
-    for obstacle in obstacles:
-        visited = walk_patrol(grid, pos, vec, obstacle)
-        if visited is None:
+    for obstacle in candidates.cells():
+        if is_loop(obstacles, columns, pos, HEADINGS.index(vec), obstacle):
             loops += 1
 
     return loops
@@ -1,59 +1,57 @@
 #!/usr/bin/env python3
+import os
+import sys
 import time
 import typing
-from functools import cache
 from io import StringIO
 
-# make grid global so it doesn't have to be hashed every time
-# get_reachable_peaks is called; order of magnitude faster than passing
-# grid as parameter
-GRID = tuple()
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.memo import memoize
 
-@cache
-def get_reachable_peaks(row, col, step_height):
+
+@memoize(context=1)
+def get_reachable_peaks(grid, row, col, step_height):
     if (
-        row < 0 or row >= len(GRID) or
-        col < 0 or col >= len(GRID[0]) or
-        GRID[row][col] != step_height
+        row < 0 or row >= len(grid) or
+        col < 0 or col >= len(grid[0]) or
+        grid[row][col] != step_height
     ):
         return tuple()
 
-    if GRID[row][col] == 9:
+    if grid[row][col] == 9:
         return ((row, col),)
 
     return (
-        get_reachable_peaks(row-1, col, GRID[row][col]+1) +
-        get_reachable_peaks(row+1, col, GRID[row][col]+1) +
-        get_reachable_peaks(row, col-1, GRID[row][col]+1) +
-        get_reachable_peaks(row, col+1, GRID[row][col]+1)
+        get_reachable_peaks(grid, row-1, col, grid[row][col]+1) +
+        get_reachable_peaks(grid, row+1, col, grid[row][col]+1) +
+        get_reachable_peaks(grid, row, col-1, grid[row][col]+1) +
+        get_reachable_peaks(grid, row, col+1, grid[row][col]+1)
     )
 
-def part1():
+def part1(grid):
     score = 0
-    for r, row in enumerate(GRID):
+    for r, row in enumerate(grid):
         for c, height in enumerate(row):
             if height == 0:
-                peaks = get_reachable_peaks(r, c, 0)
+                peaks = get_reachable_peaks(grid, r, c, 0)
                 score += len(set(peaks))
     return score
 
-def part2():
+def part2(grid):
     score = 0
-    for r, row in enumerate(GRID):
+    for r, row in enumerate(grid):
         for c, height in enumerate(row):
             if height == 0:
-                peaks = get_reachable_peaks(r, c, 0)
+                peaks = get_reachable_peaks(grid, r, c, 0)
                 score += len(peaks)
     return score
 
 def parse_input(data_src: typing.TextIO) -> list[typing.Any]:
-    global GRID
-
     data_src.seek(0)
-    GRID = tuple(
+    grid = tuple(
         tuple(map(int, list(line))) for line in data_src.read().splitlines()
     )
-    return []
+    return [grid]
 
 def main():
     (test1_data, test1_answer), (test2_data, test2_answer) = get_test_data()
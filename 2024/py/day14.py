@@ -1,15 +1,13 @@
 #!/usr/bin/env python3
+import os
+import sys
 import time
 import typing
 
 import numpy as np
-from scipy.spatial.distance import pdist
 
-try:
-    from tqdm import tqdm
-except ImportError:
-    def tqdm(iterable=None, **kwargs):
-        return iterable
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.spatial import spread
 
 
 def part1(robots):
@@ -37,15 +35,18 @@ def part2(robots):
 
     pos = np.array([[x, y] for (x, y), _ in robots])
     vel = np.array([[dx, dy] for _, (dx, dy) in robots])
-    bounds = np.array((WIDTH, HEIGHT))
 
-    # find minimum average distance between all pairwise points
-    min_pd = float('inf'), 0
-    for seconds in tqdm(range(WIDTH*HEIGHT)):
-        updated = (pos + vel*seconds) % bounds
-        min_pd = min(min_pd, (np.mean(pdist(updated)), seconds))
-
-    tree_sec = min_pd[1]
+    # find when the robots are bunched closest together: the mean squared
+    # distance between them is proportional to their spread, which is the x
+    # spread plus the y spread, and those repeat every WIDTH and HEIGHT
+    # seconds, so each axis is only scored over its own period
+    def axis_spread(axis, period):
+        steps = np.arange(period)[:, None]
+        return spread(((pos[:, axis] + vel[:, axis] * steps) % period)[..., None])
+
+    seconds = np.arange(WIDTH*HEIGHT)
+    spreads = axis_spread(0, WIDTH)[seconds % WIDTH] + axis_spread(1, HEIGHT)[seconds % HEIGHT]
+    tree_sec = int(np.argmin(spreads))
 
     # render the positions of the robots at the time found
     grid = [['.' for _ in range(WIDTH)] for _ in range(HEIGHT)]
@@ -1,93 +1,43 @@
 #!/usr/bin/env python3
-import heapq
+import os
+import sys
 import time
 import typing
 from io import StringIO
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.grid import Grid
+from common_patterns.pathfinding import dial
 
-class Node:
-    __slots__ = 'pos', 'dist', 'prev', 'obselete'
-
-    def __init__(self, pos, dist, prev):
-        # pos: tuple[row, col, d_row, d_col]
-        self.pos = pos
-        self.dist = dist
-        self.prev: list[Node] = prev
-        self.obselete = False
-
-    def __lt__(self, other):
-        return self.dist < other.dist
-
-def dijkstra(grid, start, end) -> Node:
-    # this version finds all equally best paths; returns goal node
-    heap = []
-    visited = {}
-    goal_node = None
-
-    def add_node(pos, dist, prev: list[Node]):
-        if grid[pos[0]][pos[1]] == '#':
-            return
-
-        if old_node := visited.get(pos):
-            old_node.obselete = True
-
-        node = Node(pos, dist, prev)
-        heapq.heappush(heap, node)
-        visited[pos] = node
-
-    add_node((start[0], start[1], 0, 1), 0, [])
-    while heap:
-        current = heapq.heappop(heap)
-        row, col, drow, dcol = current.pos
-
-        if (
-            current.obselete or
-            goal_node and current.dist > goal_node.dist
-        ):
-            continue
-
-        if (row, col) == end:
-            goal_node = current
-            continue
-
-        for next_pos, next_dist in (
-            ((row+drow, col+dcol, drow, dcol), current.dist+1),
-            ((row, col, dcol, -drow), current.dist+1000),
-            ((row, col, -dcol, drow), current.dist+1000)
-        ):
-            seen = visited.get(next_pos)
-            if not seen or next_dist <= seen.dist:
-                next_prev = [current]
-                if seen and next_dist == seen.dist:
-                    next_prev.extend(seen.prev)
-                add_node(next_pos, next_dist, next_prev)
-
-    return goal_node
+
+EAST = 1  # facing, as an index into grid.offsets(diagonal=False): N, E, S, W
+
+def best_paths(grid, start, end):
+    # states are flat grid index * 4 + facing; keeps every equally best path
+    steps = grid.offsets(diagonal=False)
+    cells = grid.data.tobytes()  # indexing bytes is much quicker than the array
+    wall = grid.code('#')
+
+    def moves(state):
+        index, facing = divmod(state, 4)
+        if cells[index + steps[facing]] != wall:
+            yield state + steps[facing] * 4, 1
+        yield index * 4 + (facing + 1) % 4, 1000
+        yield index * 4 + (facing - 1) % 4, 1000
+
+    # costs are only ever 1 or 1000, so a bucket queue beats a heap
+    return dial(len(grid.data) * 4, start * 4 + EAST, moves, max_cost=1000,
+                goal=lambda state: state >> 2 == end, all_paths=True)
 
 def part1(grid, start, end):
-    goal = dijkstra(grid, start, end)
-    return goal.dist
+    return best_paths(grid, start, end).distance
 
 def part2(grid, start, end):
-    path_coords = set()
-    backtrack = [dijkstra(grid, start, end)]
-    while backtrack:
-        node = backtrack.pop()
-        backtrack.extend(node.prev)
-        path_coords.add((node.pos[0], node.pos[1]))
-    return len(path_coords)
+    return len({state >> 2 for state in best_paths(grid, start, end).on_best_paths()})
 
 def parse_input(data_src: typing.TextIO) -> list[typing.Any]:
-    data_src.seek(0)
-    grid = []
-    for r, row in enumerate(data_src.read().splitlines()):
-        grid.append(row)
-        if (c := row.find('S')) > 0:
-            start = r, c
-        if (c := row.find('E')) > 0:
-            end = r, c
-
-    return [grid, start, end]
+    grid = Grid.from_input(data_src, pad=1, fill='#')
+    return [grid, grid.find('S'), grid.find('E')]
 
 def main():
     (test1_data, test1_answer), (test2_data, test2_answer) = get_test_data()
@@ -1,77 +1,60 @@
 #!/usr/bin/env python3
-import heapq
+import os
+import sys
 import time
 import typing
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.pathfinding import bfs
+from common_patterns.unionfind import first_disconnecting
 
-class Node:
-    __slots__ = 'pos', 'dist', 'prev', 'obselete'
 
-    def __init__(self, pos, dist, prev):
-        # pos: tuple[x, y]
-        self.pos = pos
-        self.dist = dist
-        self.prev: Node = prev
-        self.obselete = False
+def block(obstacles, size) -> bytearray:
+    # one flag per state, y * (size+1) + x
+    blocked = bytearray((size+1) * (size+1))
+    for x, y in obstacles:
+        blocked[y*(size+1) + x] = 1
+    return blocked
 
-    def __lt__(self, other):
-        return self.dist < other.dist
+def adjacent(size):
+    # states are y * (size+1) + x
+    width = size + 1
 
-def dijkstra(obstacles, size) -> Node:
-    heap = []
-    visited = {}
+    def neighbours(state):
+        y, x = divmod(state, width)
+        if y < size:
+            yield state + width
+        if y > 0:
+            yield state - width
+        if x < size:
+            yield state + 1
+        if x > 0:
+            yield state - 1
 
-    def add_node(pos, dist, prev: Node):
-        if (
-            pos[0] < 0 or pos[0] > size or
-            pos[1] < 0 or pos[1] > size or
-            pos in obstacles
-        ):
-            return
+    return neighbours
 
-        if old_node := visited.get(pos):
-            old_node.obselete = True
+def shortest_path(blocked, size) -> int|None:
+    # None if the exit is cut off
+    width = size + 1
+    neighbours = adjacent(size)
 
-        node = Node(pos, dist, prev)
-        heapq.heappush(heap, node)
-        visited[pos] = node
+    def moves(state):
+        return (next_state for next_state in neighbours(state) if not blocked[next_state])
 
-    add_node((0, 0), 0, None)
-    while heap:
-        current = heapq.heappop(heap)
-
-        if current.obselete:
-            continue
-
-        if current.pos == (size, size):
-            return current
-
-        x, y = current.pos
-        for next_pos, next_dist in (
-            ((x, y+1), current.dist+1),
-            ((x, y-1), current.dist+1),
-            ((x+1, y), current.dist+1),
-            ((x-1, y), current.dist+1),
-        ):
-            seen = visited.get(next_pos)
-            if not seen or next_dist < seen.dist:
-                add_node(next_pos, next_dist, current)
+    return bfs(width * width, 0, moves, goal=width * width - 1).distance
 
 def part1(bytes):
-    goal = dijkstra(set(bytes[:1024]), 70)
-    return goal.dist
-
-def part2(bytes):
-    # invert check and find when path becomes unblocked; the path finder
-    # completes faster when there are no valid paths
-    obstacles = set(bytes)
-    first_blocked = bytes[-1]
-    for obstacle in reversed(bytes[:-1]):
-        if dijkstra(obstacles, 70):
-            return f"{first_blocked[0]},{first_blocked[1]}"
-
-        obstacles.remove(obstacle)
-        first_blocked = obstacle
+    return shortest_path(block(bytes[:1024], 70), 70)
+
+def part2(bytes, size=70):
+    # offline: put the bytes back last first, joining each to its open
+    # neighbours, until the start and exit are in one set
+    width = size + 1
+    removals = [y*width + x for x, y in bytes]
+    index = first_disconnecting(width * width, removals, adjacent(size), 0, width * width - 1)
+    if index is None:
+        return None  # the exit is never cut off
+    return f"{bytes[index][0]},{bytes[index][1]}"
 
 def parse_input(data_src: typing.TextIO) -> list[typing.Any]:
     data_src.seek(0)
@@ -1,25 +1,29 @@
 #!/usr/bin/env python3
+import os
+import sys
 import time
 import typing
-from functools import cache
 from io import StringIO
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.memo import memoize
 
-@cache
-def pattern_combos(pattern, towels):
+
+@memoize(context=1)
+def pattern_combos(towels, pattern):
     combos = 0
     for towel in towels:
         if towel == pattern:
             combos += 1
         elif pattern.startswith(towel):
-            combos += pattern_combos(pattern[len(towel):], towels)
+            combos += pattern_combos(towels, pattern[len(towel):])
     return combos
 
 def part1(towels, patterns):
-    return sum(pattern_combos(p, towels) > 0 for p in patterns)
+    return sum(pattern_combos(towels, p) > 0 for p in patterns)
 
 def part2(towels, patterns):
-    return sum(pattern_combos(p, towels) for p in patterns)
+    return sum(pattern_combos(towels, p) for p in patterns)
 
 def parse_input(data_src: typing.TextIO) -> list[typing.Any]:
     data_src.seek(0)
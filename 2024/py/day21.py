@@ -1,109 +1,61 @@
 #!/usr/bin/env python3
-import heapq
 import itertools
+import os
+import sys
 import time
 import typing
 from functools import cache
 from io import StringIO
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.pathfinding import Paths, bfs
 
-class Node:
-    __slots__ = 'pos', 'dist', 'prev', 'obselete'
 
-    def __init__(self, pos, dist, prev):
-        # pos: tuple[row, col]
-        self.pos = pos
-        self.dist = dist
-        self.prev: list[Node] = prev
-        self.obselete = False
-
-    def __lt__(self, other):
-        return self.dist < other.dist
-
-# using dijkstra to pathfind between buttons because it's already written
-def dijkstra(grid, start, end) -> Node:
-    # this version finds all equally best paths; returns goal node
+# using bfs to pathfind between buttons because it's already written
+def best_paths(grid, start, end) -> Paths:
+    # states are row * cols + col; keeps every equally best path
     ROWS = len(grid)
     COLS = len(grid[0])
 
-    heap = []
-    visited = {}
-    goal_node = None
-
-    def add_node(pos, dist, prev: list[Node]):
-        if (
-            pos[0] < 0 or pos[0] >= ROWS or
-            pos[1] < 0 or pos[1] >= COLS or
-            grid[pos[0]][pos[1]] == ' '
-        ):
-            return
-
-        if old_node := visited.get(pos):
-            old_node.obselete = True
-
-        node = Node(pos, dist, prev)
-        heapq.heappush(heap, node)
-        visited[pos] = node
-
-    add_node((start[0], start[1]), 0, [])
-    while heap:
-        current = heapq.heappop(heap)
-        row, col = current.pos
-
-        if (
-            current.obselete or
-            goal_node and current.dist > goal_node.dist
-        ):
-            continue
-
-        if (row, col) == end:
-            goal_node = current
-            continue
-
-        for next_pos, next_dist in (
-            ((row, col+1), current.dist+1),
-            ((row, col-1), current.dist+1),
-            ((row+1, col), current.dist+1),
-            ((row-1, col), current.dist+1),
-        ):
-            seen = visited.get(next_pos)
-            if not seen or next_dist <= seen.dist:
-                next_prev = [current]
-                if seen and next_dist == seen.dist:
-                    next_prev.extend(seen.prev)
-                add_node(next_pos, next_dist, next_prev)
-
-    return goal_node
-
-def unwind_paths(node: Node, seq=''):
+    def moves(state):
+        row, col = divmod(state, COLS)
+        for next_row, next_col in ((row, col+1), (row, col-1), (row+1, col), (row-1, col)):
+            if 0 <= next_row < ROWS and 0 <= next_col < COLS and grid[next_row][next_col] != ' ':
+                yield next_row * COLS + next_col
+
+    return bfs(ROWS * COLS, start, moves, goal=end, all_paths=True)
+
+def unwind_paths(paths: Paths, cols, state, seq=''):
     """get a list of all best button sequence paths"""
-    if not node.prev:
+    prevs = paths.preds.get(state)
+    if not prevs:
         return [seq+'A']  # all paths end with 'A' to push the button
 
     new_seqs = []
-    for p in node.prev:
-        match p.pos[0]-node.pos[0], p.pos[1]-node.pos[1]:
-            case -1, 0:
-                new_seqs += unwind_paths(p, 'v'+seq)
-            case 1, 0:
-                new_seqs += unwind_paths(p, '^'+seq)
-            case 0, 1:
-                new_seqs += unwind_paths(p, '<'+seq)
-            case 0, -1:
-                new_seqs += unwind_paths(p, '>'+seq)
+    for prev in prevs:
+        match prev - state:
+            case d if d == -cols:
+                new_seqs += unwind_paths(paths, cols, prev, 'v'+seq)
+            case d if d == cols:
+                new_seqs += unwind_paths(paths, cols, prev, '^'+seq)
+            case 1:
+                new_seqs += unwind_paths(paths, cols, prev, '<'+seq)
+            case -1:
+                new_seqs += unwind_paths(paths, cols, prev, '>'+seq)
     return new_seqs
 
 def build_button_map(grid):
-    coords = {}
+    cols = len(grid[0])
+    states = {}
     for r, row in enumerate(grid):
         for c, ch in enumerate(row):
-            coords[ch] = r, c
-    buttons = [ch for ch in coords if ch != ' ']
+            states[ch] = r * cols + c
+    buttons = [ch for ch in states if ch != ' ']
 
     button_map = {}
     for a, b in itertools.combinations_with_replacement(buttons, 2):
-        button_map[a,b] = unwind_paths(dijkstra(grid, coords[a], coords[b]))
-        button_map[b,a] = unwind_paths(dijkstra(grid, coords[b], coords[a]))
+        button_map[a,b] = unwind_paths(best_paths(grid, states[a], states[b]), cols, states[b])
+        button_map[b,a] = unwind_paths(best_paths(grid, states[b], states[a]), cols, states[a])
     return button_map
 
 def calc_complexities(codes, num_robots):
@@ -1,34 +1,33 @@
 #!/usr/bin/env python3
 import functools
 import itertools
+import os
+import sys
 import time
 import typing
-from functools import cache
 from io import StringIO
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.memo import memoize
 
-def get_bit_fn(wires, gates):
-    @cache
-    def get_bit(label):
-        if label in wires:
-            return wires[label]
-
-        in1, in2, op = gates[label]
-        in1_bit = get_bit(in1)
-        in2_bit = get_bit(in2)
-        match op:
-            case "AND":
-                return in1_bit & in2_bit
-            case "OR":
-                return in1_bit | in2_bit
-            case "XOR":
-                return in1_bit ^ in2_bit
-
-    # create a closure so we can use @cache with unhashable
-    # (but unchanging) arguments
-    return get_bit
-
-def get_number(prefix, wires, gates, bit_fn):
+
+@memoize(context=2)
+def get_bit(wires, gates, label):
+    if label in wires:
+        return wires[label]
+
+    in1, in2, op = gates[label]
+    in1_bit = get_bit(wires, gates, in1)
+    in2_bit = get_bit(wires, gates, in2)
+    match op:
+        case "AND":
+            return in1_bit & in2_bit
+        case "OR":
+            return in1_bit | in2_bit
+        case "XOR":
+            return in1_bit ^ in2_bit
+
+def get_number(prefix, wires, gates):
     number = 0
     for bit_pos in itertools.count():
         out_label = f"{prefix}{bit_pos:02}"
@@ -37,14 +36,13 @@ def get_number(prefix, wires, gates, bit_fn):
         elif out_label not in gates:
             break
 
-        bit = bit_fn(out_label)
+        bit = get_bit(wires, gates, out_label)
         number |= bit << bit_pos
 
     return number
 
 def part1(wires, gates):
-    bit_fn = get_bit_fn(wires, gates)
-    return get_number('z', wires, gates, bit_fn)
+    return get_number('z', wires, gates)
 
 """
 Z[n] = A[n] XOR B[n] XOR C[n]
@@ -147,10 +145,8 @@ def check_z_gate(gates, bit_pos):
     return bad_gates
 
 def part2(wires, gates):
-    bit_fn = get_bit_fn(wires, gates)
-
-    x = get_number('x', wires, gates, bit_fn)
-    y = get_number('y', wires, gates, bit_fn)
+    x = get_number('x', wires, gates)
+    y = get_number('y', wires, gates)
 
     biggest_z = max(gates, key=lambda g: int(g[1:]) if g[0] == 'z' else 0)
     num_z_bits = int(biggest_z[1:]) + 1
@@ -171,9 +167,8 @@ def part2(wires, gates):
         for a, b in pairs:
             mod_gates[a], mod_gates[b] = mod_gates[b], mod_gates[a]
 
-        bit_fn = get_bit_fn(wires, mod_gates)
         try:
-            z = get_number('z', wires, mod_gates, bit_fn)
+            z = get_number('z', wires, mod_gates)
         except RecursionError:
             # easier to catch the exception than detect circular dependencies
             continue
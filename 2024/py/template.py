@@ -9,19 +9,23 @@ import sys
 import time
 import typing
 from collections import Counter, defaultdict, namedtuple
-from dataclasses import dataclass
 from enum import Enum, IntEnum
 from functools import cache
 from io import StringIO
-from pprint import pprint
 
-import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from aoctools import harness
+from aoctools.lazy import lazy_callable, lazy_import
 
-try:
-    from tqdm import tqdm
-except ImportError:
-    def tqdm(iterable=None, **kwargs):
-        return iterable
+# heavy modules are only imported on first use, to keep startup fast
+np = lazy_import('numpy')
+dataclass = lazy_callable('dataclasses', 'dataclass')
+pprint = lazy_callable('pprint', 'pprint')
+
+def _tqdm_fallback(iterable=None, **kwargs):
+    return iterable
+
+tqdm = lazy_callable('tqdm', 'tqdm', fallback=_tqdm_fallback)
 
 
 def part1(parsed):
@@ -30,6 +34,7 @@ def part1(parsed):
 def part2(parsed):
     pass
 
+@harness.cached_parse(copy=None)  # copy=False if no part modifies its input
 def parse_input(data_src: typing.TextIO) -> list[typing.Any]:
     data_src.seek(0)
     head, *body = data_src.read().splitlines()
@@ -39,23 +44,17 @@ def parse_input(data_src: typing.TextIO) -> list[typing.Any]:
 
 def main():
     (test1_data, test1_answer), (test2_data, test2_answer) = get_test_data()
-    with open(__file__[:-3] + '-input.dat') as infile:
-        my_part1_answer = part1(*parse_input(test1_data))
-        assert my_part1_answer == test1_answer, \
-            f"got {my_part1_answer}; should be {test1_answer}"
-        solve_part('1', part1, *parse_input(infile), expected=None)
-
-        my_part2_answer = part2(*parse_input(test2_data))
-        assert my_part2_answer == test2_answer, \
-            f"got {my_part2_answer}; should be {test2_answer}"
-        solve_part('2', part2, *parse_input(infile), expected=None)
+    with harness.open_input(__file__[:-3] + '-input.dat') as infile:
+        # in order, or side by side in worker processes with AOC_CONCURRENT=1
+        harness.run_steps(
+            lambda: harness.check(part1(*parse_input(test1_data)), test1_answer),
+            lambda: solve_part('1', part1, *parse_input(infile), expected=None),
+            lambda: harness.check(part2(*parse_input(test2_data)), test2_answer),
+            lambda: solve_part('2', part2, *parse_input(infile), expected=None),
+        )
 
 def solve_part(part_label: str, part_fn: typing.Callable, *args, expected=None):
-    start = time.perf_counter()
-    result = part_fn(*args)
-    end = time.perf_counter()
-    regress = '' if expected is None or result == expected else "** Regression **"
-    print(f"Part {part_label}: {result}  ({int((end-start)*1000)} ms)  {regress}")
+    harness.solve_part(__file__, part_label, part_fn, *args, expected=expected)
 
 def get_test_data() -> tuple[tuple[str, str|float], tuple[str, str|float]]:
     """Keep test data out of the way at the bottom of this file."""
@@ -1,58 +1,33 @@
 #!/usr/bin/env python3
+import os
+import sys
 import time
 import typing
 from io import StringIO
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.grid import Grid
 
-def is_roll(grid, row, col):
-    assert len(grid) > 0 and len(grid[0]) > 0
-    if row < 0 or row >= len(grid) or col < 0 or col >= len(grid[0]):
-        return False
-    return grid[row][col] == '@'
+ROLL = ord('@')
 
-def is_roll_accessible(grid, row, col):
-    num_rolls = (
-        int(is_roll(grid, row-1, col-1)) +
-        int(is_roll(grid, row-1, col)) +
-        int(is_roll(grid, row-1, col+1)) +
-        int(is_roll(grid, row, col-1)) +
-        int(is_roll(grid, row, col+1)) +
-        int(is_roll(grid, row+1, col-1)) +
-        int(is_roll(grid, row+1, col)) +
-        int(is_roll(grid, row+1, col+1))
-    )
-    return num_rolls < 4
-
-def part1(grid):
-    accessible = 0
-    for row, line in enumerate(grid):
-        for col, elem in enumerate(line):
-            if elem == '@':
-                accessible += is_roll_accessible(grid, row, col)
-    return accessible
 
-def copy_grid(grid):
-    return [line.copy() for line in grid]
+def accessible_rolls(grid):
+    # rolls with fewer than four rolls among their eight neighbours; the
+    # grid's '.' border stands in for the bounds checks
+    return (grid.array == ROLL) & (grid.count_neighbours(ROLL, diagonal=True) < 4)
 
-def remove_accessible_rolls(grid):
-    grid_orig = copy_grid(grid)
-    removed = 0
-    for row, line in enumerate(grid_orig):
-        for col, elem in enumerate(line):
-            if elem == '@' and is_roll_accessible(grid_orig, row, col):
-                grid[row][col] = '.'
-                removed += 1
-    return removed
+def part1(grid):
+    return int(accessible_rolls(grid).sum())
 
 def part2(grid):
     total_removed = 0
-    while removed := remove_accessible_rolls(grid):
+    while removed := int((accessible := accessible_rolls(grid)).sum()):
+        grid.array[accessible] = ord('.')
         total_removed += removed
     return total_removed
 
 def parse_input(data_src: typing.TextIO) -> list[typing.Any]:
-    data_src.seek(0)
-    return [[list(l) for l in data_src.read().splitlines()]]  # note: return single item as [item] for *parse_input
+    return [Grid.from_input(data_src, pad=1, fill='.')]  # note: return single item as [item] for *parse_input
 
 def main():
     (test1_data, test1_answer), (test2_data, test2_answer) = get_test_data()
@@ -1,43 +1,20 @@
 #!/usr/bin/env python3
+import os
+import sys
 import time
 import typing
 from io import StringIO
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.intervals import IntervalSet
 
-def consolidate_ranges(ranges):
-    ranges = sorted(ranges)
-    idx = 0
-    while True:
-        if idx == len(ranges) - 1:
-            break
-
-        if (
-            ranges[idx+1][0] <= ranges[idx][1] <= ranges[idx+1][1] or
-            ranges[idx][0] <= ranges[idx+1][1] <= ranges[idx][1]
-        ):
-            ranges[idx][1] = max(ranges[idx][1], ranges[idx+1][1])
-            del ranges[idx+1]
-        else:
-            idx += 1
-
-    return ranges
 
 def part1(fresh, ingredients):
-    fresh = consolidate_ranges(fresh)
-    total = 0
-    for ingred in ingredients:
-        for a, b in fresh:
-            if a <= ingred <= b:
-                total += 1
-                break
-    return total
+    fresh = IntervalSet.from_inclusive(fresh)
+    return sum(ingred in fresh for ingred in ingredients)
 
 def part2(fresh, _):
-    fresh = consolidate_ranges(fresh)
-    total = 0
-    for a, b in fresh:
-        total += b - a + 1
-    return total
+    return IntervalSet.from_inclusive(fresh).size
 
 def parse_input(data_src: typing.TextIO) -> list[typing.Any]:
     data_src.seek(0)
@@ -1,44 +1,34 @@
 #!/usr/bin/env python3
 import itertools
 import math
+import os
+import sys
 import time
 import typing
 from io import StringIO
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '2022', 'py'))
+from common_patterns.spatial import SpatialIndex
+from common_patterns.unionfind import UnionFind
 
-def part1(boxes, num_pairs=1000):
-    dists = [(a, b, math.dist(a, b)) for a, b in itertools.combinations(boxes, 2)]
-    dists.sort(key = lambda x: x[2])
-
-    circuit_map = {box: frozenset([box]) for box in boxes}
-    for i in range(num_pairs):
-        a, b, _ = dists[i]
-        circuit_a = circuit_map[a]
-        circuit_b = circuit_map[b]
-        new_circuit = frozenset(circuit_a | circuit_b)
-        for circuit in new_circuit:
-            circuit_map[circuit] = new_circuit
 
-    unique = frozenset()
-    for s in circuit_map.values():
-        unique = frozenset(unique | {s})
+def closest_pairs(boxes):
+    # index pairs, nearest first, streamed from each box's nearest neighbours
+    # rather than sorting all n^2/2 pairs
+    for _, a, b in SpatialIndex(boxes).closest_pairs():
+        yield a, b
 
-    ordered = sorted([len(circuit) for circuit in unique])
-    return math.prod(ordered[-3:])
+def part1(boxes, num_pairs=1000):
+    circuits = UnionFind(len(boxes))
+    for a, b in itertools.islice(closest_pairs(boxes), num_pairs):
+        circuits.union(a, b)
+    return math.prod(circuits.sizes()[:3])
 
 def part2(boxes):
-    dists = [(a, b, math.dist(a, b)) for a, b in itertools.combinations(boxes, 2)]
-    dists.sort(key = lambda x: x[2])
-
-    circuit_map = {box: frozenset([box]) for box in boxes}
-    for a, b, _ in dists:
-        circuit_a = circuit_map[a]
-        circuit_b = circuit_map[b]
-        new_circuit = frozenset(circuit_a | circuit_b)
-        if len(new_circuit) == len(boxes):
-            return a[0] * b[0]
-        for circuit in new_circuit:
-            circuit_map[circuit] = new_circuit
+    circuits = UnionFind(len(boxes))
+    for a, b in closest_pairs(boxes):
+        if circuits.union(a, b) and circuits.components == 1:
+            return boxes[a][0] * boxes[b][0]
 
 def parse_input(data_src: typing.TextIO) -> list[typing.Any]:
     data_src.seek(0)
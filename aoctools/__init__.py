@@ -0,0 +1,9 @@
+"""
+Tooling for running, timing and checking solutions across every year.
+
+The day scripts stay standalone (`python dayNN.py`); everything here works by
+importing their `part1`/`part2`/`parse_input` functions from the outside.
+"""
+import pathlib
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
@@ -0,0 +1,127 @@
+"""
+Benchmark solutions against the checked-in baselines in aoctools/baselines.json.
+
+Usage: python -m aoctools.bench [--years 2023 2024] [--days 1-5,9] [--repeat 5]
+                                [--tolerance 0.25] [--update-baselines] [--output FILE]
+                                [--memory] [--rss-limit MIB] [--no-history]
+
+Each part is run --repeat times and reported as min/median/p95 ms. The command
+fails when a part's median is more than --tolerance slower than its baseline
+(ignoring differences under NOISE_FLOOR_MS), or when a part fails outright.
+--memory adds peak RSS and tracemalloc peak to the table and the report, and
+--rss-limit (which implies --memory) also fails parts whose peak RSS exceeds it.
+Days run one at a time by default so they don't compete for CPU. Every run is
+also recorded against the current commit in the performance history (see
+aoctools.history) unless --no-history is given.
+"""
+from __future__ import annotations
+
+import json
+import pathlib
+import sys
+import time
+
+from aoctools import REPO_ROOT, history
+from aoctools.discover import find_days
+from aoctools.run import RunOptions, make_arg_parser, part_budget, run_all, write_report
+
+BASELINES = REPO_ROOT / 'aoctools' / 'baselines.json'
+NOISE_FLOOR_MS = 1.0
+
+
+def baseline_key(row: dict) -> str:
+    return f"{row['year']}/{row['day']:02}/{row['part']}"
+
+def load_baselines(path: pathlib.Path=BASELINES) -> dict[str, dict]:
+    if not path.exists():
+        return {}
+    with open(path) as infile:
+        return json.load(infile)
+
+def save_baselines(baselines: dict[str, dict], path: pathlib.Path=BASELINES):
+    with open(path, 'w') as outfile:
+        json.dump(dict(sorted(baselines.items())), outfile, indent=2)
+        outfile.write('\n')
+
+def compare(row: dict, baseline: dict|None, tolerance: float) -> str:
+    """'slower', 'faster' or '' for a timed row against its baseline."""
+    if baseline is None:
+        return ''
+    delta = row['ms'] - baseline['ms']
+    if abs(delta) < NOISE_FLOOR_MS:
+        return ''
+    if delta > tolerance * baseline['ms']:
+        return 'slower'
+    if -delta > tolerance * baseline['ms']:
+        return 'faster'
+    return ''
+
+def format_row(row: dict, baseline: dict|None, verdict: str) -> str:
+    name = f"{row['year']} day{row['day']:02} part {row['part']}"
+    if row['ms'] is None:
+        return f"{name}  {row['status']}  {row['error'] or ''}".rstrip()
+    text = (f"{name}  min {row['min_ms']:9.1f}  median {row['ms']:9.1f}  "
+            f"p95 {row['p95_ms']:9.1f} ms")
+    if row['peak_rss_kb'] is not None:
+        text += f"  rss {row['peak_rss_kb']/1024:7.1f}  traced {row['traced_peak_kb']/1024:7.1f} MiB"
+    if baseline is not None:
+        change = (row['ms'] - baseline['ms']) / baseline['ms'] if baseline['ms'] else 0
+        text += f"   baseline {baseline['ms']:9.1f} ms  {change:+7.1%}"
+    if verdict or row['status'] != 'ok':
+        text += f"  ** {(verdict or row['status']).upper()} **"
+    return text
+
+def main(argv=None):
+    parser = make_arg_parser("Benchmark solutions against checked-in baselines.")
+    parser.set_defaults(jobs=1, repeat=5)
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed fractional slowdown of the median (default: 0.25)")
+    parser.add_argument('--update-baselines', action='store_true',
+                        help="record this run's timings as the new baselines")
+    parser.add_argument('--output', help="also write the full JSON report here")
+    parser.add_argument('--rss-limit', type=float, metavar='MIB',
+                        help="fail parts whose peak RSS exceeds this many MiB")
+    parser.add_argument('--no-history', dest='history', action='store_false',
+                        help="don't record this run in the performance history")
+    args = parser.parse_args(argv)
+    args.memory = args.memory or args.rss_limit is not None
+
+    specs = find_days(args.years, args.days)
+    start = time.perf_counter()
+    options = RunOptions(repeat=max(1, args.repeat), use_cache=False, memory=args.memory,
+                         budget=part_budget(args))
+    rows = run_all(specs, max(1, args.jobs), args.timeout, options)
+    wall_ms = (time.perf_counter() - start) * 1000
+    rows = [row for row in rows if row['status'] not in ('skipped', 'missing-input')]
+
+    baselines = load_baselines()
+    failed = 0
+    for row in rows:
+        baseline = baselines.get(baseline_key(row))
+        verdict = compare(row, baseline, args.tolerance) if row['ms'] is not None else ''
+        if args.rss_limit is not None and (row['peak_rss_kb'] or 0) > args.rss_limit * 1024:
+            verdict = 'over rss limit'
+        failed += verdict in ('slower', 'over rss limit') or row['status'] != 'ok'
+        print(format_row(row, baseline, verdict))
+
+    if args.output:
+        with open(args.output, 'w') as outfile:
+            write_report(rows, 'json', outfile, wall_ms)
+    if args.history and rows:
+        commit = history.record(rows, options.repeat)
+        print(f"recorded in {history.HISTORY_DB.name} for {history.short(commit)}", file=sys.stderr)
+
+    if args.update_baselines:
+        for row in rows:
+            if row['status'] == 'ok':
+                baselines[baseline_key(row)] = {
+                    key: row[key] for key in ('min_ms', 'ms', 'p95_ms', 'runs')
+                }
+        save_baselines(baselines)
+        print(f"updated {BASELINES.relative_to(REPO_ROOT)}", file=sys.stderr)
+        return 0
+
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""
+Per-part time budgets, with how far a part got when it ran out.
+
+`install(progress)` puts a stand-in `tqdm` module into sys.modules before a
+day is imported, so the `from tqdm import tqdm` (or the templates' lazy tqdm)
+in a day script picks it up. It draws nothing. Instead the outermost loop
+records its position in `progress`, a small shared array that the parent
+process can still read after killing the worker. Each step is also a
+cancellation point: once the part is over its `limit`, the next step raises
+BudgetExceeded. Parts with no tqdm loop get a SIGALRM at the deadline instead
+(on Unix, in the main thread), which raises BudgetExceeded as well.
+
+Progress is stored as (part, done, total); `describe` turns it into e.g.
+"at 37%", or "after 1200 steps" when the total isn't known.
+"""
+from __future__ import annotations
+
+import contextlib
+import math
+import signal
+import sys
+import threading
+import time
+import types
+import typing
+
+PART, DONE, TOTAL = range(3)
+REPORT_INTERVAL = 0.01  # seconds
+
+_progress = [0.0, 0.0, math.nan]
+_deadline = math.inf
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+def new_progress():
+    """A progress array to share with a worker process."""
+    from multiprocessing.sharedctypes import RawArray
+    return RawArray('d', [0.0, 0.0, math.nan])
+
+def install(progress=None):
+    """Replace tqdm with the progress-reporting stand-in, writing to `progress`."""
+    global _progress
+    if progress is not None:
+        _progress = progress
+    module = types.ModuleType('tqdm', "Progress-reporting stand-in for tqdm (aoctools.budget)")
+    module.tqdm = tqdm
+    module.trange = trange
+    sys.modules['tqdm'] = module
+
+def start_part(part: str):
+    _progress[PART], _progress[DONE], _progress[TOTAL] = float(part), 0.0, math.nan
+
+def fraction(progress=None) -> float|None:
+    progress = _progress if progress is None else progress
+    done, total = progress[DONE], progress[TOTAL]
+    return min(1.0, done / total) if total > 0 else None
+
+def describe(progress=None) -> str:
+    """Where the last part got to: 'at 37%', 'after 1200 steps' or ''."""
+    progress = _progress if progress is None else progress
+    share = fraction(progress)
+    if share is not None:
+        return f"at {share:.0%}"
+    if progress[DONE]:
+        return f"after {int(progress[DONE])} steps"
+    return ''
+
+def check():
+    """Raise BudgetExceeded if the current part is past its deadline."""
+    if time.monotonic() > _deadline:
+        raise BudgetExceeded(f"timed out {describe()}".rstrip())
+
+def _on_alarm(signum, frame):
+    raise BudgetExceeded(f"timed out {describe()}".rstrip())
+
+@contextlib.contextmanager
+def limit(seconds: float|None):
+    """Cancel the body of the `with` after `seconds` (no limit if falsy)."""
+    global _deadline
+    if not seconds:
+        yield
+        return
+    use_alarm = hasattr(signal, 'setitimer') and \
+        threading.current_thread() is threading.main_thread()
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, seconds)
+    _deadline = time.monotonic() + seconds
+    try:
+        yield
+    finally:
+        _deadline = math.inf
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+
+class tqdm:
+    """Enough of tqdm's interface for the day scripts: iteration, update() and `with`."""
+    _reporting = None  # the outermost open bar, which owns the progress channel
+
+    def __init__(self, iterable: typing.Iterable=None, total: float|None=None, **kwargs):
+        self.iterable = iterable
+        if total is None and iterable is not None:
+            try:
+                total = len(iterable)
+            except TypeError:
+                pass
+        self.total = total
+        self.n = 0
+        # like tqdm's miniters: report every `stride` items, doubling it while
+        # reports come less than REPORT_INTERVAL apart, so fast loops stay fast
+        self.stride = 1
+        self.last_report = time.monotonic()
+        if tqdm._reporting is None:
+            tqdm._reporting = self
+            _progress[DONE] = 0.0
+            _progress[TOTAL] = total if total else math.nan
+
+    def __iter__(self):
+        n, next_report = self.n, self.n + self.stride
+        try:
+            for item in self.iterable:
+                yield item
+                n += 1
+                if n >= next_report:
+                    self.update(n - self.n)
+                    next_report = n + self.stride
+        finally:
+            self.close()
+
+    def __len__(self) -> int:
+        return len(self.iterable) if self.iterable is not None else int(self.total or 0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def update(self, n: float=1):
+        self.n += n
+        if tqdm._reporting is self:
+            _progress[DONE] = self.n
+        now = time.monotonic()
+        if now - self.last_report < REPORT_INTERVAL:
+            self.stride *= 2
+        self.last_report = now
+        check()
+
+    def close(self):
+        if tqdm._reporting is self:
+            tqdm._reporting = None
+
+    @staticmethod
+    def write(text: str, file=None, **kwargs):
+        print(text, file=file or sys.stdout)
+
+    def __getattr__(self, name: str):
+        return lambda *args, **kwargs: None  # set_description, refresh, ...
+
+def trange(*args, **kwargs) -> tqdm:
+    return tqdm(range(*args), **kwargs)
@@ -0,0 +1,232 @@
+"""
+Content-addressed on-disk cache for answers and parsed inputs.
+
+Answers are keyed on the sha256 of the puzzle input bytes and of the solver's
+source (the day script plus any helper modules it imports from its own
+directory, e.g. intcode_cpu, or from the shared 2022/py/common_patterns), so
+editing either one simply misses the cache; nothing needs to be invalidated
+by hand.
+
+Parsed inputs are keyed on the input and on the code `parse_input` actually
+uses (see `parser_digest`), so editing a part doesn't throw away the parse.
+Plain NumPy arrays are stored as .npy/.npz, everything else is pickled.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import pathlib
+import pickle
+import sys
+import types
+import typing
+
+from aoctools import REPO_ROOT
+
+CACHE_DIR = REPO_ROOT / '.aoc-cache'
+MISSING = object()
+# helpers shared between years, imported by path from other years' scripts
+SHARED_DIRS = (REPO_ROOT / '2022' / 'py' / 'common_patterns',)
+
+
+def digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def file_digest(path: str|os.PathLike) -> str:
+    with open(path, 'rb') as infile:
+        return hashlib.file_digest(infile, 'sha256').hexdigest()
+
+def is_shared(path: pathlib.Path) -> bool:
+    return any(shared_dir in path.parents for shared_dir in SHARED_DIRS)
+
+def local_modules(source_dir: pathlib.Path) -> set[pathlib.Path]:
+    """Files of the imported helper modules (not day scripts) under `source_dir` or SHARED_DIRS."""
+    paths = set()
+    for module in list(sys.modules.values()):
+        path = getattr(module, '__file__', None)
+        if path is None:
+            continue
+        path = pathlib.Path(path).resolve()
+        if source_dir in path.parents and not path.name.startswith('day') or is_shared(path):
+            paths.add(path)
+    return paths
+
+def source_digest(source_file: str|os.PathLike) -> str:
+    """Digest of a day script together with the local modules it has imported."""
+    source_file = pathlib.Path(source_file).resolve()
+    source_dir = source_file.parent
+    paths = {source_file} | local_modules(source_dir)
+
+    sha = hashlib.sha256()
+    for path in sorted(paths):
+        base = source_dir if source_dir in path.parents else REPO_ROOT
+        sha.update(str(path.relative_to(base)).encode())
+        sha.update(path.read_bytes())
+    return sha.hexdigest()
+
+def answer_key(input_digest: str, code_digest: str, part_label: str) -> str:
+    return digest(f"{input_digest}:{code_digest}:{part_label}".encode())
+
+def write_atomic(path: pathlib.Path, data: bytes):
+    import tempfile  # only needed on a miss; keeps the templates' startup down
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as outfile:
+            outfile.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def load_answer(key: str) -> typing.Any:
+    """The cached answer for `key`, or MISSING."""
+    try:
+        with open(CACHE_DIR / 'answers' / f"{key}.pickle", 'rb') as infile:
+            return pickle.load(infile)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return MISSING
+
+def store_answer(key: str, answer: typing.Any):
+    data = dumps(answer)
+    if data is not None:  # not worth failing a solve over an answer we can't store
+        write_atomic(CACHE_DIR / 'answers' / f"{key}.pickle", data)
+
+def parser_digest(parse_fn: typing.Callable) -> str:
+    """
+    Digest of the bytecode of `parse_fn` and of every module-level function,
+    class and constant it reaches through its globals, plus the source of any
+    helper modules it uses, local or under SHARED_DIRS.
+    """
+    sha = hashlib.sha256()
+    source_dir = pathlib.Path(parse_fn.__code__.co_filename).resolve().parent
+    module_globals = parse_fn.__globals__
+    seen = set()
+
+    def visit_code(code: types.CodeType):
+        sha.update(code.co_code)
+        sha.update(repr(code.co_names).encode())
+        for const in code.co_consts:
+            if isinstance(const, types.CodeType):
+                visit_code(const)
+            else:
+                sha.update(repr(const).encode())
+        for name in code.co_names:
+            if name in module_globals and name not in seen:
+                seen.add(name)
+                visit_global(module_globals[name])
+
+    def visit_global(obj):
+        if isinstance(obj, types.FunctionType) and obj.__globals__ is module_globals:
+            visit_code(obj.__code__)
+        elif isinstance(obj, type) and obj.__module__ == module_globals.get('__name__'):
+            for attr in vars(obj).values():
+                visit_global(getattr(attr, '__func__', attr))
+        elif isinstance(obj, (int, float, str, bytes, tuple)):
+            sha.update(repr(obj).encode())
+        else:
+            module = sys.modules.get(getattr(obj, '__module__', None) or '') \
+                if not isinstance(obj, types.ModuleType) else obj
+            path = getattr(module, '__file__', None)
+            if path:
+                path = pathlib.Path(path).resolve()
+                if source_dir in path.parents or is_shared(path):
+                    sha.update(path.read_bytes())
+
+    visit_code(parse_fn.__code__)
+    return sha.hexdigest()
+
+def parse_key(input_digest: str, code_digest: str) -> str:
+    return digest(f"{input_digest}:{code_digest}:parse".encode())
+
+def _is_plain_array(value) -> bool:
+    return type(value).__name__ == 'ndarray' and type(value).__module__ == 'numpy' \
+        and not value.dtype.hasobject
+
+def load_parsed(key: str) -> typing.Any:
+    """The cached parse for `key`, or MISSING."""
+    base = CACHE_DIR / 'parsed' / key
+    try:
+        if base.with_suffix('.npy').exists():
+            import numpy as np
+            return np.load(base.with_suffix('.npy'))
+        if base.with_suffix('.npz').exists():
+            import numpy as np
+            with np.load(base.with_suffix('.npz')) as arrays:
+                names = sorted(arrays.files)
+                kind = list if names[0].startswith('list') else tuple
+                return kind(arrays[name] for name in names)
+        with open(base.with_suffix('.pickle'), 'rb') as infile:
+            return pickle.load(infile)
+    except (OSError, ValueError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return MISSING
+
+def store_parsed(key: str, parsed: typing.Any, data: bytes|None=None):
+    """Save a parse; `data` is its pickle if the caller already has one."""
+    base = CACHE_DIR / 'parsed' / key
+    if _is_plain_array(parsed):
+        import numpy as np
+        buffer = io.BytesIO()
+        np.save(buffer, parsed)
+        write_atomic(base.with_suffix('.npy'), buffer.getvalue())
+    elif isinstance(parsed, (list, tuple)) and parsed and all(map(_is_plain_array, parsed)):
+        import numpy as np
+        kind = 'list' if isinstance(parsed, list) else 'tuple'
+        buffer = io.BytesIO()
+        np.savez(buffer, **{f"{kind}_{i:04}": arr for i, arr in enumerate(parsed)})
+        write_atomic(base.with_suffix('.npz'), buffer.getvalue())
+    else:
+        if data is None:
+            data = dumps(parsed)
+        if data is not None:
+            write_atomic(base.with_suffix('.pickle'), data)
+
+def dumps(value: typing.Any) -> bytes|None:
+    """Pickle `value`, or None if it can't be."""
+    try:
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None
+
+def run_tests():
+    """Editing a shared helper that parse_input goes through changes parser_digest."""
+    import importlib.util
+    import tempfile
+
+    global SHARED_DIRS
+    saved_shared_dirs = SHARED_DIRS
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = pathlib.Path(tmp).resolve()
+        shared_dir, day_dir = tmp / 'common_patterns', tmp / 'py'
+        shared_dir.mkdir()
+        day_dir.mkdir()
+        helper = shared_dir / 'cache_test_grid.py'
+        helper.write_text("class Grid:\n"
+                          "    @classmethod\n"
+                          "    def from_input(cls, text):\n"
+                          "        return text.split()\n")
+        day = day_dir / 'day99.py'
+        day.write_text(f"import sys\n"
+                       f"sys.path.append({str(shared_dir)!r})\n"
+                       f"from cache_test_grid import Grid\n\n"
+                       f"def parse_input(text):\n"
+                       f"    return Grid.from_input(text)\n")
+        spec = importlib.util.spec_from_file_location('cache_test_day99', day)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        try:
+            SHARED_DIRS = (shared_dir,)
+            before = parser_digest(module.parse_input)
+            assert parser_digest(module.parse_input) == before, "digest isn't stable"
+            helper.write_text(helper.read_text().replace('text.split()', 'text.splitlines()'))
+            assert parser_digest(module.parse_input) != before, \
+                "editing a shared helper left the parse digest unchanged"
+        finally:
+            SHARED_DIRS = saved_shared_dirs
+            sys.modules.pop('cache_test_grid', None)
+            sys.path.remove(str(shared_dir))
+    print("Tests passed", file=sys.stderr)
+
+if __name__ == '__main__':
+    run_tests()
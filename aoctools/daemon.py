@@ -0,0 +1,316 @@
+"""
+A warm solver process, so re-running a day skips interpreter start and imports.
+
+Usage: python -m aoctools.daemon start|stop|status|serve [--socket PATH]
+       python -m aoctools.daemon run YEAR/DAY[/PART] ... [--repeat N] [--no-cache]
+                                 [--memory] [--timeout SECONDS] [--budget SECONDS]
+
+`start` launches the daemon in the background (`serve` runs it in the
+foreground). It preloads numpy, shapely, networkx and common_patterns, then
+listens on a Unix socket (AOC_SOCKET or a per-user file in the temp dir).
+
+`run` asks it to solve parts and prints the answers and timings. Each day
+module is imported once and kept; it is re-imported only when the script or
+one of the helper modules it uses has changed on disk. Every request runs in
+a fork of the daemon, so it starts warm but can't leave state behind (globals,
+functools caches) to skew the next run, and a crash or timeout only loses the
+fork. Requests are handled one at a time.
+
+Messages are one line of JSON each way.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import multiprocessing
+import os
+import pathlib
+import pkgutil
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, replace
+
+from aoctools import REPO_ROOT, cache
+from aoctools.discover import DaySpec, find_days, load_module
+from aoctools.run import PARTS, RunOptions, describe, make_row, part_budget, run_day
+
+SOCKET = pathlib.Path(os.environ.get('AOC_SOCKET') or
+                      pathlib.Path(tempfile.gettempdir()) / f"aoctools-{os.getuid()}.sock")
+PRELOAD = ('numpy', 'shapely', 'networkx')
+COMMON_PATTERNS_DIR = REPO_ROOT / '2022' / 'py'
+
+
+def preload() -> list[str]:
+    """Import the heavy modules up front; returns the ones that loaded."""
+    loaded = []
+    for name in PRELOAD:
+        try:
+            importlib.import_module(name)
+            loaded.append(name)
+        except ImportError:
+            pass
+    if str(COMMON_PATTERNS_DIR) not in sys.path:
+        sys.path.append(str(COMMON_PATTERNS_DIR))
+    with contextlib.suppress(ImportError):
+        package = importlib.import_module('common_patterns')
+        for info in pkgutil.iter_modules(package.__path__, 'common_patterns.'):
+            importlib.import_module(info.name)
+        loaded.append('common_patterns')
+    return loaded
+
+def file_stamps(paths: set[pathlib.Path]) -> dict[pathlib.Path, int]:
+    stamps = {}
+    for path in paths:
+        try:
+            stamps[path] = path.stat().st_mtime_ns
+        except OSError:
+            stamps[path] = -1
+    return stamps
+
+
+class ModuleCache:
+    """Day modules loaded so far, with the mtimes of the files each depends on."""
+
+    def __init__(self):
+        self.modules = {}  # script path -> (module, {path: mtime_ns})
+
+    def get(self, spec: DaySpec):
+        """The day's module, re-importing it (and stale helpers) if anything changed."""
+        entry = self.modules.get(spec.path)
+        if entry is not None:
+            module, stamps = entry
+            if file_stamps(set(stamps)) == stamps:
+                return module, False
+            self.evict_helpers(spec.path.parent, stamps)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            module = load_module(spec)
+        paths = {spec.path.resolve()} | cache.local_modules(spec.path.parent.resolve())
+        self.modules[spec.path] = (module, file_stamps(paths))
+        return module, True
+
+    @staticmethod
+    def evict_helpers(source_dir: pathlib.Path, stamps: dict[pathlib.Path, int]):
+        """Forget changed helper modules (and their packages) so they're imported afresh."""
+        changed = {path for path, stamp in file_stamps(set(stamps)).items()
+                   if stamp != stamps[path] and not path.name.startswith('day')}
+        if not changed:
+            return
+        changed_dirs = {path.parent for path in changed}
+        for name, module in list(sys.modules.items()):
+            path = getattr(module, '__file__', None)
+            if path is not None and pathlib.Path(path).resolve().parent in changed_dirs:
+                del sys.modules[name]
+
+
+def _solve(spec: DaySpec, options: RunOptions, module, conn):
+    try:
+        conn.send(run_day(spec, options, module))
+    except Exception as exc:
+        conn.send([make_row(spec, part, 'error', error=describe(exc)) for part in options.parts])
+    conn.close()
+
+def solve_forked(spec: DaySpec, options: RunOptions, module, timeout: float) -> list[dict]:
+    context = multiprocessing.get_context('fork')
+    recv_conn, send_conn = context.Pipe(duplex=False)
+    process = context.Process(target=_solve, args=(spec, options, module, send_conn))
+    process.start()
+    send_conn.close()
+    try:
+        if recv_conn.poll(timeout):
+            return recv_conn.recv()
+        status, error = 'timeout', f"exceeded {timeout:g} s"
+    except EOFError:
+        process.join()
+        status, error = 'error', f"worker exited with code {process.exitcode}"
+    finally:
+        process.terminate()
+        process.join()
+        recv_conn.close()
+    return [make_row(spec, part, status, error=error) for part in options.parts]
+
+
+class Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            response = self.server.dispatch(request)
+        except Exception as exc:
+            response = {'error': describe(exc)}
+        self.wfile.write(json.dumps(response).encode() + b'\n')
+
+
+class Daemon(socketserver.UnixStreamServer):
+    def __init__(self, socket_path: pathlib.Path):
+        self.started = time.time()
+        self.preloaded = preload()
+        self.modules = ModuleCache()
+        self.socket_path = socket_path
+        self.stopping = False
+        with contextlib.suppress(FileNotFoundError):
+            socket_path.unlink()
+        super().__init__(str(socket_path), Handler)
+
+    def dispatch(self, request: dict) -> dict:
+        command = request.get('command')
+        if command == 'run':
+            return self.run(request)
+        if command == 'status':
+            return {'pid': os.getpid(), 'uptime_s': round(time.time() - self.started, 1),
+                    'preloaded': self.preloaded,
+                    'modules': sorted(str(path.relative_to(REPO_ROOT))
+                                      for path in self.modules.modules)}
+        if command == 'stop':
+            self.stopping = True
+            return {'stopped': os.getpid()}
+        return {'error': f"unknown command {command!r}"}
+
+    def run(self, request: dict) -> dict:
+        options = RunOptions(**request.get('options', {}))
+        timeout = request.get('timeout', 300)
+        targets = []
+        for year, day, parts in request['targets']:
+            specs = find_days([year], {day})
+            if not specs:
+                return {'error': f"no such day: {year} day {day}"}
+            targets.append((specs[0], parts))
+
+        rows, reloaded = [], []
+        for spec, parts in targets:
+            day_options = replace(options, parts=tuple(parts or PARTS))
+            if not spec.runnable:
+                rows.extend(make_row(spec, part, 'skipped') for part in day_options.parts)
+                continue
+            if not spec.input_path.exists():
+                rows.extend(make_row(spec, part, 'missing-input') for part in day_options.parts)
+                continue
+            try:
+                module, fresh = self.modules.get(spec)
+            except Exception as exc:
+                rows.extend(make_row(spec, part, 'error', error=describe(exc))
+                            for part in day_options.parts)
+                continue
+            if fresh:
+                reloaded.append(spec.name)
+            rows.extend(solve_forked(spec, day_options, module, timeout))
+        return {'rows': rows, 'reloaded': reloaded}
+
+    def server_close(self):
+        super().server_close()
+        with contextlib.suppress(FileNotFoundError):
+            self.socket_path.unlink()
+
+
+def serve(socket_path: pathlib.Path=SOCKET):
+    with Daemon(socket_path) as daemon:
+        print(f"aoctools daemon {os.getpid()} listening on {socket_path} "
+              f"(preloaded {', '.join(daemon.preloaded) or 'nothing'})", file=sys.stderr)
+        with contextlib.suppress(KeyboardInterrupt):
+            while not daemon.stopping:
+                daemon.handle_request()
+
+def request(message: dict, socket_path: pathlib.Path=SOCKET) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(socket_path))
+        client.sendall(json.dumps(message).encode() + b'\n')
+        with client.makefile('rb') as reply:
+            return json.loads(reply.readline())
+
+def start(socket_path: pathlib.Path=SOCKET, wait: float=30) -> int:
+    """Launch `serve` in the background and wait until it answers."""
+    with contextlib.suppress(OSError):
+        return request({'command': 'status'}, socket_path)['pid']
+    subprocess.Popen([sys.executable, '-m', 'aoctools.daemon', 'serve', '--socket', str(socket_path)],
+                     cwd=REPO_ROOT, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                     stderr=subprocess.DEVNULL, start_new_session=True)
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        with contextlib.suppress(OSError):
+            return request({'command': 'status'}, socket_path)['pid']
+    raise TimeoutError(f"daemon didn't come up on {socket_path}")
+
+def parse_target(text: str) -> tuple[int, int, list[str]]:
+    year, day, *part = text.split('/')
+    if part and part[0] not in PARTS:
+        raise argparse.ArgumentTypeError(f"bad part in {text!r}")
+    return int(year), int(day), part
+
+def format_row(row: dict) -> str:
+    name = f"{row['year']} day{row['day']:02} part {row['part']}"
+    if row['status'] in ('ok', 'regression') and row['cached']:
+        text = f"{name}: {row['answer']}  (cached)"
+    elif row['status'] in ('ok', 'regression'):
+        timing = f"{row['ms']:.1f} ms" if row['runs'] == 1 else \
+            f"min {row['min_ms']:.1f} / median {row['ms']:.1f} / p95 {row['p95_ms']:.1f} ms"
+        text = f"{name}: {row['answer']}  (parse {row['parse_ms']:.1f} ms, {timing})"
+        if row['peak_rss_kb'] is not None:
+            text += f"  peak RSS {row['peak_rss_kb']/1024:.1f} MiB"
+    else:
+        return f"{name}: {row['status']}  {row['error'] or ''}".rstrip()
+    return text + ("  ** Regression **" if row['status'] == 'regression' else '')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Warm solver daemon and its client.")
+    parser.add_argument('command', choices=('start', 'stop', 'status', 'serve', 'run'))
+    parser.add_argument('targets', nargs='*', type=parse_target, metavar='YEAR/DAY[/PART]')
+    parser.add_argument('--socket', type=pathlib.Path, default=SOCKET)
+    parser.add_argument('--repeat', type=int, default=1, help="runs per part")
+    parser.add_argument('--no-cache', dest='use_cache', action='store_false',
+                        help="solve even if the answer is cached")
+    parser.add_argument('--memory', action='store_true', help="also measure peak memory")
+    parser.add_argument('--timeout', type=float, default=300, help="seconds allowed per day")
+    parser.add_argument('--budget', type=float,
+                        help="seconds allowed per part (default: half the timeout)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        serve(args.socket)
+        return 0
+    if args.command == 'start':
+        print(f"daemon running as pid {start(args.socket)}")
+        return 0
+    if args.command == 'run' and not args.targets:
+        parser.error("run needs at least one YEAR/DAY[/PART]")
+
+    message = {'command': args.command}
+    if args.command == 'run':
+        options = RunOptions(repeat=max(1, args.repeat), use_cache=args.use_cache,
+                             memory=args.memory, budget=part_budget(args))
+        message.update(targets=args.targets, timeout=args.timeout,
+                       options={key: value for key, value in asdict(options).items()
+                                if key != 'parts'})
+    try:
+        start_time = time.perf_counter()
+        response = request(message, args.socket)
+        round_trip_ms = (time.perf_counter() - start_time) * 1000
+    except OSError:
+        if args.command == 'stop':
+            return 0
+        print(f"no daemon on {args.socket}; start one with "
+              f"`python -m aoctools.daemon start`", file=sys.stderr)
+        return 1
+
+    if 'error' in response:
+        print(response['error'], file=sys.stderr)
+        return 1
+    if args.command != 'run':
+        print(json.dumps(response, indent=2))
+        return 0
+    if response['reloaded']:
+        print(f"(imported {', '.join(response['reloaded'])})", file=sys.stderr)
+    for row in response['rows']:
+        print(format_row(row))
+    print(f"({round_trip_ms:.0f} ms round trip)", file=sys.stderr)
+    return 1 if any(row['status'] in ('error', 'timeout', 'regression')
+                    for row in response['rows']) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+Find the day modules in the repo and work out how to drive them.
+
+Only days that follow the `parse_input(data_src)` -> `part1`/`part2` template
+convention can be run from the outside; the 2019 and 2020 scripts (and a few
+one-offs) predate it and are reported as skipped.
+"""
+from __future__ import annotations
+
+import ast
+import importlib.util
+import pathlib
+import re
+import sys
+from dataclasses import dataclass, field
+from types import ModuleType
+
+from aoctools import REPO_ROOT
+
+DAY_FILE = re.compile(r'day(\d+)\.py$')
+PART_COMMENT = re.compile(r'Part (\d)\b.*#\s*(\S.*?)\s*$')
+
+
+@dataclass(frozen=True)
+class DaySpec:
+    year: int
+    day: int
+    path: pathlib.Path
+    runnable: bool
+    splat: bool = False  # parse_input returns [item, ...] for *parse_input
+    expected: dict[str, str] = field(default_factory=dict, compare=False)
+
+    @property
+    def input_path(self) -> pathlib.Path:
+        return self.path.with_name(self.path.stem + '-input.dat')
+
+    @property
+    def name(self) -> str:
+        return f"{self.year} day{self.day:02}"
+
+
+def find_days(years=None, days=None, root=REPO_ROOT) -> list[DaySpec]:
+    specs = []
+    for path in sorted(root.glob('20[0-9][0-9]/py/day*.py')):
+        match = DAY_FILE.fullmatch(path.name)
+        if not match:
+            continue  # e.g. day08-optimized.py
+        year, day = int(path.parent.parent.name), int(match[1])
+        if years and year not in years or days and day not in days:
+            continue
+        specs.append(inspect_day(year, day, path))
+    return specs
+
+def inspect_day(year: int, day: int, path: pathlib.Path) -> DaySpec:
+    source = path.read_text()
+    runnable = (
+        re.search(r'^def part1\(', source, re.MULTILINE) is not None and
+        'parse_input(infile)' in source
+    )
+    splat = (
+        '*parse_input(infile)' in source or
+        re.search(r'^\s*\w+(, \w+)+ = parse_input\(infile\)', source, re.MULTILINE) is not None
+    )
+    return DaySpec(year, day, path, runnable, splat, expected_answers(source))
+
+def expected_answers(source: str) -> dict[str, str]:
+    """
+    Recover the known answers recorded in a day's source, either as the
+    `expected=` argument to `solve_part` or as the trailing `# answer` comment
+    on the line that prints a part.
+    """
+    lines = source.splitlines()
+    expected = {}
+
+    for node in ast.walk(ast.parse(source)):
+        if not (
+            isinstance(node, ast.Call) and
+            getattr(node.func, 'id', None) in ('solve_part', 'print_result') and
+            node.args and isinstance(node.args[0], ast.Constant) and
+            isinstance(node.args[0].value, str) and node.args[0].value[:1].isdigit()
+        ):
+            continue
+        part = node.args[0].value.split()[0]
+        answer = None
+        for kw in node.keywords:
+            if kw.arg == 'expected' and isinstance(kw.value, ast.Constant):
+                answer = kw.value.value
+        if answer is None:
+            comment = lines[node.end_lineno-1][node.end_col_offset:].partition('#')[2].strip()
+            answer = comment or None
+        if answer is not None and answer != '-':
+            expected.setdefault(part, str(answer))
+
+    for line in lines:
+        if match := PART_COMMENT.search(line):
+            expected.setdefault(match[1], match[2])
+
+    return expected
+
+def sibling_scripts(spec: DaySpec) -> list[pathlib.Path]:
+    """Alternative versions of a day kept next to it, e.g. day08-optimized.py."""
+    return sorted(spec.path.parent.glob(f"{spec.path.stem}-*.py"))
+
+def load_module(spec: DaySpec) -> ModuleType:
+    """Import a day script under a unique module name, as its own script dir would."""
+    module_dir = str(spec.path.parent)
+    if module_dir not in sys.path:
+        sys.path.insert(0, module_dir)
+    name = f"aoc{spec.year}_day{spec.day:02}"
+    if variant := spec.path.stem.partition('-')[2]:
+        name += '_' + re.sub(r'\W', '_', variant)
+    module_spec = importlib.util.spec_from_file_location(name, spec.path)
+    module = importlib.util.module_from_spec(module_spec)
+    sys.modules[name] = module
+    module_spec.loader.exec_module(module)
+    return module
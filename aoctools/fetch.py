@@ -0,0 +1,294 @@
+"""
+Fetch puzzle inputs in bulk.
+
+Usage: python -m aoctools.fetch [--years 2023 2024] [--days 1-5,9] [--jobs 4]
+                                [--cookie session.cookie] [--force] [--self-test]
+
+The bulk version of the per-year get-input.py scripts: every requested day is
+fetched over one pooled requests.Session with at most --jobs requests in
+flight, failed requests (connection errors, 429 and 5xx) are retried with
+backoff, and each input is written atomically to dayNN-input.dat next to that
+year's solutions. Days not yet released are left out.
+
+Inputs already fetched are skipped using a manifest (.aoc-cache/inputs.json)
+of each file's size and sha256; a file on disk that isn't in the manifest is
+adopted as-is, and one that no longer matches its entry is fetched again.
+--force fetches everything regardless.
+
+The session cookie is read from the same session.cookie json as get-input.py,
+looked for in the current directory, the repo root and each year's directory.
+
+--self-test runs the fetcher against a local stand-in server instead (no
+cookie or network needed), checking concurrency, retries and skipping.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import pathlib
+import sys
+import threading
+import time
+import typing
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+
+from aoctools import REPO_ROOT, cache
+from aoctools.run import parse_days
+
+BASE_URL = 'https://adventofcode.com'
+MANIFEST = cache.CACHE_DIR / 'inputs.json'
+USER_AGENT = os.environ.get('AOC_USER_AGENT', 'aoctools.fetch (python-requests)')
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+@dataclass(frozen=True)
+class Target:
+    year: int
+    day: int
+    path: pathlib.Path
+
+def input_dir(year: int, root: pathlib.Path=REPO_ROOT) -> pathlib.Path|None:
+    """Where a year's inputs go: its py/ directory, or the one with get-input.py."""
+    if (root / str(year) / 'py').is_dir():
+        return root / str(year) / 'py'
+    script = next((root / str(year)).glob('*/get-input.py'), None)
+    return script.parent if script else None
+
+def puzzle_days(year: int) -> range:
+    return range(1, 13 if year >= 2025 else 26)
+
+def released(year: int, day: int) -> bool:
+    import zoneinfo
+    # puzzles are released at midnight EST
+    today = datetime.datetime.now(zoneinfo.ZoneInfo('America/New_York'))
+    return (year, 12, day) <= (today.year, today.month, today.day)
+
+def find_targets(years: list[int]|None=None, days: set[int]|None=None,
+                 root: pathlib.Path=REPO_ROOT) -> list[Target]:
+    if years is None:
+        years = sorted(int(path.name) for path in root.glob('20[0-9][0-9]') if path.is_dir())
+    targets = []
+    for year in years:
+        directory = input_dir(year, root)
+        if directory is None:
+            continue
+        for day in puzzle_days(year):
+            if (days is None or day in days) and released(year, day):
+                targets.append(Target(year, day, directory / f"day{day:02}-input.dat"))
+    return targets
+
+def find_cookie(years: typing.Iterable[int]=()) -> pathlib.Path|None:
+    candidates = [pathlib.Path('session.cookie'), REPO_ROOT / 'session.cookie']
+    candidates += [directory / 'session.cookie' for directory in map(input_dir, years)
+                   if directory is not None]
+    return next((path for path in candidates if path.exists()), None)
+
+def load_manifest(path: pathlib.Path=MANIFEST) -> dict[str, dict]:
+    try:
+        with open(path) as infile:
+            return json.load(infile)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest: dict[str, dict], path: pathlib.Path=MANIFEST):
+    data = json.dumps(dict(sorted(manifest.items())), indent=2) + '\n'
+    cache.write_atomic(path, data.encode())
+
+def manifest_entry(data: bytes) -> dict:
+    return {'size': len(data), 'sha256': hashlib.sha256(data).hexdigest()}
+
+def up_to_date(target: Target, manifest: dict[str, dict], force: bool) -> bool:
+    """Whether `target` can be skipped, adopting an unlisted file into the manifest."""
+    if force or not target.path.exists():
+        return False
+    key = str(target.path)
+    entry = manifest.get(key)
+    if entry is None:
+        manifest[key] = manifest_entry(target.path.read_bytes())
+        return True
+    return target.path.stat().st_size == entry['size'] and \
+        cache.file_digest(target.path) == entry['sha256']
+
+def make_session(cookies: dict[str, str], jobs: int, retries: int=4, backoff: float=0.5):
+    """A requests.Session with a connection pool of `jobs` and retries on transient errors."""
+    import requests
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.cookies.update(cookies)
+    session.headers['User-Agent'] = USER_AGENT
+    retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=RETRY_STATUSES,
+                  allowed_methods=('GET',), respect_retry_after_header=True)
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=jobs,
+                                            max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def fetch_one(session, target: Target, base_url: str, timeout: float) -> bytes:
+    response = session.get(f"{base_url}/{target.year}/day/{target.day}/input", timeout=timeout)
+    response.raise_for_status()
+    cache.write_atomic(target.path, response.content)
+    return response.content
+
+def fetch_all(targets: list[Target], session, jobs: int=4, base_url: str=BASE_URL,
+              manifest_path: pathlib.Path=MANIFEST, force: bool=False,
+              timeout: float=30) -> dict[str, list]:
+    """
+    Fetch every target that isn't up to date, `jobs` at a time. Returns the
+    targets grouped as 'fetched', 'skipped' and 'failed' (as (target, error)).
+    """
+    manifest = load_manifest(manifest_path)
+    results = {'fetched': [], 'skipped': [], 'failed': []}
+    pending = []
+    for target in targets:
+        if up_to_date(target, manifest, force):
+            results['skipped'].append(target)
+        else:
+            pending.append(target)
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = {pool.submit(fetch_one, session, target, base_url, timeout): target
+                   for target in pending}
+        for future in as_completed(futures):
+            target = futures[future]
+            try:
+                data = future.result()
+            except Exception as exc:
+                results['failed'].append((target, f"{type(exc).__name__}: {exc}"))
+            else:
+                manifest[str(target.path)] = manifest_entry(data)
+                results['fetched'].append(target)
+
+    save_manifest(manifest, manifest_path)
+    order = {target: i for i, target in enumerate(targets)}
+    results['fetched'].sort(key=order.get)
+    results['failed'].sort(key=lambda failure: order[failure[0]])
+    return results
+
+def report(results: dict[str, list], elapsed: float):
+    for target, error in results['failed']:
+        print(f"{target.year} day{target.day:02}: {error}", file=sys.stderr)
+    size = sum(target.path.stat().st_size for target in results['fetched'])
+    rate = len(results['fetched']) / elapsed if elapsed else 0
+    print(f"fetched {len(results['fetched'])} ({size/1024:.1f} KiB, {rate:.1f}/s), "
+          f"skipped {len(results['skipped'])}, failed {len(results['failed'])} "
+          f"in {elapsed:.2f} s", file=sys.stderr)
+
+def run_tests():
+    """Fetch from a local stand-in server that is slow, flaky and checks the cookie."""
+    import http.server
+    import tempfile
+
+    delay = 0.05
+    lock = threading.Lock()
+    hits = {}
+    in_flight = peak_in_flight = 0
+
+    class StandIn(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            nonlocal in_flight, peak_in_flight
+            with lock:
+                hits[self.path] = hits.get(self.path, 0) + 1
+                first_try = hits[self.path] == 1
+                in_flight += 1
+                peak_in_flight = max(peak_in_flight, in_flight)
+            time.sleep(delay)
+            with lock:
+                in_flight -= 1
+            if 'session=test-session' not in self.headers.get('Cookie', ''):
+                status, body = 400, b"Puzzle inputs differ by user.  Please log in.\n"
+            elif first_try and self.path.endswith(('/1/input', '/3/input')):
+                status, body = 503, b"try again\n"
+            else:
+                year, _, day, _ = self.path.strip('/').split('/')
+                status, body = 200, f"{year} {day}\n".encode() * 100
+            self.send_response(status)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    jobs = 4
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = pathlib.Path(tmp)
+            manifest_path = tmp / 'inputs.json'
+            targets = [Target(year, day, tmp / str(year) / f"day{day:02}-input.dat")
+                       for year in (2023, 2024) for day in range(1, 9)]
+            session = make_session({'session': 'test-session'}, jobs, backoff=0.01)
+
+            start = time.perf_counter()
+            results = fetch_all(targets, session, jobs, base_url, manifest_path)
+            elapsed = time.perf_counter() - start
+            report(results, elapsed)
+            assert not results['failed'], results['failed']
+            assert len(results['fetched']) == len(targets)
+            for target in targets:
+                expected = f"{target.year} {target.day}\n".encode() * 100
+                assert target.path.read_bytes() == expected, target
+            assert hits["/2023/day/1/input"] == 2 and hits["/2024/day/3/input"] == 2, \
+                "first attempts at days 1 and 3 should have been retried"
+            assert 1 < peak_in_flight <= jobs, peak_in_flight
+            assert elapsed < len(targets) * delay, "requests didn't overlap"
+            assert not list(tmp.rglob('*.tmp')), "temporary files left behind"
+
+            requests_before = sum(hits.values())
+            results = fetch_all(targets, session, jobs, base_url, manifest_path)
+            assert len(results['skipped']) == len(targets)
+            assert sum(hits.values()) == requests_before, "up-to-date inputs were fetched"
+
+            targets[0].path.write_bytes(b"truncated")
+            results = fetch_all(targets, session, jobs, base_url, manifest_path)
+            assert results['fetched'] == [targets[0]]
+
+            session.cookies.clear()
+            results = fetch_all(targets[:1], session, jobs, base_url, manifest_path, force=True)
+            assert [target for target, _ in results['failed']] == targets[:1]
+    finally:
+        server.shutdown()
+        server.server_close()
+    print("Tests passed", file=sys.stderr)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch puzzle inputs in bulk.")
+    parser.add_argument('--years', type=int, nargs='+', help="default: every year")
+    parser.add_argument('--days', type=parse_days, help="e.g. 1-5,9 (default: every day)")
+    parser.add_argument('--jobs', type=int, default=4, help="concurrent requests")
+    parser.add_argument('--cookie', type=pathlib.Path, help="session.cookie json file")
+    parser.add_argument('--base-url', default=BASE_URL, help=argparse.SUPPRESS)
+    parser.add_argument('--force', action='store_true', help="fetch even up-to-date inputs")
+    parser.add_argument('--self-test', action='store_true',
+                        help="test against a local stand-in server and exit")
+    args = parser.parse_args(argv)
+
+    if args.self_test:
+        run_tests()
+        return 0
+
+    targets = find_targets(args.years, args.days)
+    cookie_path = args.cookie or find_cookie(sorted({target.year for target in targets}))
+    if cookie_path is None:
+        parser.error("no session.cookie found; pass --cookie")
+    with open(cookie_path) as cookie_file:
+        cookies = json.load(cookie_file)
+
+    session = make_session(cookies, max(1, args.jobs))
+    start = time.perf_counter()
+    results = fetch_all(targets, session, args.jobs, args.base_url.rstrip('/'), force=args.force)
+    report(results, time.perf_counter() - start)
+    return 1 if results['failed'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""
+Synthetic puzzle inputs at any multiple of a real input's size.
+
+Real inputs are too small to show how a solver scales, so each supported day
+has a generator that writes a valid input with `scale` times as many items as
+the real one (cells of a grid, lines of a list, nodes of a graph, ranges,
+points). Generators are deterministic for a given year, day, scale and seed.
+
+    >>> text = generate(2024, 6, scale=10)
+
+aoctools.scaling runs the solvers on them.
+"""
+from __future__ import annotations
+
+import math
+import random
+import typing
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Generator:
+    year: int
+    day: int
+    kind: str
+    make: typing.Callable[[float, random.Random], str]
+
+GENERATORS: dict[tuple[int, int], Generator] = {}
+
+
+def generator(year: int, day: int, kind: str) -> typing.Callable:
+    """Register `make(scale, rng) -> str` as the input generator for a day."""
+    def register(make):
+        GENERATORS[year, day] = Generator(year, day, kind, make)
+        return make
+    return register
+
+def generate(year: int, day: int, scale: float=1, seed: int=0) -> str:
+    rng = random.Random(f"{year}/{day}/{scale}/{seed}")
+    return GENERATORS[year, day].make(scale, rng)
+
+def count(base: int, scale: float) -> int:
+    """Number of items in an input `scale` times the size of one with `base`."""
+    return max(1, round(base * scale))
+
+def side(base: int, scale: float) -> int:
+    """Side of a square grid with `scale` times the cells of a `base` square."""
+    return max(3, round(base * math.sqrt(scale)))
+
+def render(grid: list[list[str]]) -> str:
+    return '\n'.join(map(''.join, grid)) + '\n'
+
+
+from aoctools.generators import graphs, grids, numbers, points, ranges  # registers generators
@@ -0,0 +1,38 @@
+"""Graph edge lists."""
+from __future__ import annotations
+
+import math
+import random
+import string
+
+from aoctools.generators import count, generator
+
+
+def node_names(n: int, rng: random.Random) -> list[str]:
+    """`n` distinct lowercase names, two letters long like the real ones if they fit."""
+    length = max(2, math.ceil(math.log(n, 26)))
+    names = []
+    for number in rng.sample(range(26 ** length), n):
+        name = ''
+        for _ in range(length):
+            number, letter = divmod(number, 26)
+            name += string.ascii_lowercase[letter]
+        names.append(name)
+    return names
+
+@generator(2024, 23, 'graph')
+def lan_links(scale: float, rng: random.Random) -> str:
+    # roughly degree 13 everywhere, plus one planted 13-clique
+    names = node_names(count(520, scale), rng)
+    links = set()
+    for a in names:
+        for b in rng.sample(names, min(7, len(names))):
+            if a != b:
+                links.add(tuple(sorted((a, b))))
+    clique = rng.sample(names, min(13, len(names)))
+    for i, a in enumerate(clique):
+        for b in clique[i+1:]:
+            links.add(tuple(sorted((a, b))))
+    links = [rng.sample(link, 2) for link in sorted(links)]
+    rng.shuffle(links)
+    return ''.join(f"{a}-{b}\n" for a, b in links)
@@ -0,0 +1,78 @@
+"""Character and digit grids."""
+from __future__ import annotations
+
+import random
+from collections import deque
+
+from aoctools.generators import generator, render, side
+
+
+def _patrol_trap(grid: list[list[str]], row: int, col: int) -> tuple[int, int]|None:
+    """The last obstacle the guard bumps into before looping, or None if they leave."""
+    rows, cols = len(grid), len(grid[0])
+    dr, dc = -1, 0
+    seen = set()
+    obstacle = None
+    while (row, col, dr, dc) not in seen:
+        seen.add((row, col, dr, dc))
+        r, c = row + dr, col + dc
+        if not (0 <= r < rows and 0 <= c < cols):
+            return None
+        if grid[r][c] == '#':
+            dr, dc = dc, -dr
+            obstacle = r, c
+        else:
+            row, col = r, c
+    return obstacle
+
+@generator(2024, 6, 'grid')
+def patrol_map(scale: float, rng: random.Random) -> str:
+    n = side(130, scale)
+    grid = [['#' if rng.random() < 0.06 else '.' for _ in range(n)] for _ in range(n)]
+    row, col = rng.randrange(n // 4, 3 * n // 4), rng.randrange(n // 4, 3 * n // 4)
+    grid[row][col] = '^'
+    # the guard has to walk off the map for part 1, so break up any loop they get stuck in
+    while (trap := _patrol_trap(grid, row, col)) is not None:
+        grid[trap[0]][trap[1]] = '.'
+    return render(grid)
+
+@generator(2024, 10, 'digit grid')
+def topographic_map(scale: float, rng: random.Random) -> str:
+    # diamond-shaped hills falling away one step per cell from random 9s, so
+    # there are plenty of 0..9 trails, with a few cells knocked out of place
+    n = side(50, scale)
+    heights = [[0] * n for _ in range(n)]
+    frontier = deque()
+    for _ in range(max(1, n * n // 120)):
+        row, col = rng.randrange(n), rng.randrange(n)
+        heights[row][col] = 9
+        frontier.append((row, col))
+    while frontier:
+        row, col = frontier.popleft()
+        for r, c in ((row-1, col), (row+1, col), (row, col-1), (row, col+1)):
+            if 0 <= r < n and 0 <= c < n and heights[r][c] < heights[row][col] - 1:
+                heights[r][c] = heights[row][col] - 1
+                frontier.append((r, c))
+    for _ in range(n * n // 20):
+        heights[rng.randrange(n)][rng.randrange(n)] = rng.randrange(10)
+    return render([[str(height) for height in row] for row in heights])
+
+@generator(2025, 4, 'grid')
+def paper_rolls(scale: float, rng: random.Random) -> str:
+    n = side(137, scale)
+    return render([['@' if rng.random() < 0.6 else '.' for _ in range(n)] for _ in range(n)])
+
+@generator(2025, 7, 'grid')
+def tachyon_manifold(scale: float, rng: random.Random) -> str:
+    n = side(141, scale) | 1  # odd, so the start is centred
+    mid = n // 2
+    grid = [['.'] * n for _ in range(2)]
+    grid[0][mid] = 'S'
+    # splitters on every other row, fanning out one column per side each time
+    for k in range(mid):
+        splitters = ['.'] * n
+        for col in range(mid - k, mid + k + 1, 2):
+            if k == 0 or rng.random() < 0.8:
+                splitters[col] = '^'
+        grid += [splitters, ['.'] * n]
+    return render(grid)
@@ -0,0 +1,38 @@
+"""Number lists."""
+from __future__ import annotations
+
+import random
+
+from aoctools.generators import count, generator
+
+
+@generator(2024, 1, 'number list')
+def location_lists(scale: float, rng: random.Random) -> str:
+    n = count(1000, scale)
+    left = [rng.randrange(10000, 100000) for _ in range(n)]
+    # about half the right list repeats ids from the left, for the similarity score
+    right = [rng.choice(left) if rng.random() < 0.5 else rng.randrange(10000, 100000)
+             for _ in range(n)]
+    return ''.join(f"{a}   {b}\n" for a, b in zip(left, right))
+
+@generator(2024, 2, 'number list')
+def reports(scale: float, rng: random.Random) -> str:
+    lines = []
+    for _ in range(count(1000, scale)):
+        step = rng.choice((-1, 1))
+        levels = [rng.randrange(10, 90)]
+        for _ in range(rng.randrange(4, 8)):
+            levels.append(levels[-1] + step * rng.randrange(1, 4))
+        if rng.random() < 0.6:  # make it unsafe, or safe only with the dampener
+            levels[rng.randrange(len(levels))] += rng.choice((-4, -1, 0, 2, 5))
+        lines.append(' '.join(map(str, levels)))
+    return '\n'.join(lines) + '\n'
+
+@generator(2024, 22, 'number list')
+def secrets(scale: float, rng: random.Random) -> str:
+    return ''.join(f"{rng.randrange(1, 1 << 24)}\n" for _ in range(count(2400, scale)))
+
+@generator(2025, 3, 'number list')
+def battery_banks(scale: float, rng: random.Random) -> str:
+    return ''.join(''.join(rng.choices('123456789', k=100)) + '\n'
+                   for _ in range(count(200, scale)))
@@ -0,0 +1,36 @@
+"""Point lists."""
+from __future__ import annotations
+
+import math
+import random
+
+from aoctools.generators import count, generator
+
+
+@generator(2025, 8, 'points')
+def junction_boxes(scale: float, rng: random.Random) -> str:
+    n = count(1000, scale)
+    boxes = set()
+    while len(boxes) < n:
+        boxes.add((rng.randrange(100000), rng.randrange(100000), rng.randrange(100000)))
+    boxes = list(boxes)
+    rng.shuffle(boxes)
+    return ''.join(f"{x},{y},{z}\n" for x, y, z in boxes)
+
+@generator(2025, 9, 'points')
+def red_tiles(scale: float, rng: random.Random) -> str:
+    # corners of a rectilinear polygon: a staircase around a jittered circle,
+    # each step going across then down/up so consecutive corners share a row or column
+    steps = count(248, scale)
+    angles = sorted(rng.uniform(0, math.tau) for _ in range(steps))
+    radius = 48000
+    circle = [(round(50000 + radius * math.cos(a)), round(50000 + radius * math.sin(a)))
+              for a in angles]
+    corners = []
+    for (x1, y1), (x2, _) in zip(circle, circle[1:] + circle[:1]):
+        for corner in ((x1, y1), (x2, y1)):
+            if not corners or corner != corners[-1]:
+                corners.append(corner)
+    while len(corners) > 1 and corners[-1] == corners[0]:
+        corners.pop()
+    return ''.join(f"{x},{y}\n" for x, y in corners)
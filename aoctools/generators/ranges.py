@@ -0,0 +1,41 @@
+"""Range lists."""
+from __future__ import annotations
+
+import random
+
+from aoctools.generators import count, generator
+
+
+@generator(2025, 2, 'range list')
+def product_id_ranges(scale: float, rng: random.Random) -> str:
+    # disjoint ranges of 1-10 digit ids, some crossing a power of ten
+    ranges = []
+    for _ in range(count(35, scale) * 4):
+        digits = rng.randrange(1, 11)
+        start = rng.randrange(10 ** (digits - 1), 10 ** digits)
+        end = start + rng.randrange(1, max(2, min(10 ** digits // 10, 200_000)))
+        ranges.append((start, end))
+    ranges.sort()
+    disjoint = []
+    for start, end in ranges:
+        if not disjoint or start > disjoint[-1][1]:
+            disjoint.append((start, end))
+    disjoint = rng.sample(disjoint, min(len(disjoint), count(35, scale)))
+    return ','.join(f"{start}-{end}" for start, end in disjoint) + '\n'
+
+@generator(2025, 5, 'range list')
+def ingredient_ranges(scale: float, rng: random.Random) -> str:
+    # heavily overlapping ranges of large ids, then ids that fall in them about half the time
+    fresh = []
+    for _ in range(count(180, scale)):
+        start = rng.randrange(10 ** 12, 6 * 10 ** 14)
+        fresh.append((start, start + rng.randrange(10 ** 10, 10 ** 13)))
+    ingredients = []
+    for _ in range(count(1000, scale)):
+        if rng.random() < 0.5:
+            start, end = rng.choice(fresh)
+            ingredients.append(rng.randrange(start, end + 1))
+        else:
+            ingredients.append(rng.randrange(10 ** 12, 6 * 10 ** 14))
+    return ''.join(f"{start}-{end}\n" for start, end in fresh) + '\n' + \
+        ''.join(f"{ingredient}\n" for ingredient in ingredients)
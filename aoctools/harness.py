@@ -0,0 +1,241 @@
+"""
+The timing harness behind the templates' `solve_part`.
+
+Environment variables change how a part is run without editing the script:
+    AOC_REPEAT=N      run the part N times and report min/median/p95 ms
+    AOC_NO_CACHE=1    always solve, ignoring answers cached for this input/code
+    AOC_PROFILE=MODE  profile the part with cprofile, sample or line and write
+                      the result under profiles/ (see aoctools.profiling)
+    AOC_MEMORY=1      also report the part's peak RSS and tracemalloc peak,
+                      measured on an extra untimed run (see aoctools.memory)
+    AOC_MMAP=1        have `open_input` memory-map the input (see aoctools.mapped)
+    AOC_CONCURRENT=1  have `run_steps` run main()'s test checks and parts side by
+                      side in forked workers
+
+Answers for the real input are cached (see aoctools.cache) unless repeating,
+profiling or measuring memory,
+and `cached_parse` makes `parse_input` run once per distinct input.
+"""
+from __future__ import annotations
+
+import contextlib
+import copy
+import functools
+import io
+import math
+import os
+import pickle
+import sys
+import time
+import typing
+
+from aoctools import cache
+from aoctools.mapped import MappedInput
+
+REPEAT = int(os.environ.get('AOC_REPEAT', 1))
+USE_CACHE = os.environ.get('AOC_NO_CACHE', '') in ('', '0')
+PROFILE = os.environ.get('AOC_PROFILE', '')
+MEMORY = os.environ.get('AOC_MEMORY', '') not in ('', '0')
+MMAP = os.environ.get('AOC_MMAP', '') not in ('', '0')
+CONCURRENT = os.environ.get('AOC_CONCURRENT', '') not in ('', '0')
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """min/median/p95 (nearest rank) of a list of timings, in ms."""
+    ordered = sorted(samples)
+    mid = len(ordered) // 2
+    median = ordered[mid] if len(ordered) % 2 else (ordered[mid-1] + ordered[mid]) / 2
+    p95 = ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+    return {
+        'min_ms': round(ordered[0] * 1000, 3),
+        'ms': round(median * 1000, 3),
+        'p95_ms': round(p95 * 1000, 3),
+    }
+
+def time_part(part_fn: typing.Callable, args: tuple, repeat: int=1) -> tuple[typing.Any, list[float]]:
+    """
+    Run a part `repeat` times, returning the first result and every timing in
+    seconds. Each extra run gets its own copy of the arguments, since some
+    parts consume their parsed input.
+    """
+    samples = []
+    result = None
+    for run in range(repeat):
+        run_args = args if run == repeat - 1 else copy.deepcopy(args)
+        start = time.perf_counter()
+        run_result = part_fn(*run_args)
+        end = time.perf_counter()
+        samples.append(end - start)
+        if run == 0:
+            result = run_result
+    return result, samples
+
+def cached_parse(parse_fn: typing.Callable=None, *, copy: bool|None=False) -> typing.Callable:
+    """
+    Decorator for `parse_input` so each distinct input is parsed only once.
+    Later calls with the same content get the same parsed object back, or a
+    fresh copy of it with `copy=True` for days whose parts modify their input.
+    With `copy=None` they get the same object until a caller has modified it
+    (checked by pickling it again, which is cheaper than copying) and a fresh
+    copy from then on. Parses of real input files are also kept on disk
+    between runs.
+    """
+    if parse_fn is None:
+        return functools.partial(cached_parse, copy=copy)
+
+    memo = {}  # input digest -> (parsed, pickled parsed or None)
+    code_digest = None
+
+    @functools.wraps(parse_fn)
+    def wrapper(data_src):
+        nonlocal code_digest
+        if not USE_CACHE:
+            return parse_fn(data_src)
+
+        if isinstance(data_src, MappedInput):
+            input_digest = cache.digest(data_src.view)
+        else:
+            data_src.seek(0)
+            content = data_src.read()
+            data_src.seek(0)
+            input_digest = cache.digest(content.encode() if isinstance(content, str) else content)
+        if input_digest in memo:
+            parsed, data = memo[input_digest]
+            if copy is None and data is not None and cache.dumps(parsed) == data:
+                return parsed
+            if copy is False:
+                return parsed
+            parsed = pickle.loads(data) if data is not None else parse_fn(data_src)
+            if copy is None:
+                memo[input_digest] = (parsed, data)
+            return parsed
+
+        parsed = cache.MISSING
+        on_disk = isinstance(getattr(data_src, 'name', None), str)
+        if on_disk:
+            if code_digest is None:
+                code_digest = cache.parser_digest(parse_fn)
+            key = cache.parse_key(input_digest, code_digest)
+            parsed = cache.load_parsed(key)
+        fresh = parsed is cache.MISSING
+        if fresh:
+            parsed = parse_fn(data_src)
+
+        data = cache.dumps(parsed) if copy is not False or (on_disk and fresh) else None
+        if on_disk and fresh:
+            cache.store_parsed(key, parsed, data)
+        memo[input_digest] = (parsed, data)
+        return parsed
+
+    wrapper.parse_cached = True
+    return wrapper
+
+def open_input(path: str|os.PathLike) -> typing.TextIO:
+    """
+    The input file as a text file, or as a MappedInput with AOC_MMAP=1. Also
+    mapped with AOC_CONCURRENT=1: forked workers would otherwise share the
+    open file's offset, while each MappedInput keeps its own.
+    """
+    return MappedInput(path) if MMAP or CONCURRENT else open(path)
+
+def check(answer, expected):
+    """The test-data assertion from main(), as a call so it can be a run_steps step."""
+    assert answer == expected, f"got {answer}; should be {expected}"
+
+def run_steps(*steps: typing.Callable[[], typing.Any]):
+    """
+    Run main()'s steps in order. With AOC_CONCURRENT=1 they all start at once
+    in forked workers instead; their output is still printed in step order,
+    and the first step to fail stops the rest and re-raises its exception.
+    """
+    import multiprocessing
+    if not CONCURRENT or len(steps) < 2 or 'fork' not in multiprocessing.get_all_start_methods():
+        for step in steps:
+            step()
+        return
+
+    context = multiprocessing.get_context('fork')
+    sys.stdout.flush()
+    workers = []
+    for step in steps:
+        recv_conn, send_conn = context.Pipe(duplex=False)
+        process = context.Process(target=_step_worker, args=(step, send_conn), daemon=True)
+        process.start()
+        send_conn.close()
+        workers.append((process, recv_conn))
+    try:
+        for process, conn in workers:
+            try:
+                output, error = conn.recv()
+            except EOFError:
+                process.join()
+                raise RuntimeError(f"step worker exited with code {process.exitcode}") from None
+            sys.stdout.write(output)
+            sys.stdout.flush()
+            if error is not None:
+                exc, worker_traceback = error
+                exc.add_note(f"raised in a step worker:\n{worker_traceback}")
+                raise exc
+    finally:
+        for process, conn in workers:
+            process.terminate()
+            process.join()
+            conn.close()
+
+def _step_worker(step: typing.Callable, conn):
+    import traceback
+    output = io.StringIO()
+    error = None
+    try:
+        with contextlib.redirect_stdout(output):
+            step()
+    except BaseException as exc:
+        error = (exc, traceback.format_exc())
+    try:
+        conn.send((output.getvalue(), error))
+    except Exception:  # an exception that won't pickle
+        conn.send((output.getvalue(), (RuntimeError(repr(error[0])), error[1])))
+    conn.close()
+
+def answer_key(source_file: str, part_label: str) -> str|None:
+    """Cache key for a part of `source_file` run on its real input, if it has one."""
+    input_path = source_file[:-3] + '-input.dat'
+    if not os.path.exists(input_path):
+        return None
+    return cache.answer_key(cache.file_digest(input_path), cache.source_digest(source_file),
+                            part_label)
+
+def solve_part(source_file: str, part_label: str, part_fn: typing.Callable, *args,
+               expected=None, show_regress=True):
+    use_cache = USE_CACHE and REPEAT == 1 and not PROFILE and not MEMORY
+    key = answer_key(source_file, part_label) if use_cache else None
+    result = cache.load_answer(key) if key is not None else cache.MISSING
+    if result is not cache.MISSING:
+        timing = "cached"
+    else:
+        memory_args = copy.deepcopy(args) if MEMORY else None
+        if PROFILE:
+            from aoctools import profiling
+            with profiling.profiler(PROFILE, source_file, part_label):
+                result, samples = time_part(part_fn, args, REPEAT)
+        else:
+            result, samples = time_part(part_fn, args, REPEAT)
+        if key is not None:
+            cache.store_answer(key, result)
+        if len(samples) == 1:
+            timing = f"{int(samples[0]*1000)} ms"
+        else:
+            stats = summarize(samples)
+            timing = (f"min {stats['min_ms']:.1f} / median {stats['ms']:.1f} / "
+                      f"p95 {stats['p95_ms']:.1f} ms over {len(samples)} runs")
+        if MEMORY:
+            from aoctools import memory
+            with memory.measure() as usage:
+                part_fn(*memory_args)
+            timing += ', ' + memory.format_usage(usage)
+
+    line = f"Part {part_label}: {result}  ({timing})"
+    if show_regress:
+        line += '  ' + ('' if expected is None or result == expected else "** Regression **")
+    print(line)
+    return result
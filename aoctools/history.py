@@ -0,0 +1,257 @@
+"""
+Performance history across commits, in a local SQLite database.
+
+Usage: python -m aoctools.history compare [OLD [NEW]] [--years 2024] [--days 1-5]
+                                          [--limit 10] [--min-ms 1]
+       python -m aoctools.history log YEAR/DAY[/PART] [--limit 20]
+       python -m aoctools.history commits
+
+Every `aoctools.bench` run records its rows here (AOC_HISTORY or
+.aoc-cache/history.sqlite), keyed on the commit checked out at the time and
+the year, day, part and variant ('' for the day script itself, otherwise
+e.g. 'day08-optimized'). A row holds the timings, memory if measured, status
+and a hash of the answer, so a changed answer shows up without the answers
+themselves being stored. Runs on a tree with uncommitted changes are kept
+apart from the clean commit as '<hash>+dirty'.
+
+`compare` takes the latest result for each part at two commits (any git
+revision, default the two most recently recorded) and lists the biggest
+regressions and improvements by ratio, plus parts whose answers changed.
+`log` shows one day's timings commit by commit.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import os
+import pathlib
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+
+from aoctools import REPO_ROOT
+from aoctools.cache import CACHE_DIR
+from aoctools.run import parse_days
+
+HISTORY_DB = pathlib.Path(os.environ.get('AOC_HISTORY') or CACHE_DIR / 'history.sqlite')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    commit_hash TEXT NOT NULL,
+    recorded_at INTEGER NOT NULL,
+    host TEXT,
+    python TEXT,
+    repeat INTEGER
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    year INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    part TEXT NOT NULL,
+    variant TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL,
+    ms REAL,
+    min_ms REAL,
+    p95_ms REAL,
+    runs INTEGER,
+    peak_rss_kb INTEGER,
+    traced_peak_kb INTEGER,
+    answer_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS results_key ON results (year, day, part, variant);
+CREATE INDEX IF NOT EXISTS runs_commit ON runs (commit_hash);
+"""
+
+
+def git(*args: str) -> str:
+    return subprocess.run(['git', *args], cwd=REPO_ROOT, capture_output=True, text=True,
+                          check=True).stdout.strip()
+
+def current_commit() -> str:
+    """HEAD's hash, with '+dirty' if tracked files have changed."""
+    try:
+        commit = git('rev-parse', 'HEAD')
+        dirty = git('status', '--porcelain', '--untracked-files=no')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return commit + ('+dirty' if dirty else '')
+
+def resolve(revision: str) -> str:
+    """A full hash for a git revision; '+dirty' suffixes are kept as given."""
+    base, plus, suffix = revision.partition('+')
+    try:
+        return git('rev-parse', '--verify', '--quiet', f"{base}^{{commit}}") + plus + suffix
+    except (OSError, subprocess.CalledProcessError):
+        return revision
+
+def short(commit: str) -> str:
+    base, plus, suffix = commit.partition('+')
+    return base[:12] + plus + suffix
+
+def answer_hash(answer: str|None) -> str|None:
+    return hashlib.sha256(answer.encode()).hexdigest()[:16] if answer is not None else None
+
+@contextlib.contextmanager
+def connect(path: pathlib.Path=HISTORY_DB):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(path)
+    db.row_factory = sqlite3.Row
+    try:
+        db.executescript(SCHEMA)
+        with db:
+            yield db
+    finally:
+        db.close()
+
+def record(rows: list[dict], repeat: int=1, path: pathlib.Path=HISTORY_DB) -> str:
+    """Store a run's report rows against the current commit; returns the commit."""
+    commit = current_commit()
+    with connect(path) as db:
+        run_id = db.execute(
+            "INSERT INTO runs (commit_hash, recorded_at, host, python, repeat) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (commit, int(time.time()), socket.gethostname(),
+             sys.version.split()[0], repeat)).lastrowid
+        db.executemany(
+            "INSERT INTO results (run_id, year, day, part, variant, status, ms, min_ms, p95_ms, "
+            "runs, peak_rss_kb, traced_peak_kb, answer_hash) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(run_id, row['year'], row['day'], row['part'], row.get('variant') or '',
+              row['status'], row['ms'], row['min_ms'], row['p95_ms'], row['runs'],
+              row['peak_rss_kb'], row['traced_peak_kb'], answer_hash(row['answer']))
+             for row in rows])
+    return commit
+
+def recorded_commits(db: sqlite3.Connection) -> list[sqlite3.Row]:
+    """Commits with results, most recently recorded first."""
+    return db.execute(
+        "SELECT commit_hash, MAX(recorded_at) AS recorded_at, COUNT(*) AS runs FROM runs "
+        "GROUP BY commit_hash ORDER BY MAX(id) DESC").fetchall()
+
+def latest_results(db: sqlite3.Connection, commit: str) -> dict[tuple, sqlite3.Row]:
+    """The most recent result for each (year, day, part, variant) at `commit`."""
+    results = {}
+    for row in db.execute(
+            "SELECT results.*, runs.recorded_at FROM results JOIN runs ON runs.id = run_id "
+            "WHERE runs.commit_hash = ? ORDER BY runs.recorded_at, runs.id", (commit,)):
+        results[row['year'], row['day'], row['part'], row['variant']] = row
+    return results
+
+def compare(old: dict[tuple, sqlite3.Row], new: dict[tuple, sqlite3.Row],
+            min_ms: float=1.0) -> tuple[list, list, list]:
+    """(regressions, improvements, changed answers) between two sets of results.
+
+    The first two are (key, old ms, new ms, ratio), biggest change first; parts
+    under `min_ms` both times are left out as noise.
+    """
+    changes, answers = [], []
+    for key in sorted(old.keys() & new.keys()):
+        before, after = old[key], new[key]
+        if before['answer_hash'] and after['answer_hash'] and \
+                before['answer_hash'] != after['answer_hash']:
+            answers.append(key)
+        if before['status'] != 'ok' or after['status'] != 'ok' or not before['ms'] or not after['ms']:
+            continue
+        if max(before['ms'], after['ms']) < min_ms:
+            continue
+        changes.append((key, before['ms'], after['ms'], after['ms'] / before['ms']))
+    regressions = sorted((change for change in changes if change[3] > 1), key=lambda c: -c[3])
+    improvements = sorted((change for change in changes if change[3] < 1), key=lambda c: c[3])
+    return regressions, improvements, answers
+
+def format_key(key: tuple) -> str:
+    year, day, part, variant = key
+    return f"{year} day{day:02} part {part}" + (f" ({variant})" if variant else '')
+
+def format_change(key: tuple, old_ms: float, new_ms: float, ratio: float) -> str:
+    return f"  {format_key(key):<40} {old_ms:10.2f} -> {new_ms:10.2f} ms  {ratio:6.2f}x"
+
+def parse_target(text: str) -> tuple[int, int, str|None]:
+    year, day, *part = text.split('/')
+    return int(year), int(day), part[0] if part else None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Performance history across commits.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    compare_parser = commands.add_parser('compare', help="biggest changes between two commits")
+    compare_parser.add_argument('old', nargs='?', help="git revision (default: second newest)")
+    compare_parser.add_argument('new', nargs='?', help="git revision (default: newest)")
+    compare_parser.add_argument('--years', type=int, nargs='+')
+    compare_parser.add_argument('--days', type=parse_days, help="e.g. 1-5,9")
+    compare_parser.add_argument('--limit', type=int, default=10, help="rows per list")
+    compare_parser.add_argument('--min-ms', type=float, default=1.0,
+                                help="ignore parts faster than this at both commits")
+    log_parser = commands.add_parser('log', help="one day's timings commit by commit")
+    log_parser.add_argument('target', type=parse_target, metavar='YEAR/DAY[/PART]')
+    log_parser.add_argument('--limit', type=int, default=20)
+    commands.add_parser('commits', help="commits with recorded results")
+    args = parser.parse_args(argv)
+
+    if not HISTORY_DB.exists():
+        print(f"no history yet in {HISTORY_DB}; `python -m aoctools.bench` records it",
+              file=sys.stderr)
+        return 1
+
+    with connect() as db:
+        commits = recorded_commits(db)
+        if args.command == 'commits':
+            for row in commits:
+                recorded = time.strftime('%Y-%m-%d %H:%M', time.localtime(row['recorded_at']))
+                print(f"{short(row['commit_hash']):<18} {recorded}  {row['runs']} run(s)")
+            return 0
+
+        if args.command == 'log':
+            year, day, part = args.target
+            query = ("SELECT results.*, runs.commit_hash, runs.recorded_at FROM results "
+                     "JOIN runs ON runs.id = run_id WHERE year = ? AND day = ?")
+            params = [year, day]
+            if part is not None:
+                query += " AND part = ?"
+                params.append(part)
+            query += " ORDER BY runs.recorded_at DESC, part, variant LIMIT ?"
+            for row in db.execute(query, (*params, args.limit)):
+                recorded = time.strftime('%Y-%m-%d', time.localtime(row['recorded_at']))
+                timing = f"{row['ms']:10.2f} ms" if row['ms'] is not None else f"{row['status']:>13}"
+                print(f"{short(row['commit_hash']):<18} {recorded}  "
+                      f"{format_key((row['year'], row['day'], row['part'], row['variant'])):<40} "
+                      f"{timing}  answer {row['answer_hash'] or '-'}")
+            return 0
+
+        recorded = [row['commit_hash'] for row in commits]
+        if not args.new and not recorded:
+            parser.error(f"no runs recorded in {HISTORY_DB} yet; "
+                         "`python -m aoctools.bench` records them")
+        new = resolve(args.new) if args.new else recorded[0]
+        old = resolve(args.old) if args.old else \
+            next((commit for commit in recorded if commit != new), None)
+        if old is None:
+            parser.error("need results from two commits to compare")
+        old_results, new_results = latest_results(db, old), latest_results(db, new)
+        for commit, results in ((old, old_results), (new, new_results)):
+            if not results:
+                parser.error(f"no results recorded for {commit}")
+
+    def wanted(key: tuple) -> bool:
+        return (args.years is None or key[0] in args.years) and \
+            (args.days is None or key[1] in args.days)
+
+    regressions, improvements, answers = compare(
+        {key: row for key, row in old_results.items() if wanted(key)},
+        {key: row for key, row in new_results.items() if wanted(key)}, args.min_ms)
+    print(f"{short(old)} -> {short(new)}")
+    for title, changes in (("slower", regressions), ("faster", improvements)):
+        print(f"{title} ({len(changes)}):")
+        for change in changes[:args.limit]:
+            print(format_change(*change))
+    if answers:
+        print(f"answer changed ({len(answers)}):")
+        for key in answers:
+            print(f"  {format_key(key)}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
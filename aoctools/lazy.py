@@ -0,0 +1,54 @@
+"""
+Deferred imports for the solution templates.
+
+Startup used to be dominated by importing numpy, tqdm, pprint and dataclasses
+whether or not a day used them (see the timings in 2022/py/day08-optimized.py).
+These stand-ins bind the usual names straight away but only import the real
+module the first time it's actually used.
+"""
+import importlib
+import importlib.util
+import sys
+import typing
+
+
+def lazy_import(name: str):
+    """
+    `np = lazy_import('numpy')` in place of `import numpy as np`; the module
+    is executed on first attribute access.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+def lazy_callable(module_name: str, attr: str, fallback: typing.Callable=None) -> typing.Callable:
+    """
+    `pprint = lazy_callable('pprint', 'pprint')` in place of
+    `from pprint import pprint`; the import happens on the first call. If the
+    module isn't installed, `fallback` is called instead (or ImportError is
+    raised when there is no fallback).
+    """
+    target = None
+
+    def call(*args, **kwargs):
+        nonlocal target
+        if target is None:
+            try:
+                target = getattr(importlib.import_module(module_name), attr)
+            except ImportError:
+                if fallback is None:
+                    raise
+                target = fallback
+        return target(*args, **kwargs)
+
+    call.__name__ = call.__qualname__ = attr
+    call.__doc__ = f"Deferred {module_name}.{attr}"
+    return call
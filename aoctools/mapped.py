@@ -0,0 +1,161 @@
+"""
+A memory-mapped input source for `parse_input`.
+
+`MappedInput` maps a -input.dat file read-only and still behaves like the
+text file the templates open (`seek(0)`, `read()`, `readline()`, iteration all
+return str), so existing parsers work unchanged. Parsers that want to avoid
+copying the input can use the extras instead:
+
+    view           memoryview of the whole input
+    lines()        memoryview of each line, without its newline
+    array()        the input as a flat read-only NumPy uint8 array
+    grid()         a rectangular character grid as a (rows, cols) uint8 view
+    digit_grid()   the same grid converted from digit characters to 0-9
+
+None of these copy the file except `digit_grid()`, which does one pass to
+subtract ord('0'). `MappedInput.from_string` wraps test data the same way, and
+the module-level `lines`/`grid`/`digit_grid` fall back to reading any other
+text source, so a parser can use them whichever kind of source it's given.
+
+The templates open their input through `harness.open_input`, which uses this
+when AOC_MMAP=1 is set (the runner's --mmap).
+"""
+from __future__ import annotations
+
+import io
+import mmap
+import os
+import typing
+
+
+class MappedInput(io.TextIOBase):
+    def __init__(self, path: str|os.PathLike|None=None, *, data: bytes|None=None):
+        self._name = os.fspath(path) if path is not None else None
+        self._pos = 0
+        if data is not None:
+            self._mm = mmap.mmap(-1, max(len(data), 1))
+            self._mm.write(data)
+            self._size = len(data)
+        else:
+            with open(path, 'rb') as infile:
+                self._size = os.fstat(infile.fileno()).st_size
+                # an empty file can't be mapped
+                self._mm = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) \
+                    if self._size else mmap.mmap(-1, 1)
+        self.view = memoryview(self._mm)[:self._size]
+
+    @classmethod
+    def from_string(cls, text: str) -> MappedInput:
+        return cls(data=text.encode())
+
+    @property
+    def name(self) -> str|None:
+        return self._name
+
+    def __repr__(self) -> str:
+        return f"MappedInput({self._name!r}, size={self._size})"
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int=io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_END and offset == 0:
+            self._pos = self._size
+        elif not (whence == io.SEEK_CUR and offset == 0):
+            raise io.UnsupportedOperation("can't do nonzero cur-relative or end-relative seeks")
+        return self._pos
+
+    def read(self, size: int|None=-1) -> str:
+        """Positions are byte offsets, which is all there is to it for ASCII input."""
+        end = self._size if size is None or size < 0 else min(self._pos + size, self._size)
+        text = str(self.view[self._pos:end], 'utf-8')
+        self._pos = max(self._pos, end)
+        return text
+
+    def readline(self, size: int|None=-1) -> str:
+        end = self._mm.find(b'\n', self._pos, self._size)
+        end = self._size if end < 0 else end + 1
+        if size is not None and size >= 0:
+            end = min(end, self._pos + size)
+        text = str(self.view[self._pos:end], 'utf-8')
+        self._pos = max(self._pos, end)
+        return text
+
+    def close(self):
+        if not self.closed:
+            self.view.release()
+            try:
+                self._mm.close()
+            except BufferError:
+                pass  # arrays still view the map; it's unmapped once they're gone
+        super().close()
+
+    def lines(self) -> typing.Iterator[memoryview]:
+        """Each line as a memoryview into the map (`bytes(line)` for a copy)."""
+        pos, size, find = 0, self._size, self._mm.find
+        while pos < size:
+            end = find(b'\n', pos, size)
+            if end < 0:
+                end = size
+            yield self.view[pos:end]
+            pos = end + 1
+
+    def array(self):
+        import numpy as np
+        return np.frombuffer(self._mm, dtype=np.uint8, count=self._size)
+
+    def grid(self):
+        """
+        The input as a (rows, cols) array of character codes, viewing the map
+        directly (newlines are stepped over, not copied out).
+        """
+        import numpy as np
+        if not self._size:
+            return np.zeros((0, 0), dtype=np.uint8)
+        cols = self._mm.find(b'\n', 0, self._size)
+        if cols < 0:
+            cols = self._size
+        stride = cols + 1
+        size = self._size - (self._size % stride == 0)  # ignore a trailing newline
+        rows = size // stride + 1
+        if rows * stride - 1 != size:
+            raise ValueError(f"{self!r} is not a rectangular grid")
+        flat = np.frombuffer(self._mm, dtype=np.uint8, count=self._size)
+        grid = np.lib.stride_tricks.as_strided(flat, shape=(rows, cols), strides=(stride, 1),
+                                               writeable=False)
+        separators = flat[cols::stride]
+        if (separators != ord('\n')).any() or \
+                np.count_nonzero(flat == ord('\n')) != len(separators):
+            raise ValueError(f"{self!r} is not a rectangular grid")
+        return grid
+
+    def digit_grid(self):
+        return self.grid() - ord('0')
+
+
+def lines(data_src: typing.TextIO) -> typing.Iterator[memoryview|str]:
+    """Lines of any text source, as views when it's a MappedInput."""
+    if isinstance(data_src, MappedInput):
+        return data_src.lines()
+    data_src.seek(0)
+    return iter(data_src.read().splitlines())
+
+def grid(data_src: typing.TextIO):
+    """Character-code grid of any text source, without a copy when it's a MappedInput."""
+    if isinstance(data_src, MappedInput):
+        return data_src.grid()
+    import numpy as np
+    data_src.seek(0)
+    return np.array([list(line.encode()) for line in data_src.read().splitlines()],
+                    dtype=np.uint8)
+
+def digit_grid(data_src: typing.TextIO):
+    return grid(data_src) - ord('0')
@@ -0,0 +1,57 @@
+"""
+Peak memory of a single part.
+
+Two figures are reported, both in KiB:
+    peak_rss_kb     the process's resident set high-water mark. On Linux the
+                    mark is reset before the part (via /proc/self/clear_refs),
+                    so this is the peak during the part; elsewhere it is the
+                    peak of the whole process so far.
+    traced_peak_kb  the peak of memory allocated through Python's allocators
+                    (including NumPy arrays) while the part ran, from
+                    tracemalloc, counted from the start of the part.
+
+tracemalloc slows code down considerably, so callers measure memory on a
+separate, untimed run.
+"""
+from __future__ import annotations
+
+import contextlib
+import re
+import sys
+import tracemalloc
+
+
+def _reset_rss_peak() -> bool:
+    try:
+        with open('/proc/self/clear_refs', 'w') as outfile:
+            outfile.write('5')
+        return True
+    except OSError:
+        return False
+
+def _rss_peak_kb() -> int:
+    try:
+        with open('/proc/self/status') as infile:
+            return int(re.search(r'^VmHWM:\s+(\d+) kB', infile.read(), re.MULTILINE)[1])
+    except (OSError, TypeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == 'darwin' else peak  # bytes on macOS
+
+@contextlib.contextmanager
+def measure():
+    """Yields a dict that holds peak_rss_kb and traced_peak_kb once the block exits."""
+    usage = {}
+    _reset_rss_peak()
+    tracemalloc.start()
+    try:
+        yield usage
+    finally:
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        usage['traced_peak_kb'] = traced_peak // 1024
+        usage['peak_rss_kb'] = _rss_peak_kb()
+
+def format_usage(usage: dict) -> str:
+    return (f"peak RSS {usage['peak_rss_kb']/1024:.1f} MiB, "
+            f"traced {usage['traced_peak_kb']/1024:.1f} MiB")
@@ -0,0 +1,150 @@
+"""
+Profilers that can be wrapped around a single part.
+
+    cprofile  deterministic cProfile, written as a pstats .prof file
+    sample    a sampling profiler thread, written as collapsed stacks
+              (.collapsed) for flamegraph.pl / speedscope
+    line      per-line hit counts and time for code in the day script itself,
+              written as an annotated listing (.lines.txt)
+
+Output files are named after the year, day and part, e.g.
+profiles/2024-day06-part1.prof (AOC_PROFILE_DIR overrides the directory).
+"""
+from __future__ import annotations
+
+import contextlib
+import linecache
+import os
+import pathlib
+import re
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+from aoctools import REPO_ROOT
+
+MODES = ('cprofile', 'sample', 'line')
+PROFILE_DIR = pathlib.Path(os.environ.get('AOC_PROFILE_DIR', REPO_ROOT / 'profiles'))
+SAMPLE_INTERVAL = float(os.environ.get('AOC_PROFILE_INTERVAL', 0.001))
+
+
+def profile_path(source_file: str|os.PathLike, part_label: str, mode: str) -> pathlib.Path:
+    source_file = pathlib.Path(source_file).resolve()
+    year = source_file.parent.parent.name
+    day = re.sub(r'^day', '', source_file.stem)
+    part = re.sub(r'\W+', '-', part_label.strip())
+    suffix = {'cprofile': '.prof', 'sample': '.collapsed', 'line': '.lines.txt'}[mode]
+    return PROFILE_DIR / f"{year}-day{day}-part{part}{suffix}"
+
+@contextlib.contextmanager
+def profiler(mode: str, source_file: str|os.PathLike, part_label: str, verbose: bool=True):
+    """
+    Profile the body of the `with` block and write the result on exit; with
+    `verbose`, say where it went (and show the top of a cProfile) on stderr.
+    """
+    if mode not in MODES:
+        raise ValueError(f"unknown profile mode {mode!r}; expected one of {MODES}")
+    path = profile_path(source_file, part_label, mode)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    profile = {'cprofile': _cprofile, 'sample': _sample, 'line': _line}[mode]
+    with profile(path, os.path.realpath(source_file), verbose):
+        yield path
+    if verbose:
+        print(f"  profile written to {path}", file=sys.stderr)
+
+@contextlib.contextmanager
+def _cprofile(path: pathlib.Path, source_file: str, verbose: bool):
+    import cProfile
+    import pstats
+
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        prof.dump_stats(path)
+        if verbose:
+            pstats.Stats(prof, stream=sys.stderr).sort_stats('cumulative').print_stats(10)
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{pathlib.Path(code.co_filename).name}:{code.co_name}:{code.co_firstlineno}"
+
+@contextlib.contextmanager
+def _sample(path: pathlib.Path, source_file: str, verbose: bool):
+    target = threading.get_ident()
+    stacks = Counter()
+    done = threading.Event()
+
+    # stacks are recorded up to (not including) the frame running the `with`
+    caller = sys._getframe()
+    while caller.f_code.co_filename in (__file__, contextlib.__file__):
+        caller = caller.f_back
+
+    def sampler():
+        while not done.wait(SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(target)
+            stack, outermost = [], None
+            while frame is not None and frame is not caller:
+                stack.append(_frame_name(frame))
+                frame, outermost = frame.f_back, frame
+            if frame is caller and outermost is not None and \
+                    outermost.f_code.co_filename not in (__file__, contextlib.__file__):
+                stacks[';'.join(reversed(stack))] += 1
+
+    # the sampler needs the GIL to take a sample, so hand it over more often
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(min(switch_interval, SAMPLE_INTERVAL / 2))
+    thread = threading.Thread(target=sampler, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        done.set()
+        thread.join()
+        sys.setswitchinterval(switch_interval)
+        with open(path, 'w') as outfile:
+            for stack, count in stacks.most_common():
+                outfile.write(f"{stack} {count}\n")
+
+@contextlib.contextmanager
+def _line(path: pathlib.Path, source_file: str, verbose: bool):
+    hits = Counter()
+    line_time = defaultdict(float)
+    last = {}  # frame -> (lineno, timestamp)
+
+    def trace_lines(frame, event, arg):
+        now = time.perf_counter()
+        if frame in last:
+            lineno, then = last[frame]
+            line_time[lineno] += now - then
+        if event == 'line':
+            hits[frame.f_lineno] += 1
+            last[frame] = (frame.f_lineno, now)
+        elif event == 'return':
+            last.pop(frame, None)
+        return trace_lines
+
+    in_source = {}  # co_filename -> whether it is the day script
+
+    def trace_calls(frame, event, arg):
+        filename = frame.f_code.co_filename
+        if filename not in in_source:
+            in_source[filename] = os.path.realpath(filename) == source_file
+        return trace_lines if in_source[filename] else None
+
+    sys.settrace(trace_calls)
+    try:
+        yield
+    finally:
+        sys.settrace(None)
+        total = sum(line_time.values()) or 1
+        with open(path, 'w') as outfile:
+            outfile.write(f"{'hits':>10} {'ms':>10} {'%':>6}  line\n")
+            for lineno in sorted(hits.keys() | line_time.keys()):
+                ms = line_time[lineno] * 1000
+                source = linecache.getline(source_file, lineno).rstrip()
+                outfile.write(f"{hits[lineno]:10} {ms:10.2f} {ms/total/10:6.1f}  "
+                              f"{lineno:5}: {source}\n")
@@ -0,0 +1,304 @@
+"""
+Run every solution in the repo across a pool of worker processes.
+
+Usage: python -m aoctools.run [--years 2023 2024] [--days 1-5,9] [--jobs N]
+                              [--timeout SECONDS] [--budget SECONDS] [--repeat N] [--no-cache]
+                              [--profile cprofile|sample|line] [--memory] [--mmap]
+                              [--format json|csv] [--output FILE]
+
+Each day runs in its own process with a wall-clock timeout, so a full sweep
+takes about as long as the slowest day rather than the sum of all of them.
+Within that, each part gets --budget seconds (half the timeout by default);
+a part that runs over is cancelled and reported as a timeout with how far its
+tqdm loop got, e.g. "timed out at 37%" (see aoctools.budget), and the day
+moves on to its next part.
+The timing report has one row per year, day and part; with --repeat, `ms` is
+the median of the runs. Answers already cached for the same input and code
+are reported without solving again (`cached` is true and there are no
+timings) unless --no-cache is given or the parts are being repeated or
+profiled. --profile writes one profile per part (of its last run) under
+profiles/, as described in aoctools.profiling. --memory adds each part's
+peak RSS and tracemalloc peak (see aoctools.memory), taken from one extra
+untimed run so the timings aren't skewed by tracemalloc. --mmap hands
+`parse_input` a memory-mapped aoctools.mapped.MappedInput instead of a file.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import sys
+import time
+import traceback
+import typing
+from collections import deque
+from dataclasses import dataclass
+from types import ModuleType
+
+from aoctools import budget, cache, harness, memory, profiling
+from aoctools.discover import DaySpec, find_days, load_module
+from aoctools.mapped import MappedInput
+
+REPORT_FIELDS = (
+    'year', 'day', 'part', 'status', 'answer', 'expected',
+    'parse_ms', 'ms', 'min_ms', 'p95_ms', 'runs', 'peak_rss_kb', 'traced_peak_kb',
+    'progress', 'cached', 'error',
+)
+PARTS = ('1', '2')
+
+
+@dataclass(frozen=True)
+class RunOptions:
+    repeat: int = 1
+    use_cache: bool = True
+    profile: str = ''
+    memory: bool = False
+    mmap: bool = False
+    parts: tuple[str, ...] = PARTS
+    budget: float = 0  # seconds per part; 0 for no limit
+
+
+def make_row(spec: DaySpec, part: str, status: str, **fields) -> dict:
+    row = dict.fromkeys(REPORT_FIELDS)
+    row.update(year=spec.year, day=spec.day, part=part, status=status,
+               expected=spec.expected.get(part), **fields)
+    return row
+
+def run_day(spec: DaySpec, options: RunOptions=RunOptions(),
+            module: ModuleType|None=None) -> list[dict]:
+    return list(iter_day(spec, options, module))
+
+def iter_day(spec: DaySpec, options: RunOptions=RunOptions(),
+             module: ModuleType|None=None) -> typing.Iterator[dict]:
+    """
+    Solve the parts of one day in the current process, importing the script
+    unless its `module` is given. Repeated runs parse the input afresh each
+    time so parts that consume their input stay valid.
+
+    With the cache on, the input is parsed once and the parts share the
+    result, with a part getting a fresh copy only if an earlier one modified
+    it (unless the day's `parse_input` is already wrapped in
+    `harness.cached_parse`, which then decides).
+    """
+    harness.USE_CACHE = options.use_cache
+    if module is None:
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                module = load_module(spec)
+        except Exception as exc:
+            for part in options.parts:
+                yield make_row(spec, part, 'error', error=describe(exc))
+            return
+
+    parse_input = module.parse_input
+    if options.use_cache and not getattr(parse_input, 'parse_cached', False):
+        parse_input = harness.cached_parse(parse_input, copy=None)
+
+    use_cache = (options.use_cache and options.repeat == 1 and
+                 not options.profile and not options.memory)
+    if use_cache:
+        input_digest = cache.file_digest(spec.input_path)
+        code_digest = cache.source_digest(spec.path)
+
+    with (MappedInput if options.mmap else open)(spec.input_path) as infile:
+        for part in options.parts:
+            part_fn = getattr(module, f'part{part}', None)
+            if part_fn is None:
+                continue
+            expected = spec.expected.get(part)
+            if use_cache:
+                key = cache.answer_key(input_digest, code_digest, part)
+                answer = cache.load_answer(key)
+                if answer is not cache.MISSING:
+                    status = 'ok' if expected is None or str(answer) == expected else 'regression'
+                    yield make_row(spec, part, status, answer=str(answer), cached=True)
+                    continue
+
+            parse_samples, samples = [], []
+            budget.start_part(part)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()), budget.limit(options.budget):
+                    for run in range(options.repeat):
+                        start = time.perf_counter()
+                        parsed = parse_input(infile)
+                        profile = (
+                            profiling.profiler(options.profile, spec.path, part, verbose=False)
+                            if options.profile else contextlib.nullcontext()
+                        )
+                        with profile:
+                            parsed_at = time.perf_counter()
+                            run_answer = part_fn(*parsed) if spec.splat else part_fn(parsed)
+                            end = time.perf_counter()
+                        parse_samples.append(parsed_at - start)
+                        samples.append(end - parsed_at)
+                        if run == 0:
+                            answer = run_answer
+                    usage = {}
+                    if options.memory:
+                        parsed = parse_input(infile)
+                        with memory.measure() as usage:
+                            part_fn(*parsed) if spec.splat else part_fn(parsed)
+            except budget.BudgetExceeded as exc:
+                yield make_row(spec, part, 'timeout', error=f"{exc} (budget {options.budget:g} s)",
+                               progress=budget.fraction())
+                continue
+            except Exception as exc:
+                yield make_row(spec, part, 'error', error=describe(exc))
+                continue
+            if use_cache:
+                cache.store_answer(key, answer)
+            status = 'ok' if expected is None or str(answer) == expected else 'regression'
+            yield make_row(spec, part, status, answer=str(answer), runs=len(samples),
+                           cached=False, **usage,
+                           parse_ms=harness.summarize(parse_samples)['ms'],
+                           **harness.summarize(samples))
+
+def describe(exc: BaseException) -> str:
+    frame = traceback.extract_tb(exc.__traceback__)[-1:]
+    where = f" ({frame[0].filename}:{frame[0].lineno})" if frame else ''
+    return f"{type(exc).__name__}: {exc}{where}"
+
+def _worker(spec: DaySpec, options: RunOptions, conn, progress):
+    # rows go back one part at a time, so a day killed for overrunning keeps
+    # the parts it finished
+    budget.install(progress)
+    for row in iter_day(spec, options):
+        conn.send(row)
+    conn.send(None)
+    conn.close()
+
+def run_all(specs: list[DaySpec], jobs: int, timeout: float,
+            options: RunOptions=RunOptions()) -> list[dict]:
+    """Run the given days with at most `jobs` worker processes alive at once."""
+    rows = []
+    pending = deque()
+    for spec in specs:
+        if not spec.runnable:
+            rows.extend(make_row(spec, part, 'skipped') for part in PARTS)
+        elif not spec.input_path.exists():
+            rows.extend(make_row(spec, part, 'missing-input') for part in PARTS)
+        else:
+            pending.append(spec)
+
+    running = {}  # conn -> (process, spec, deadline, progress, parts still to report)
+    while pending or running:
+        while pending and len(running) < jobs:
+            spec = pending.popleft()
+            recv_conn, send_conn = multiprocessing.Pipe(duplex=False)
+            progress = budget.new_progress()
+            process = multiprocessing.Process(
+                target=_worker, args=(spec, options, send_conn, progress), daemon=True)
+            process.start()
+            send_conn.close()
+            running[recv_conn] = (process, spec, time.monotonic() + timeout, progress,
+                                  list(options.parts))
+
+        next_deadline = min(deadline for _, _, deadline, _, _ in running.values())
+        ready = multiprocessing.connection.wait(
+            list(running), timeout=max(0, next_deadline - time.monotonic()))
+
+        for conn in ready:
+            process, spec, _, _, unreported = running[conn]
+            try:
+                row = conn.recv()
+            except EOFError:
+                process.join()
+                error = f"worker exited with code {process.exitcode}"
+                rows.extend(make_row(spec, part, 'error', error=error) for part in unreported)
+                row = None
+            if row is not None:
+                rows.append(row)
+                unreported.remove(row['part'])
+                continue
+            del running[conn]
+            conn.close()
+            process.join()
+
+        now = time.monotonic()
+        for conn, (process, spec, deadline, progress, unreported) in list(running.items()):
+            if now >= deadline:
+                process.terminate()
+                process.join()
+                conn.close()
+                del running[conn]
+                for part in unreported:
+                    fields = {'error': f"exceeded {timeout:g} s"}
+                    if progress[budget.PART] == float(part):
+                        fields['error'] = f"{fields['error']} {budget.describe(progress)}".rstrip()
+                        fields['progress'] = budget.fraction(progress)
+                    rows.append(make_row(spec, part, 'timeout', **fields))
+
+    rows.sort(key=lambda row: (row['year'], row['day'], row['part']))
+    return rows
+
+def write_report(rows: list[dict], fmt: str, outfile, wall_ms: float):
+    if fmt == 'csv':
+        writer = csv.DictWriter(outfile, fieldnames=REPORT_FIELDS, lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        json.dump({'wall_ms': round(wall_ms, 3), 'results': rows}, outfile, indent=2)
+        outfile.write('\n')
+
+def parse_days(text: str) -> set[int]:
+    days = set()
+    for item in text.split(','):
+        first, _, last = item.partition('-')
+        days.update(range(int(first), int(last or first) + 1))
+    return days
+
+def part_budget(args: argparse.Namespace) -> float:
+    return args.budget if args.budget is not None else args.timeout / len(PARTS)
+
+def make_arg_parser(description: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--years', type=int, nargs='+', help="default: every year")
+    parser.add_argument('--days', type=parse_days, help="e.g. 1-5,9 (default: every day)")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('--timeout', type=float, default=300, help="seconds allowed per day")
+    parser.add_argument('--budget', type=float,
+                        help="seconds allowed per part (default: half the timeout)")
+    parser.add_argument('--repeat', type=int, default=1, help="runs per part")
+    parser.add_argument('--memory', action='store_true',
+                        help="also measure peak RSS and tracemalloc peak per part")
+    return parser
+
+def main(argv=None):
+    parser = make_arg_parser("Run every solution and report timings.")
+    parser.add_argument('--format', choices=('json', 'csv'), default='json')
+    parser.add_argument('--output', help="report file (default: stdout)")
+    parser.add_argument('--no-cache', dest='use_cache', action='store_false',
+                        help="solve every part even if its answer is cached")
+    parser.add_argument('--profile', choices=profiling.MODES, default='',
+                        help="write a profile of each part under profiles/")
+    parser.add_argument('--mmap', action='store_true',
+                        help="give parse_input a memory-mapped input")
+    args = parser.parse_args(argv)
+
+    specs = find_days(args.years, args.days)
+    start = time.perf_counter()
+    options = RunOptions(repeat=max(1, args.repeat), use_cache=args.use_cache,
+                         profile=args.profile, memory=args.memory, mmap=args.mmap,
+                         budget=part_budget(args))
+    rows = run_all(specs, max(1, args.jobs), args.timeout, options)
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    if args.output:
+        with open(args.output, 'w', newline='') as outfile:
+            write_report(rows, args.format, outfile, wall_ms)
+    else:
+        write_report(rows, args.format, sys.stdout, wall_ms)
+
+    total_ms = sum((row['parse_ms'] or 0) + (row['ms'] or 0) for row in rows)
+    bad = sum(row['status'] in ('error', 'timeout', 'regression') for row in rows)
+    print(f"{len(rows)} parts in {wall_ms/1000:.2f} s wall ({total_ms/1000:.2f} s summed), "
+          f"{bad} failed", file=sys.stderr)
+    return 1 if bad else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+Measure how solvers scale with input size, on synthetic inputs.
+
+Usage: python -m aoctools.scaling [--years 2024] [--days 6,10] [--scales 1 10 100]
+                                  [--parts 1 2] [--repeat 3] [--timeout 60] [--seed 0]
+                                  [--plot DIR] [--output FILE]
+
+Every day with a generator in aoctools.generators gets inputs at each --scale
+(a multiple of the real input's size). Each part runs on each input in a
+fresh worker process: once untimed to warm up, then --repeat timed runs on
+fresh parses (`ms` is their median, as in the runner's report), then once
+more under aoctools.memory for its peak memory. Once a part times out, its
+larger scales are skipped.
+
+The table shows, per part, the log-log slope of time and of traced memory
+against input size: about 1 for linear, 2 for quadratic. With matplotlib
+installed, --plot also saves a chart per day under DIR.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import multiprocessing
+import pathlib
+import sys
+import tempfile
+import time
+
+from aoctools import REPO_ROOT, harness, memory
+from aoctools.discover import DaySpec, find_days, load_module
+from aoctools.generators import GENERATORS, generate
+from aoctools.run import describe, parse_days
+
+PLOT_DIR = REPO_ROOT / 'profiles' / 'scaling'
+
+
+def measure_part(spec: DaySpec, input_path: str, part: str, repeat: int=3) -> dict:
+    """
+    Time one part on an input after a warm-up run, `repeat` times, then run
+    it again for its peak memory.
+    """
+    harness.USE_CACHE = False
+    with contextlib.redirect_stdout(io.StringIO()):
+        module = load_module(spec)
+        part_fn = getattr(module, f'part{part}')
+        samples = []
+        with open(input_path) as infile:
+            for run in range(repeat + 1):
+                parsed = module.parse_input(infile)
+                start = time.perf_counter()
+                part_fn(*parsed) if spec.splat else part_fn(parsed)
+                if run:  # the first run only warms up imports and caches
+                    samples.append(time.perf_counter() - start)
+            parsed = module.parse_input(infile)
+        with memory.measure() as usage:
+            part_fn(*parsed) if spec.splat else part_fn(parsed)
+    timings = harness.summarize(samples)
+    return {'ms': timings['ms'], 'min_ms': timings['min_ms'], 'runs': len(samples), **usage}
+
+def _worker(spec: DaySpec, input_path: str, part: str, repeat: int, conn):
+    try:
+        conn.send({'status': 'ok', **measure_part(spec, input_path, part, repeat)})
+    except Exception as exc:
+        conn.send({'status': 'error', 'error': describe(exc)})
+    conn.close()
+
+def run_measurement(spec: DaySpec, input_path: str, part: str, timeout: float,
+                    repeat: int=3) -> dict:
+    recv_conn, send_conn = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_worker,
+                                      args=(spec, input_path, part, repeat, send_conn),
+                                      daemon=True)
+    process.start()
+    send_conn.close()
+    try:
+        if recv_conn.poll(timeout):
+            return recv_conn.recv()
+        return {'status': 'timeout', 'error': f"exceeded {timeout:g} s"}
+    except EOFError:
+        process.join()
+        return {'status': 'error', 'error': f"worker exited with code {process.exitcode}"}
+    finally:
+        process.terminate()
+        process.join()
+        recv_conn.close()
+
+def slope(rows: list[dict], field: str) -> float|None:
+    """Least-squares slope of log(field) against log(input size)."""
+    points = [(math.log(row['size']), math.log(row[field])) for row in rows
+              if row['status'] == 'ok' and row[field] and row[field] > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if not var_x:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+def plot_day(spec: DaySpec, rows: list[dict], plot_dir: pathlib.Path) -> pathlib.Path|None:
+    """Chart time and memory against input size, if matplotlib is available."""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        return None
+
+    fig, (time_ax, memory_ax) = plt.subplots(1, 2, figsize=(10, 4))
+    for part in sorted({row['part'] for row in rows}):
+        done = [row for row in rows if row['part'] == part and row['status'] == 'ok']
+        sizes = [row['size'] for row in done]
+        time_ax.plot(sizes, [row['ms'] for row in done], 'o-', label=f"part {part}")
+        memory_ax.plot(sizes, [row['traced_peak_kb'] / 1024 for row in done], 'o-',
+                       label=f"part {part}")
+    for ax, label in ((time_ax, 'ms'), (memory_ax, 'traced peak MiB')):
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+        ax.set_xlabel('input bytes')
+        ax.set_ylabel(label)
+        ax.grid(True, which='both', alpha=0.3)
+        ax.legend()
+    fig.suptitle(f"{spec.year} day {spec.day:02}")
+    fig.tight_layout()
+
+    plot_dir.mkdir(parents=True, exist_ok=True)
+    path = plot_dir / f"{spec.year}-day{spec.day:02}.png"
+    fig.savefig(path)
+    plt.close(fig)
+    return path
+
+def format_slope(value: float|None) -> str:
+    return f"{value:4.2f}" if value is not None else '   -'
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure solver scaling on synthetic inputs.")
+    parser.add_argument('--years', type=int, nargs='+', help="default: every year")
+    parser.add_argument('--days', type=parse_days, help="e.g. 1-5,9 (default: every day)")
+    parser.add_argument('--scales', type=float, nargs='+', default=[1, 10, 100],
+                        help="input sizes as multiples of the real input")
+    parser.add_argument('--parts', nargs='+', choices=('1', '2'), default=['1', '2'])
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="timed runs per part and scale, after one warm-up run")
+    parser.add_argument('--timeout', type=float, default=60,
+                        help="seconds allowed per part and scale, all runs together")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--plot', type=pathlib.Path, nargs='?', const=PLOT_DIR, metavar='DIR',
+                        help=f"save charts (needs matplotlib; default DIR {PLOT_DIR})")
+    parser.add_argument('--output', help="write a JSON report here")
+    args = parser.parse_args(argv)
+
+    specs = [spec for spec in find_days(args.years, args.days)
+             if (spec.year, spec.day) in GENERATORS and spec.runnable]
+    if not specs:
+        parser.error(f"no generators for those days; have {sorted(GENERATORS)}")
+
+    rows, slopes = [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        for spec in specs:
+            day_rows = []
+            inputs = {}
+            for scale in sorted(args.scales):
+                path = pathlib.Path(tmp) / f"{spec.year}-{spec.day:02}-x{scale:g}.dat"
+                path.write_text(generate(spec.year, spec.day, scale, args.seed))
+                inputs[scale] = path
+
+            for part in args.parts:
+                print(f"{spec.year} day{spec.day:02} part {part}")
+                for scale, path in inputs.items():
+                    result = run_measurement(spec, str(path), part, args.timeout,
+                                             max(1, args.repeat))
+                    row = {'year': spec.year, 'day': spec.day, 'part': part, 'scale': scale,
+                           'size': path.stat().st_size, 'ms': None, 'min_ms': None,
+                           'runs': None, 'peak_rss_kb': None, 'traced_peak_kb': None,
+                           'error': None, **result}
+                    day_rows.append(row)
+                    if row['status'] == 'ok':
+                        print(f"    x{scale:<6g} {row['size']:>10} bytes  {row['ms']:10.1f} ms  "
+                              f"{row['traced_peak_kb']/1024:8.1f} MiB traced")
+                    else:
+                        print(f"    x{scale:<6g} {row['size']:>10} bytes  {row['status']}: "
+                              f"{row['error']}")
+                        break  # larger inputs will only fail too
+
+                part_rows = [row for row in day_rows if row['part'] == part]
+                time_slope, memory_slope = slope(part_rows, 'ms'), slope(part_rows, 'traced_peak_kb')
+                slopes.append({'year': spec.year, 'day': spec.day, 'part': part,
+                               'time_slope': time_slope, 'memory_slope': memory_slope})
+                print(f"    slope: time {format_slope(time_slope)}, "
+                      f"memory {format_slope(memory_slope)}")
+
+            if args.plot:
+                path = plot_day(spec, day_rows, args.plot)
+                if path is None:
+                    print("matplotlib isn't installed; skipping charts", file=sys.stderr)
+                    args.plot = None
+                else:
+                    print(f"    chart: {path}")
+            rows.extend(day_rows)
+
+    if args.output:
+        with open(args.output, 'w') as outfile:
+            json.dump({'results': rows, 'slopes': slopes}, outfile, indent=2)
+            outfile.write('\n')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Measure the cold-start time of each day script.
+
+Usage: python -m aoctools.startup [--years 2023 2024] [--days 1-5,9] [--repeat 5]
+                                  [--imports N] [--output FILE]
+
+Each script (and each year's template.py) is loaded without running `main()`
+in a fresh interpreter --repeat times. Times are reported next to a bare
+interpreter start; `over_baseline_ms` compares the minimums (the least noisy
+figure) and is what the script's own imports and module-level code cost.
+--imports also lists the N slowest top-level imports.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import pathlib
+import re
+import subprocess
+import sys
+import time
+
+from aoctools import REPO_ROOT, harness
+from aoctools.discover import find_days
+from aoctools.run import parse_days
+
+LOAD_SCRIPT = "import runpy, sys; runpy.run_path(sys.argv[1], run_name='__startup__')"
+IMPORT_TIME = re.compile(r'import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)')
+
+
+def time_command(args: list[str], cwd: pathlib.Path, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(args, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       check=True)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def top_imports(args: list[str], cwd: pathlib.Path) -> dict[str, float]:
+    """Cumulative ms of each top-level import, from `python -X importtime`."""
+    proc = subprocess.run([args[0], '-X', 'importtime', *args[1:]], cwd=cwd,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    imports = {}
+    for match in IMPORT_TIME.finditer(proc.stderr):
+        if not match[2]:
+            imports[match[3]] = int(match[1]) / 1000
+    return imports
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure day script cold-start times.")
+    parser.add_argument('--years', type=int, nargs='+', help="default: every year")
+    parser.add_argument('--days', type=parse_days, help="e.g. 1-5,9 (default: every day)")
+    parser.add_argument('--repeat', type=int, default=5, help="interpreter starts per script")
+    parser.add_argument('--imports', type=int, default=0, metavar='N',
+                        help="also show the N slowest top-level imports per script")
+    parser.add_argument('--output', help="write a JSON report here")
+    args = parser.parse_args(argv)
+
+    scripts = [(spec.year, spec.day, spec.path)
+               for spec in find_days(args.years, args.days) if spec.runnable]
+    if args.days is None:
+        for template in sorted(REPO_ROOT.glob('20[0-9][0-9]/py/template.py')):
+            year = int(template.parent.parent.name)
+            if not args.years or year in args.years:
+                scripts.append((year, 'template', template))
+    scripts.sort(key=lambda item: (item[0], str(item[1])))
+
+    baseline_args = [sys.executable, '-c', LOAD_SCRIPT, os.devnull]
+    baseline = harness.summarize(time_command(baseline_args, REPO_ROOT, max(1, args.repeat)))
+    baseline_imports = top_imports(baseline_args, REPO_ROOT) if args.imports else {}
+    print(f"interpreter baseline  min {baseline['min_ms']:7.1f}  median {baseline['ms']:7.1f} ms")
+
+    rows = []
+    for year, day, path in scripts:
+        command = [sys.executable, '-c', LOAD_SCRIPT, str(path)]
+        try:
+            stats = harness.summarize(time_command(command, path.parent, max(1, args.repeat)))
+        except subprocess.CalledProcessError:
+            print(f"{year} {day}: failed to load", file=sys.stderr)
+            continue
+        row = {'year': year, 'day': day, **stats,
+               'over_baseline_ms': round(stats['min_ms'] - baseline['min_ms'], 3)}
+        name = f"day{day:02}" if isinstance(day, int) else day
+        print(f"{year} {name:8}  min {stats['min_ms']:7.1f}  median {stats['ms']:7.1f} ms"
+              f"  ({row['over_baseline_ms']:+.1f})")
+
+        if args.imports:
+            imports = {module: ms for module, ms in top_imports(command, path.parent).items()
+                       if module not in baseline_imports}
+            slowest = sorted(imports.items(), key=lambda item: -item[1])[:args.imports]
+            row['imports'] = dict(slowest)
+            for module, ms in slowest:
+                print(f"    {ms:7.1f} ms  {module}")
+        rows.append(row)
+
+    if args.output:
+        with open(args.output, 'w') as outfile:
+            json.dump({'baseline': baseline, 'results': rows}, outfile, indent=2)
+            outfile.write('\n')
+
+if __name__ == '__main__':
+    main()
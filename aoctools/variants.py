@@ -0,0 +1,286 @@
+"""
+Check alternative implementations of a part against each other and race them.
+
+Usage: python -m aoctools.variants [--years 2023] [--days 6,18] [--parts 1 2]
+                                   [--repeat 5] [--timeout 60] [--record]
+
+Variants are found by naming convention:
+
+- `part1_<name>`/`part2_<name>` functions next to `part1`/`part2`
+  (2023 day06 `part1_incremental`), called with the same parsed input
+- sibling scripts `dayNN-<name>.py` (2022 `day08-optimized.py`), using their
+  own `parse_input` if they have one and the input's lines otherwise
+- helper families `<stem>_<name>` of two or more functions that a part is
+  parameterised by: either the part takes one more argument than the parse
+  provides (2023 day18 `part1(method, plan)` with `calculate_area_rectangles`
+  and `calculate_area_shoelace`), or the part calls a `<stem>` global,
+  which is swapped for each member in turn
+
+Every variant of a part is run on the day's test data (when `get_test_data`
+gives it in one of the template shapes) and on the real input. Answers must
+match the known answer, or failing that each other. The real-input runs are
+timed --repeat times, each variant within its own --timeout, and printed side
+by side with their speed relative to the fastest. The exit status is non-zero
+if any variant disagrees or fails. --record adds the timings to the
+performance history (aoctools.history) with the variant names.
+
+Scripts that predate the `parse_input(infile)` template (2020 day13
+`part2_brute`, 2020 day23 `part1_b`, ...) have their variants listed but
+can't be driven from here.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import copy
+import inspect
+import io
+import math
+import re
+import sys
+import typing
+from collections import defaultdict
+from dataclasses import dataclass
+
+from aoctools import budget, harness, history
+from aoctools.discover import DaySpec, find_days, inspect_day, load_module, sibling_scripts
+from aoctools.run import PARTS, describe, make_row, parse_days
+
+NOT_HELPERS = {'parse_input', 'get_test_data', 'print_result', 'solve_part', 'run_tests', 'main'}
+VARIANT_NAME = re.compile(r'^def (part[12]_\w+)\(', re.MULTILINE)
+
+
+@dataclass
+class Variant:
+    name: str
+    part: str
+    solve: typing.Callable[[typing.Any], typing.Any]  # parsed input -> answer
+    parse: typing.Callable[[typing.TextIO], typing.Any]
+    primary: bool = False  # the day script's own partN
+
+
+def call_with(part_fn: typing.Callable, splat: bool) -> typing.Callable:
+    return (lambda parsed: part_fn(*parsed)) if splat else part_fn
+
+def read_lines(data_src: typing.TextIO) -> list[str]:
+    data_src.seek(0)
+    return data_src.read().splitlines()
+
+def required_args(fn: typing.Callable) -> int:
+    try:
+        parameters = inspect.signature(fn).parameters.values()
+    except (TypeError, ValueError):
+        return 0
+    return sum(param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD) and
+               param.default is param.empty for param in parameters)
+
+def helper_families(module) -> dict[str, list[tuple[str, typing.Callable]]]:
+    """Module functions sharing a `<stem>_` prefix, two or more to a stem."""
+    families = defaultdict(list)
+    for name, obj in vars(module).items():
+        if not inspect.isfunction(obj) or obj.__module__ != module.__name__ or \
+                name in NOT_HELPERS or name.startswith('part') or '_' not in name:
+            continue
+        families[name.rsplit('_', 1)[0]].append((name, obj))
+    return {stem: members for stem, members in families.items() if len(members) > 1}
+
+def global_names(fn: typing.Callable) -> set[str]:
+    """Names a function looks up, including in its comprehensions and inner functions."""
+    names, pending = set(), [getattr(fn, '__code__', None)]
+    while pending:
+        code = pending.pop()
+        if code is not None:
+            names.update(code.co_names)
+            pending.extend(const for const in code.co_consts if inspect.iscode(const))
+    return names
+
+@contextlib.contextmanager
+def swapped(module, name: str, value):
+    original = getattr(module, name)
+    setattr(module, name, value)
+    try:
+        yield
+    finally:
+        setattr(module, name, original)
+
+def find_variants(spec: DaySpec, module, parsed) -> list[Variant]:
+    """Every implementation of each part; `parsed` is the day's parsed real input."""
+    parse = module.parse_input
+    families = helper_families(module)
+    variants = []
+    for part in PARTS:
+        part_fn = getattr(module, f'part{part}', None)
+        if part_fn is None:
+            continue
+        takes_helper = spec.splat and required_args(part_fn) == len(parsed) + 1
+        if takes_helper:
+            for members in families.values():
+                for name, helper in members:
+                    solve = (lambda parsed, part_fn=part_fn, helper=helper:
+                             part_fn(helper, *parsed))
+                    variants.append(Variant(name, part, solve, parse))
+            continue
+
+        variants.append(Variant(f'part{part}', part, call_with(part_fn, spec.splat), parse,
+                                primary=True))
+        for name in sorted(vars(module)):
+            if name.startswith(f'part{part}_') and callable(getattr(module, name)):
+                variants.append(Variant(name, part, call_with(getattr(module, name), spec.splat),
+                                        parse))
+        for stem, members in families.items():
+            if not callable(getattr(module, stem, None)) or stem not in global_names(part_fn):
+                continue
+            for name, helper in members:
+                def solve(parsed, part_fn=part_fn, stem=stem, helper=helper):
+                    with swapped(module, stem, helper):
+                        return call_with(part_fn, spec.splat)(parsed)
+                variants.append(Variant(name, part, solve, parse))
+
+    for path in sibling_scripts(spec):
+        sibling_spec = inspect_day(spec.year, spec.day, path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            sibling = load_module(sibling_spec)
+        sibling_parse = getattr(sibling, 'parse_input', read_lines)
+        splat = sibling_spec.splat and hasattr(sibling, 'parse_input')
+        for part in PARTS:
+            part_fn = getattr(sibling, f'part{part}', None)
+            if part_fn is not None:
+                variants.append(Variant(path.stem, part, call_with(part_fn, splat),
+                                        sibling_parse))
+    return variants
+
+def test_cases(module) -> dict[str, tuple[typing.TextIO, typing.Any]]:
+    """Each part's test data and answer, for the get_test_data shapes the templates use."""
+    get_test_data = getattr(module, 'get_test_data', None)
+    if get_test_data is None:
+        return {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        test_data = get_test_data()
+    match test_data:
+        case ((data1, answer1), (data2, answer2)) if hasattr(data1, 'read'):
+            return {'1': (data1, answer1), '2': (data2, answer2)}
+        case (data, (answer1, answer2)) if hasattr(data, 'read'):
+            return {'1': (data, answer1), '2': (data, answer2)}
+    return {}
+
+def known(answer) -> bool:
+    return not (isinstance(answer, float) and math.isnan(answer))
+
+def run_variant(variant: Variant, data_src: typing.TextIO, repeat: int, timeout: float) -> dict:
+    """Parse and solve once, timing `repeat` runs of the solve on copies of the parse."""
+    try:
+        with contextlib.redirect_stdout(io.StringIO()), budget.limit(timeout):
+            parsed = variant.parse(data_src)
+            answer, samples = harness.time_part(
+                variant.solve, (copy.deepcopy(parsed),), repeat)
+    except budget.BudgetExceeded as exc:
+        return {'status': 'timeout', 'error': f"{exc} (limit {timeout:g} s)"}
+    except Exception as exc:
+        return {'status': 'error', 'error': describe(exc)}
+    return {'status': 'ok', 'answer': str(answer), 'runs': len(samples),
+            **harness.summarize(samples)}
+
+def check_part(spec: DaySpec, variants: list[Variant], case, repeat: int,
+               timeout: float) -> tuple[list[dict], str|None, bool]:
+    """Results for one part's variants, the answer they should give and whether they do."""
+    results = []
+    for variant in variants:
+        result = {'variant': variant.name, 'primary': variant.primary, 'test': ''}
+        if case is not None:
+            data, answer = case
+            outcome = run_variant(variant, data, 1, timeout)
+            if outcome['status'] != 'ok':
+                result['test'] = outcome['status']
+            elif known(answer):
+                result['test'] = 'pass' if outcome['answer'] == str(answer) else 'FAIL'
+            else:
+                result['test'] = outcome['answer']
+        with open(spec.input_path) as infile:
+            result.update(run_variant(variant, infile, repeat, timeout))
+        results.append(result)
+
+    reference = spec.expected.get(variants[0].part)
+    if reference is None:
+        reference = next((result.get('answer') for result in results if result['primary']),
+                         results[0].get('answer'))
+    agree = all(result['status'] == 'ok' and result['answer'] == reference for result in results)
+    if case is not None:
+        tests = [result['test'] for result in results]
+        agree &= all(test == 'pass' for test in tests) if known(case[1]) else len(set(tests)) == 1
+    return results, reference, agree
+
+def format_results(results: list[dict]) -> list[str]:
+    timed = [result['ms'] for result in results if result['status'] == 'ok']
+    fastest = min(timed) if timed else None
+    lines = []
+    for result in results:
+        name = result['variant'] + (' *' if result['primary'] else '')
+        test = f"test {result['test']:<7}" if result['test'] else ' ' * 12
+        if result['status'] != 'ok':
+            lines.append(f"    {name:<28} {test}  {result['status']}: {result['error']}")
+            continue
+        relative = f"{result['ms'] / fastest:7.2f}x" if fastest else ' ' * 8
+        lines.append(f"    {name:<28} {test}  min {result['min_ms']:9.2f}  "
+                     f"median {result['ms']:9.2f} ms  {relative}  {result['answer']}")
+    return lines
+
+def legacy_variants(spec: DaySpec) -> list[str]:
+    names = VARIANT_NAME.findall(spec.path.read_text())
+    return names + [path.stem for path in sibling_scripts(spec)]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare alternative implementations of parts.")
+    parser.add_argument('--years', type=int, nargs='+', help="default: every year")
+    parser.add_argument('--days', type=parse_days, help="e.g. 1-5,9 (default: every day)")
+    parser.add_argument('--parts', nargs='+', choices=PARTS, default=list(PARTS))
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per variant")
+    parser.add_argument('--timeout', type=float, default=60, help="seconds allowed per variant")
+    parser.add_argument('--record', action='store_true',
+                        help="add the timings to the performance history")
+    args = parser.parse_args(argv)
+
+    harness.USE_CACHE = False
+    budget.install()  # so tqdm loops in the day scripts are cancellation points
+    rows, failed = [], 0
+    for spec in find_days(args.years, args.days):
+        if not spec.runnable:
+            if names := legacy_variants(spec):
+                print(f"{spec.name}: {', '.join(names)} (script predates the template; skipped)")
+            continue
+        if not spec.input_path.exists():
+            continue
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                module = load_module(spec)
+                with open(spec.input_path) as infile:
+                    variants = find_variants(spec, module, module.parse_input(infile))
+        except Exception as exc:
+            print(f"{spec.name}: {describe(exc)}")
+            failed += 1
+            continue
+        cases = test_cases(module)
+
+        for part in args.parts:
+            part_variants = [variant for variant in variants if variant.part == part]
+            if len(part_variants) < 2:
+                continue
+            results, reference, agree = check_part(spec, part_variants, cases.get(part),
+                                        max(1, args.repeat), args.timeout)
+            print(f"{spec.name} part {part}" +
+                  ('' if agree else f"  ** DISAGREE ** (expected {reference})"))
+            print('\n'.join(format_results(results)))
+            failed += not agree
+            for result in results:
+                fields = {key: result.get(key) for key in
+                          ('answer', 'runs', 'ms', 'min_ms', 'p95_ms', 'error')}
+                rows.append(make_row(spec, part, result['status'], **fields,
+                                     variant='' if result['primary'] else result['variant']))
+
+    if args.record and rows:
+        commit = history.record(rows, max(1, args.repeat))
+        print(f"recorded in {history.HISTORY_DB.name} for {history.short(commit)}",
+              file=sys.stderr)
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())